@@ -0,0 +1,53 @@
+"""Shared fixtures for the tools tests."""
+
+import copy
+
+import pytest
+
+
+STR = "urn:ttrpg:attribute:str"
+AP = "urn:ttrpg:derivedvalue:ap"
+PRONE = "urn:ttrpg:keyword:prone"
+GRAPPLE = "urn:ttrpg:mechanic:grapple"
+
+# A small graph in extractor output form (sorted by id, every node with both edge lists):
+# grapple depends on AP and Prone and modifies STR; AP depends on STR.
+SAMPLE_GRAPH = [
+    {"@id": STR, "@type": "Attribute", "name": "STR", "dependsOn": [], "modifies": [], "description": "Strength"},
+    {
+        "@id": AP,
+        "@type": "DerivedValue",
+        "name": "AP",
+        "dependsOn": [STR],
+        "modifies": [],
+        "codeMapping": "app/domain/ap.ts#computeAp",
+        "description": "Action Points spent on actions",
+    },
+    {
+        "@id": PRONE,
+        "@type": "Keyword",
+        "name": "Prone",
+        "dependsOn": [],
+        "modifies": [],
+        "source": "chapters/combat.tex",
+        "description": "Lying on the ground",
+    },
+    {
+        "@id": GRAPPLE,
+        "@type": "Mechanic",
+        "name": "Grapple",
+        "dependsOn": [AP, PRONE],
+        "modifies": [STR],
+        "source": "chapters/combat.tex",
+        "@status": "unimplemented",
+        "tags": ["ability"],
+        "description": "Grapples a target and knocks it down; costs 2 AP",
+        "names": {"en": "Grapple", "pt": "Agarrar"},
+    },
+]
+
+
+@pytest.fixture
+def sample_graph():
+    """Factory for fresh copies of SAMPLE_GRAPH, so a test can edit one and keep the original."""
+    return lambda: copy.deepcopy(SAMPLE_GRAPH)
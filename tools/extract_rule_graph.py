@@ -8,17 +8,65 @@ Notes / alignment with repo rules:
 - Produces/merges:
   - rule_graph.json in repo root
   - dangling_references.json in repo root
+  - rule_graph.search.json (BM25 search index, see tools/rule_search.py), updated incrementally
+  - rule_graph.analytics.json (degree, PageRank, betweenness, reachability counts; see
+    tools/rule_graph_analytics.py), recomputed only when ids or edges changed
+  - or, with `--store rule_graph.sqlite`, only the changed nodes in a SQLite store
+    (see tools/rule_graph_store.py) instead of rewriting rule_graph.json; an empty store is
+    seeded from rule_graph.json
+  - additionally, with `--shards DIR`, one JSON-LD file per @type and source chapter plus a
+    manifest (hashes, counts, cross-shard edges); only shards whose content changed are rewritten
+    (see tools/rule_graph_shards.py)
+  - additionally, with `--redis URL`, per-node hashes, edge sets and indexes in Redis (only
+    changed keys are touched; see tools/rule_graph_redis.py)
+- Rulebook files are found by recursively following \\include/\\input/\\subfile from main.tex
+  (commented-out lines ignored); LaTeX comments are stripped.
+- Existing nodes are kept across runs, except those whose source file was extracted and no
+  longer produces them (renamed or deleted entries).
+- Extraction streams: files -> macro events -> nodes -> incremental merge. Files are read ahead
+  in a thread pool up to a byte ceiling (`--memory-limit-mb`), so rulebook text is never held in
+  memory all at once; the ceiling covers file reads only. The merged graph is then serialized
+  once to JSON-LD node dicts, shared by every output (file or store, shards, search index,
+  analytics, Redis); rule_graph.json is written node by node from them.
+- Several language editions can be extracted in one run (`--rulebook en=... --rulebook pt=...`):
+  editions are extracted in parallel, written to rule_graph.<lang>.json, and aligned to the
+  primary (first) edition by structural position; aligned nodes carry language-tagged `names`.
+- Each dangling reference lists up to `--suggestions` node ids it probably meant (edit distance
+  over normalized node names and aliases, see tools/term_suggest.py).
+- Dependency inference is cached per node (.rule_graph_cache/inference.json), keyed by the node's
+  text and the active alias set; only new or edited nodes are re-analyzed.
+- With `--reduce`, dependsOn edges already implied through another dependency (e.g. a direct
+  STR edge next to RES, which itself depends on STR) are dropped.
+- The merged graph is validated before writing: dependsOn/modifies cycles are reported and each
+  node gets a `depth` (its layer in dependsOn evaluation order, 0 = no dependencies).
+- Rulebook entries that collapse onto one @id, and rulebook nodes with near-identical
+  descriptions (MinHash/LSH, see tools/rule_dedupe.py), are reported with their source files.
+- Every codeMapping is resolved against a cached symbol table of app/domain; dead or moved
+  symbols are reported with relocation suggestions.
 """
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import hashlib
 import json
 import os
+import posixpath
 import re
+import sys
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
+from rule_graph_redis import connect as connect_redis, publish as publish_redis
+from rule_graph_shards import write_shards
+from rule_graph_store import RuleGraphStore
+from rule_search import index_path_for, update_index
+from term_suggest import SuggestionIndex, known_terms
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 RULEBOOK_ROOT = (REPO_ROOT / ".." / "RPG_Below_v7_en").resolve()
@@ -29,6 +77,9 @@ OUT_DANGLING = REPO_ROOT / "dangling_references.json"
 
 DOMAIN_ROOT = REPO_ROOT / "app" / "domain"
 
+CACHE_DIR = REPO_ROOT / ".rule_graph_cache"
+SYMBOL_CACHE = CACHE_DIR / "domain_symbols.json"
+
 
 def _slugify(name: str) -> str:
     s = name.strip().lower()
@@ -46,35 +97,173 @@ def urn(node_type: str, name: str) -> str:
     return f"urn:ttrpg:{node_type}:{_slugify(name)}"
 
 
-@dataclass
+class IdTable:
+    """Interns node ids to small integers so edge sets can store 4-byte ints instead of strings.
+
+    A table only grows, so each graph build starts a fresh one (see reset_id_table); edge sets
+    keep a reference to the table they were built with.
+    """
+
+    __slots__ = ("_index", "_ids")
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+
+    def intern(self, node_id: str) -> int:
+        i = self._index.get(node_id)
+        if i is None:
+            i = len(self._ids)
+            node_id = sys.intern(node_id)
+            self._index[node_id] = i
+            self._ids.append(node_id)
+        return i
+
+    def lookup(self, i: int) -> str:
+        return self._ids[i]
+
+
+IDS = IdTable()
+
+
+def reset_id_table() -> None:
+    """Start a new id table for the next graph build.
+
+    Nodes built before keep working (their edge sets hold on to the old table), and the old
+    table is freed with them instead of accumulating ids across runs or history revisions.
+    """
+    global IDS
+    IDS = IdTable()
+
+
+class EdgeSet:
+    """Set of node ids backed by an array of interned ints, kept sorted by id string.
+
+    Insertion keeps the order, so serialization and merging never need to re-sort. The array is
+    only allocated on first insert; most nodes have no edges.
+    """
+
+    __slots__ = ("_a", "_ids")
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        self._a: Optional[array] = None
+        self._ids = IDS
+        for node_id in ids:
+            self.add(node_id)
+
+    def _find(self, node_id: str) -> int:
+        return bisect.bisect_left(self._a, node_id, key=self._ids.lookup)
+
+    def add(self, node_id: str) -> None:
+        i = self._ids.intern(node_id)
+        if self._a is None:
+            self._a = array("I", [i])
+            return
+        pos = self._find(node_id)
+        if pos < len(self._a) and self._a[pos] == i:
+            return
+        self._a.insert(pos, i)
+
+    def update(self, ids: Iterable[str]) -> None:
+        for node_id in ids:
+            self.add(node_id)
+
+    def discard(self, node_id: str) -> None:
+        if node_id in self:
+            del self._a[self._find(node_id)]
+
+    def __ior__(self, other: "EdgeSet") -> "EdgeSet":
+        if other._a is None:
+            return self
+        if other._ids is not self._ids:
+            # Built under another id table; its ints mean nothing here.
+            self.update(other)
+            return self
+        if self._a is None:
+            self._a = array("I", other._a)
+            return self
+        # Linear merge of two sorted arrays.
+        a, b = self._a, other._a
+        out = array("I")
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i] == b[j]:
+                out.append(a[i])
+                i += 1
+                j += 1
+            elif self._ids.lookup(a[i]) < self._ids.lookup(b[j]):
+                out.append(a[i])
+                i += 1
+            else:
+                out.append(b[j])
+                j += 1
+        out.extend(a[i:])
+        out.extend(b[j:])
+        self._a = out
+        return self
+
+    def __contains__(self, node_id: object) -> bool:
+        if self._a is None or not isinstance(node_id, str):
+            return False
+        pos = self._find(node_id)
+        return pos < len(self._a) and self._ids.lookup(self._a[pos]) == node_id
+
+    def __iter__(self) -> Iterator[str]:
+        if self._a is None:
+            return iter(())
+        return map(self._ids.lookup, self._a)
+
+    def __len__(self) -> int:
+        return 0 if self._a is None else len(self._a)
+
+    def __repr__(self) -> str:
+        return f"EdgeSet({list(self)!r})"
+
+
+def _intern_opt(s: Optional[str]) -> Optional[str]:
+    return sys.intern(s) if s else s
+
+
+@dataclass(slots=True)
 class Node:
     id: str
     type: str
     name: str
     source: Optional[str] = None
-    depends_on: Set[str] = None
-    modifies: Set[str] = None
+    # Any iterable of ids is accepted; stored as an EdgeSet.
+    depends_on: EdgeSet = None
+    modifies: EdgeSet = None
     formula: Optional[str] = None
     code_mapping: Optional[str] = None
     status: Optional[str] = None
-    tags: List[str] = None
+    tags: Tuple[str, ...] = ()
     description: Optional[str] = None
+    depth: Optional[int] = None
+    # Language-tagged names ({"en": ..., "pt": ...}); only set for multi-edition runs.
+    names: Dict[str, str] = None
 
     def __post_init__(self) -> None:
-        if self.depends_on is None:
-            self.depends_on = set()
-        if self.modifies is None:
-            self.modifies = set()
-        if self.tags is None:
-            self.tags = []
+        if not isinstance(self.depends_on, EdgeSet):
+            self.depends_on = EdgeSet(self.depends_on or ())
+        if not isinstance(self.modifies, EdgeSet):
+            self.modifies = EdgeSet(self.modifies or ())
+        self.tags = tuple(sys.intern(t) for t in self.tags or ())
+        # Low-cardinality fields repeat across hundreds of nodes; share one string each.
+        self.id = sys.intern(self.id)
+        self.type = sys.intern(self.type)
+        self.source = _intern_opt(self.source)
+        self.code_mapping = _intern_opt(self.code_mapping)
+        self.status = _intern_opt(self.status)
+        if self.names is None:
+            self.names = {}
 
     def to_jsonld(self) -> Dict[str, Any]:
         data: Dict[str, Any] = {
             "@id": self.id,
             "@type": self.type,
             "name": self.name,
-            "dependsOn": sorted(self.depends_on),
-            "modifies": sorted(self.modifies),
+            "dependsOn": list(self.depends_on),
+            "modifies": list(self.modifies),
         }
         if self.formula:
             data["formula"] = self.formula
@@ -85,9 +274,13 @@ class Node:
         if self.status:
             data["@status"] = self.status
         if self.tags:
-            data["tags"] = self.tags
+            data["tags"] = list(self.tags)
         if self.description:
             data["description"] = self.description
+        if self.depth is not None:
+            data["depth"] = self.depth
+        if self.names:
+            data["names"] = dict(sorted(self.names.items()))
         return data
 
 
@@ -95,24 +288,144 @@ def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="ignore")
 
 
-def parse_includes(main_tex: str) -> List[str]:
-    includes = re.findall(r"\\include\{([^}]+)\}", main_tex)
-    # Exclude comments: naive but adequate for this repo.
-    return [inc.strip() for inc in includes if inc.strip() and not inc.strip().startswith("%")]
+# A % preceded by an even number of backslashes (none, or escaped backslashes as in `\\%`)
+# starts a comment; after an odd number it is a literal `\%`.
+TEX_COMMENT_RE = re.compile(r"(?<!\\)((?:\\\\)*)%.*")
+INCLUDE_RE = re.compile(r"\\(?P<cmd>include|input|subfile)\s*\{(?P<name>[^}]+)\}")
 
+IncludeGraph = Dict[str, List[str]]
 
-def load_rulebook_files() -> List[Tuple[str, str]]:
-    main = read_text(RULEBOOK_MAIN)
-    includes = parse_includes(main)
-    out: List[Tuple[str, str]] = []
-    for inc in includes:
-        p = RULEBOOK_ROOT / f"{inc}.tex"
-        if not p.exists():
-            continue
-        out.append((str(p.relative_to(RULEBOOK_ROOT)).replace("\\", "/"), read_text(p)))
+
+def strip_tex_comments(text: str) -> str:
+    # Drop everything from an unescaped % to end of line (\% is a literal percent sign).
+    return TEX_COMMENT_RE.sub(r"\1", text)
+
+
+def parse_includes(tex: str) -> List[Tuple[str, str]]:
+    """Return (command, target) for every \\include/\\input/\\subfile outside comments, in order."""
+    return [(m.group("cmd"), m.group("name").strip()) for m in INCLUDE_RE.finditer(strip_tex_comments(tex))]
+
+
+def _rel(root: Path, p: Path) -> str:
+    # Files included from outside the rulebook directory (\input{../shared/x}) keep a
+    # root-relative path with `..` segments, so sources stay machine-independent.
+    return os.path.relpath(p, root).replace("\\", "/")
+
+
+def include_candidates(parent: str, cmd: str, name: str) -> List[str]:
+    """Root-relative paths an include in `parent` (root-relative) may name, in lookup order.
+
+    \\include/\\input resolve against the main document's directory; \\subfile against the
+    including file. Both are tried, with and without an implicit .tex suffix. Shared by the
+    on-disk resolver below and the git-tree one in rule_graph_history.py.
+    """
+    here = posixpath.dirname(parent)
+    bases = [here, ""] if cmd == "subfile" else ["", here]
+    return [posixpath.normpath(posixpath.join(base, n)) for base in bases for n in (name, f"{name}.tex")]
+
+
+def resolve_include(root: Path, parent: Path, cmd: str, name: str) -> Optional[Path]:
+    for rel in include_candidates(_rel(root, parent), cmd, name):
+        cand = root / rel
+        if cand.is_file():
+            return cand.resolve()
+    return None
+
+
+# Read-ahead budget for iter_include_files(): at most this many files in flight...
+READ_AHEAD_FILES = 8
+# ...and at most this much text (bytes on disk) read but not yet consumed.
+DEFAULT_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+def iter_include_files(
+    root: Path = RULEBOOK_ROOT,
+    dag: Optional[IncludeGraph] = None,
+    max_buffered_bytes: int = DEFAULT_BUFFER_BYTES,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (relative path, comment-stripped text) for every included file, in document order.
+
+    Includes are followed depth-first from main.tex (main.tex itself is not yielded); a file
+    reached twice is read once, and include cycles are cut. Upcoming files are read ahead in a
+    thread pool, but only while the read-ahead stays within READ_AHEAD_FILES files and
+    `max_buffered_bytes` of text: a slow consumer stalls the readers instead of letting text pile
+    up. If `dag` is given, it is filled with the include DAG (relative path -> relative paths it
+    includes, main.tex included).
+    """
+
+    root = root.resolve()
+    main = root / "main.tex"
+    visited: Set[Path] = set()
+    stack = [main]  # top of the stack = next file in document order
+    pending: Dict[Path, Tuple[Future, int]] = {}
+    buffered = 0
+
+    with ThreadPoolExecutor(max_workers=min(READ_AHEAD_FILES, os.cpu_count() or 1)) as pool:
+        while stack:
+            for p in islice(reversed(stack), READ_AHEAD_FILES):
+                if len(pending) >= READ_AHEAD_FILES:
+                    break
+                if p in pending or p in visited:
+                    continue
+                size = p.stat().st_size
+                if pending and buffered + size > max_buffered_bytes:
+                    break
+                pending[p] = (pool.submit(read_text, p), size)
+                buffered += size
+
+            p = stack.pop()
+            if p in visited:
+                continue
+            visited.add(p)
+            if p in pending:
+                fut, size = pending.pop(p)
+                buffered -= size
+                text = strip_tex_comments(fut.result())
+            else:
+                text = strip_tex_comments(read_text(p))
+
+            children: List[Path] = []
+            for cmd, name in parse_includes(text):
+                child = resolve_include(root, p, cmd, name)
+                if child is not None:
+                    children.append(child)
+            if dag is not None:
+                dag[_rel(root, p)] = [_rel(root, c) for c in children]
+            stack.extend(c for c in reversed(children) if c not in visited)
+
+            if p != main:
+                yield _rel(root, p), text
+
+
+def load_include_graph(root: Path = RULEBOOK_ROOT) -> Tuple[List[Tuple[str, str]], IncludeGraph]:
+    """Resolve includes from main.tex; returns every file's text (document order) and the DAG."""
+
+    dag: IncludeGraph = {}
+    files = list(iter_include_files(root, dag))
+    return files, dag
+
+
+def include_dependents(dag: IncludeGraph, changed: str) -> Set[str]:
+    """Files whose content (transitively) includes `changed`, plus `changed` itself."""
+
+    parents: Dict[str, Set[str]] = {}
+    for parent, children in dag.items():
+        for child in children:
+            parents.setdefault(child, set()).add(parent)
+    out = {changed}
+    stack = [changed]
+    while stack:
+        for parent in parents.get(stack.pop(), ()):
+            if parent not in out:
+                out.add(parent)
+                stack.append(parent)
     return out
 
 
+def load_rulebook_files() -> List[Tuple[str, str]]:
+    return load_include_graph()[0]
+
+
 # --- Extraction patterns ---
 
 
@@ -131,53 +444,36 @@ def strip_tex(s: str) -> str:
     return s.strip()
 
 
-def extract_abilities(file_rel: str, text: str) -> List[Node]:
-    nodes: List[Node] = []
+# (macro, ordinal of that macro within the file, name, description); "def" = colon definition.
+MacroEvent = Tuple[str, int, str, str]
 
-    for m in ABILITY_RE.finditer(text):
-        name = strip_tex(m.group("name"))
-        desc = strip_tex(m.group("desc"))
-        n = Node(
-            id=urn("mechanic", name),
-            type="Mechanic",
-            name=name,
-            source=file_rel,
-            status="unimplemented",
-            tags=["ability"],
-            description=desc,
-        )
-        nodes.append(n)
+
+def iter_ability_events(text: str) -> Iterator[MacroEvent]:
+    for i, m in enumerate(ABILITY_RE.finditer(text)):
+        yield "abil", i, strip_tex(m.group("name")), strip_tex(m.group("desc"))
 
     # Treat \inna as ability too (per your instruction: only ability vs spell)
-    for m in INNA_RE.finditer(text):
-        name = strip_tex(m.group("name"))
-        effect = strip_tex(m.group("effect"))
-        n = Node(
-            id=urn("mechanic", name),
-            type="Mechanic",
-            name=name,
-            source=file_rel,
-            status="unimplemented",
-            tags=["ability"],
-            description=effect,
-        )
-        nodes.append(n)
+    for i, m in enumerate(INNA_RE.finditer(text)):
+        yield "inna", i, strip_tex(m.group("name")), strip_tex(m.group("effect"))
+
+    for i, m in enumerate(SPELL_RE.finditer(text)):
+        yield "spell", i, strip_tex(m.group("name")), strip_tex(m.group("effect"))
+
+
+def ability_node(file_rel: str, macro: str, name: str, description: str) -> Node:
+    return Node(
+        id=urn("mechanic", name),
+        type="Mechanic",
+        name=name,
+        source=file_rel,
+        status="unimplemented",
+        tags=["spell" if macro == "spell" else "ability"],
+        description=description,
+    )
 
-    for m in SPELL_RE.finditer(text):
-        name = strip_tex(m.group("name"))
-        effect = strip_tex(m.group("effect"))
-        n = Node(
-            id=urn("mechanic", name),
-            type="Mechanic",
-            name=name,
-            source=file_rel,
-            status="unimplemented",
-            tags=["spell"],
-            description=effect,
-        )
-        nodes.append(n)
 
-    return nodes
+def extract_abilities(file_rel: str, text: str) -> List[Node]:
+    return [ability_node(file_rel, macro, name, d) for macro, _, name, d in iter_ability_events(text)]
 
 
 DEF_COLON_RE = re.compile(
@@ -199,6 +495,51 @@ def extract_colon_definitions(file_rel: str, text: str) -> List[Tuple[str, str]]
     return out
 
 
+def colon_definition_node(file_rel: str, term: str, definition: str) -> Node:
+    """Colon-style definition -> node (Keyword/Mechanic/DerivedValue guessed)."""
+
+    # Heuristic typing
+    t = "Mechanic"
+    nid_type = "mechanic"
+    if term.upper() in {"STR", "AGI", "STA", "CON", "INT", "SPI", "DEX"}:
+        t = "Attribute"
+        nid_type = "attribute"
+    elif term.upper() in {"AP", "STA"}:
+        t = "DerivedValue"
+        nid_type = "derivedvalue"
+    elif term.lower() in {"rest", "travel", "search", "prepare"}:
+        t = "Mechanic"
+        nid_type = "mechanic"
+    else:
+        # many of these are weapon keywords etc.
+        t = "Keyword"
+        nid_type = "keyword"
+
+    formulas = find_formulas(definition)
+    return Node(
+        id=urn(nid_type, term),
+        type=t,
+        name=term,
+        source=file_rel,
+        description=definition,
+        formula=formulas[0] if formulas else None,
+    )
+
+
+def iter_macro_events(file_rel: str, text: str) -> Iterator[MacroEvent]:
+    """All node-producing macros of one file: \\abil, \\inna, \\spell, then colon definitions."""
+    yield from iter_ability_events(text)
+    for i, (term, definition) in enumerate(extract_colon_definitions(file_rel, text)):
+        yield "def", i, term, definition
+
+
+def macro_node(file_rel: str, event: MacroEvent) -> Node:
+    macro, _, name, description = event
+    if macro == "def":
+        return colon_definition_node(file_rel, name, description)
+    return ability_node(file_rel, macro, name, description)
+
+
 INLINE_MATH_RE = re.compile(r"\$(?P<math>[^$]+)\$|\\\((?P<math2>[^)]+)\\\)")
 
 
@@ -214,27 +555,127 @@ def find_formulas(s: str) -> List[str]:
 # --- Domain mapping ---
 
 
-EXPORT_FN_RE = re.compile(r"export\s+function\s+(?P<name>[A-Za-z0-9_]+)\s*\(")
+# Named functions (`export [async] function foo(`) and async arrow constants
+# (`export const foo = async (`) both count as functions.
+EXPORT_FN_RE = re.compile(
+    r"export\s+(?:async\s+)?function\s*\*?\s*(?P<name>[A-Za-z0-9_]+)\s*\("
+    r"|export\s+const\s+(?P<arrow>[A-Za-z0-9_]+)\s*=\s*async\s*\("
+)
+EXPORT_CONST_RE = re.compile(r"export\s+const\s+(?P<name>[A-Za-z0-9_]+)\s*=(?!\s*async\s*\()")
+# Bump when the export patterns change, so cached scans of unchanged files are redone.
+SYMBOL_SCAN_VERSION = 2
+# Other exported declarations: valid codeMapping targets, but not used to bootstrap core nodes.
+EXPORT_DECL_RE = re.compile(
+    r"export\s+(?:default\s+)?(?:async\s+)?(?:let|var|class|type|interface|enum)\s+(?P<name>[A-Za-z0-9_]+)"
+)
+
+SymbolTable = Dict[str, List[Tuple[str, str]]]
+
+
+def scan_ts_symbols(path: Path) -> List[Tuple[str, str]]:
+    txt = read_text(path)
+    out: List[Tuple[str, str]] = []
+    out += [(m.group("name") or m.group("arrow"), "function") for m in EXPORT_FN_RE.finditer(txt)]
+    out += [(m.group("name"), "const") for m in EXPORT_CONST_RE.finditer(txt)]
+    out += [(m.group("name"), "other") for m in EXPORT_DECL_RE.finditer(txt)]
+    return out
+
 
+def load_domain_symbol_table() -> SymbolTable:
+    """Map repo-relative .ts path -> exported (symbol, kind) pairs for everything under app/domain.
 
-def build_domain_symbol_index() -> Dict[str, str]:
+    Results are cached on disk keyed by file mtime/size; only new or changed files are re-scanned,
+    in parallel, so this is cheap enough to run on every extraction.
+    """
+
+    cache: Dict[str, Any] = {}
+    if SYMBOL_CACHE.exists():
+        try:
+            cache = json.loads(read_text(SYMBOL_CACHE))
+        except ValueError:
+            cache = {}
+
+    current: Dict[str, Tuple[Path, List[int]]] = {}
+    for p in DOMAIN_ROOT.rglob("*.ts"):
+        st = p.stat()
+        rel = str(p.relative_to(REPO_ROOT)).replace("\\", "/")
+        current[rel] = (p, [st.st_mtime_ns, st.st_size, SYMBOL_SCAN_VERSION])
+
+    stale = [rel for rel, (_, key) in current.items() if (cache.get(rel) or {}).get("key") != key]
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+            scanned = pool.map(lambda rel: scan_ts_symbols(current[rel][0]), stale)
+            for rel, symbols in zip(stale, scanned):
+                cache[rel] = {"key": current[rel][1], "symbols": symbols}
+
+    removed = [rel for rel in cache if rel not in current]
+    for rel in removed:
+        del cache[rel]
+
+    if stale or removed:
+        SYMBOL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        SYMBOL_CACHE.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+
+    return {rel: [(sym, kind) for sym, kind in cache[rel]["symbols"]] for rel in sorted(current)}
+
+
+def build_domain_symbol_index(table: SymbolTable) -> Dict[str, str]:
     """Map symbol -> path#symbol for exported functions/constants.
 
     We only need a lightweight mapping for codeMapping.
     """
     symbol_map: Dict[str, str] = {}
-    for p in DOMAIN_ROOT.rglob("*.ts"):
-        rel = str(p.relative_to(REPO_ROOT)).replace("\\", "/")
-        txt = read_text(p)
-        for m in re.finditer(r"export\s+function\s+([A-Za-z0-9_]+)\s*\(", txt):
-            sym = m.group(1)
-            symbol_map[sym] = f"{rel}#{sym}"
-        for m in re.finditer(r"export\s+const\s+([A-Za-z0-9_]+)\s*=", txt):
-            sym = m.group(1)
-            symbol_map.setdefault(sym, f"{rel}#{sym}")
+    for rel, symbols in table.items():
+        for sym, kind in symbols:
+            if kind == "function":
+                symbol_map[sym] = f"{rel}#{sym}"
+    for rel, symbols in table.items():
+        for sym, kind in symbols:
+            if kind == "const":
+                symbol_map.setdefault(sym, f"{rel}#{sym}")
     return symbol_map
 
 
+def verify_code_mappings(nodes: Dict[str, Node], table: SymbolTable) -> List[Dict[str, Any]]:
+    """Resolve every codeMapping (`path#symbol`) against the domain symbol table.
+
+    Returns one issue per mapping that doesn't resolve: `moved` when the symbol is exported from
+    another file (with the relocation(s) as suggestions), `dead` when it isn't exported anywhere.
+    Mappings are never rewritten here; stale values otherwise survive merge_graph() forever, so
+    they need to be surfaced.
+    """
+
+    where: Dict[str, List[str]] = {}
+    for rel, symbols in table.items():
+        for sym, _ in symbols:
+            where.setdefault(sym, []).append(rel)
+
+    issues: List[Dict[str, Any]] = []
+    for nid in sorted(nodes):
+        mapping = nodes[nid].code_mapping
+        if not mapping:
+            continue
+        rel, _, sym = mapping.partition("#")
+        if sym and any(s == sym for s, _ in table.get(rel, [])):
+            continue
+        elsewhere = [f"{r}#{sym}" for r in where.get(sym, []) if r != rel]
+        issues.append(
+            {
+                "node": nid,
+                "codeMapping": mapping,
+                "problem": "moved" if elsewhere else "dead",
+                "suggestions": elsewhere,
+            }
+        )
+    return issues
+
+
+def report_code_mappings(issues: List[Dict[str, Any]]) -> None:
+    for issue in issues:
+        hint = f"; did you mean {', '.join(issue['suggestions'])}?" if issue["suggestions"] else ""
+        print(f"warning: {issue['problem']} codeMapping {issue['codeMapping']} on {issue['node']}{hint}")
+
+
 # --- Graph bootstrapping for code-known “core” rules ---
 
 
@@ -390,7 +831,72 @@ def build_core_domain_nodes(symbol_index: Dict[str, str]) -> List[Node]:
     return nodes
 
 
-def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]]) -> None:
+# --- Curated reference aliases for dependency inference ---
+# Only infer dependencies to these (plus their canonical nodes).
+REFERENCE_ALIASES: Dict[str, str] = {
+    # Attributes
+    "STR": urn("attribute", "str"),
+    "Strength": urn("attribute", "str"),
+    "AGI": urn("attribute", "agi"),
+    "Agility": urn("attribute", "agi"),
+    "CON": urn("attribute", "con"),
+    "Constitution": urn("attribute", "con"),
+    "INT": urn("attribute", "int"),
+    "Intelligence": urn("attribute", "int"),
+    "DEX": urn("attribute", "dex"),
+    "Dexterity": urn("attribute", "dex"),
+    "SPI": urn("attribute", "spi"),
+    "Spirit": urn("attribute", "spi"),
+    "STA": urn("attribute", "sta"),  # characteristic
+    # Derived / resources
+    "AP": urn("derivedvalue", "ap"),
+    "Action Points": urn("derivedvalue", "ap"),
+    "DM": urn("derivedvalue", "dm"),
+    "SM": urn("derivedvalue", "sm"),
+    "RES": urn("derivedvalue", "res"),
+    "TGH": urn("derivedvalue", "tgh"),
+    "INS": urn("derivedvalue", "ins"),
+    "Gear Penalty": urn("derivedvalue", "gear_penalty"),
+    "Armor Penalty": urn("derivedvalue", "gear_penalty"),
+    "Running Speed": urn("derivedvalue", "run_movement"),
+    "Jump": urn("derivedvalue", "jump_movement"),
+    "Stand": urn("derivedvalue", "stand_cost"),
+    # Common difficulty terms (often referenced in formulas)
+    "DL": urn("keyword", "dl"),
+    "DC": urn("keyword", "dc"),
+    "TN": urn("keyword", "tn"),
+}
+
+
+INFERENCE_CACHE = CACHE_DIR / "inference.json"
+# Bump when the inference heuristics change, so cached per-node results are discarded.
+INFERENCE_CACHE_VERSION = 2
+
+
+def _fingerprint(*parts: str) -> str:
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def load_inference_cache(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        cache = json.loads(read_text(path))
+    except ValueError:
+        return {}
+    return cache if cache.get("version") == INFERENCE_CACHE_VERSION else {}
+
+
+def save_inference_cache(path: Path, cache: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": INFERENCE_CACHE_VERSION, **cache}, sort_keys=True), encoding="utf-8")
+
+
+def detect_dependencies(
+    nodes: Dict[str, Node],
+    dangling: List[Dict[str, Any]],
+    cache_path: Optional[Path] = None,
+) -> None:
     """Populate dependsOn/modifies by looking for mentions of known game terms.
 
     Important: this is intentionally conservative.
@@ -398,6 +904,9 @@ def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]])
       to avoid substring-driven false positives.
     - We log dangling references only for terms that look like game terms (ALLCAPS acronyms or
       recurring Title-Case multiword phrases), with stopword filtering.
+
+    With `cache_path`, per-node results are reused for nodes whose text (and the active alias
+    set) is unchanged since the previous run; see INFERENCE_CACHE.
     """
 
     # --- Ensure core resources exist (so reference mapping is stable) ---
@@ -418,41 +927,8 @@ def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]])
             description="Stamina resource",
         )
 
-    # --- Curated reference aliases for dependency inference ---
-    # Only infer dependencies to these (plus their canonical nodes).
-    alias_to_id: Dict[str, str] = {
-        # Attributes
-        "STR": urn("attribute", "str"),
-        "Strength": urn("attribute", "str"),
-        "AGI": urn("attribute", "agi"),
-        "Agility": urn("attribute", "agi"),
-        "CON": urn("attribute", "con"),
-        "Constitution": urn("attribute", "con"),
-        "INT": urn("attribute", "int"),
-        "Intelligence": urn("attribute", "int"),
-        "DEX": urn("attribute", "dex"),
-        "Dexterity": urn("attribute", "dex"),
-        "SPI": urn("attribute", "spi"),
-        "Spirit": urn("attribute", "spi"),
-        "STA": urn("attribute", "sta"),  # characteristic
-        # Derived / resources
-        "AP": urn("derivedvalue", "ap"),
-        "Action Points": urn("derivedvalue", "ap"),
-        "DM": urn("derivedvalue", "dm"),
-        "SM": urn("derivedvalue", "sm"),
-        "RES": urn("derivedvalue", "res"),
-        "TGH": urn("derivedvalue", "tgh"),
-        "INS": urn("derivedvalue", "ins"),
-        "Gear Penalty": urn("derivedvalue", "gear_penalty"),
-        "Armor Penalty": urn("derivedvalue", "gear_penalty"),
-        "Running Speed": urn("derivedvalue", "run_movement"),
-        "Jump": urn("derivedvalue", "jump_movement"),
-        "Stand": urn("derivedvalue", "stand_cost"),
-        # Common difficulty terms (often referenced in formulas)
-        "DL": urn("keyword", "dl"),
-        "DC": urn("keyword", "dc"),
-        "TN": urn("keyword", "tn"),
-    }
+    # Only infer dependencies to the curated aliases (plus their canonical nodes).
+    alias_to_id: Dict[str, str] = dict(REFERENCE_ALIASES)
 
     # Ensure DL/DC/TN nodes exist if referenced (best-effort)
     for short, label in [("dl", "DL"), ("dc", "DC"), ("tn", "TN")]:
@@ -607,18 +1083,7 @@ def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]])
     # e.g. "Action Surge", "Standard Deflection". Keep to 2-5 words.
     TITLE_PHRASE_RE = re.compile(r"\b(?:[A-Z][a-z]{2,}\s+){1,4}[A-Z][a-z]{2,}\b")
 
-    # First pass: collect candidates + counts (skip our own bootstrap descriptions)
-    per_node_candidates: Dict[str, Set[str]] = {}
-    counts: Dict[str, int] = {}
-
-    for n in nodes.values():
-        if not n.source:
-            # Avoid noisy internal descriptors like "Stored/base characteristic value on Character..."
-            continue
-        text = " ".join(filter(None, [n.description, n.formula]))
-        if not text:
-            continue
-
+    def _term_candidates(text: str) -> List[str]:
         cands: Set[str] = set()
         for tok in ACRONYM_RE.findall(text):
             if ROMAN.match(tok):
@@ -626,34 +1091,18 @@ def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]])
             cands.add(tok)
         for phrase in TITLE_PHRASE_RE.findall(text):
             cands.add(phrase)
+        return sorted(cands)
 
-        if not cands:
-            continue
-
-        per_node_candidates[n.id] = cands
-        for c in cands:
-            counts[c] = counts.get(c, 0) + 1
-
-    def _is_known_term(term: str) -> bool:
-        t = term.strip().lower()
-        if t in known_names:
-            return True
-        if t.endswith("s") and t.rstrip("s") in known_names:
-            return True
-        return False
-
-    # Second pass: dependency inference + dangling logging
-    for n in list(nodes.values()):
-        text = " ".join(filter(None, [n.description, n.formula]))
-        if not text:
-            continue
+    def _infer_edges(n: Node, text: str) -> Tuple[List[str], List[str]]:
+        deps: List[str] = []
+        mods: List[str] = []
 
         # dependsOn inference (curated + word-boundary regex)
         for pat, tid in ref_patterns:
             if tid == n.id:
                 continue
             if pat.search(text):
-                n.depends_on.add(tid)
+                deps.append(tid)
 
         # modifies inference: per sentence, if it contains a "modifying" verb, mark all referenced
         # core stats/resources in that sentence as modifies.
@@ -666,12 +1115,82 @@ def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]])
                 if tid == n.id:
                     continue
                 if pat.search(sentence):
-                    n.modifies.add(tid)
+                    mods.append(tid)
+        return deps, mods
+
+    # --- Per-node inference, cached ---
+    # An entry (inferred edges + dangling candidates) stays valid while the node's text is the
+    # same; its edges additionally require the same set of active aliases. Candidate counts are
+    # kept in the cache too and adjusted by delta for re-analyzed or vanished nodes.
+    alias_version = _fingerprint(*sorted(f"{alias}\x1e{tid}" for alias, tid in alias_to_id.items() if tid in nodes))
+    cache = load_inference_cache(cache_path) if cache_path is not None else {}
+    entries: Dict[str, Dict[str, Any]] = cache.get("nodes", {})
+    counts: Dict[str, int] = dict(cache.get("counts", {}))
+    edges_valid = cache.get("aliases") == alias_version
+
+    def _count(cands: Iterable[str], delta: int) -> None:
+        for c in cands:
+            v = counts.get(c, 0) + delta
+            if v:
+                counts[c] = v
+            else:
+                counts.pop(c, None)
+
+    fresh: Dict[str, Dict[str, Any]] = {}
+    reanalyzed = 0
+    for n in nodes.values():
+        # Nodes bootstrapped from code (no source) only get their formula read: their descriptions
+        # are our own, and e.g. "Stored/base additive term for RES" would make RES_base depend on
+        # RES, closing a false cycle with RES -> RES_base.
+        text = " ".join(filter(None, [n.description if n.source else None, n.formula]))
+        if not text:
+            continue
+        # Only rulebook-sourced nodes yield dangling candidates; skip our own bootstrap
+        # descriptions (noisy internal descriptors like "Stored/base characteristic value ...").
+        fp = _fingerprint(text, "source" if n.source else "")
+        old = entries.get(n.id)
+        if old is not None and old["fp"] == fp:
+            if edges_valid:
+                fresh[n.id] = old
+                continue
+            cands = old["cands"]
+        else:
+            cands = _term_candidates(text) if n.source else []
+            if old is not None:
+                _count(old["cands"], -1)
+            _count(cands, +1)
+        deps, mods = _infer_edges(n, text)
+        fresh[n.id] = {"fp": fp, "dependsOn": deps, "modifies": mods, "cands": cands}
+        reanalyzed += 1
+
+    vanished = [nid for nid in entries if nid not in fresh]
+    for nid in vanished:
+        _count(entries[nid]["cands"], -1)
+
+    if cache_path is not None and (reanalyzed or vanished or not edges_valid):
+        save_inference_cache(cache_path, {"aliases": alias_version, "nodes": fresh, "counts": counts})
+
+    def _is_known_term(term: str) -> bool:
+        t = term.strip().lower()
+        if t in known_names:
+            return True
+        if t.endswith("s") and t.rstrip("s") in known_names:
+            return True
+        return False
+
+    # Apply edges + dangling logging
+    for n in list(nodes.values()):
+        entry = fresh.get(n.id)
+        if entry is None:
+            continue
+        n.depends_on.update(entry["dependsOn"])
+        n.modifies.update(entry["modifies"])
 
         # dangling references (only from rulebook-sourced nodes)
         if not n.source:
             continue
-        for term in sorted(per_node_candidates.get(n.id, set())):
+        text = " ".join(filter(None, [n.description, n.formula]))
+        for term in entry["cands"]:
             if _is_known_term(term):
                 continue
             # Filter single-token stopwords and sentence-leading junk.
@@ -695,72 +1214,382 @@ def detect_dependencies(nodes: Dict[str, Node], dangling: List[Dict[str, Any]])
             )
 
 
-def merge_graph(existing: Dict[str, Node], new_nodes: Iterable[Node]) -> Dict[str, Node]:
-    out = dict(existing)
-    for n in new_nodes:
-        if n.id not in out:
-            out[n.id] = n
+def attach_suggestions(nodes: Dict[str, Node], dangling: List[Dict[str, Any]], k: int = 3) -> None:
+    """Add up to `k` likely-meant node ids to each dangling entry (see tools/term_suggest.py)."""
+
+    index = SuggestionIndex(known_terms(((n.name, n.id) for n in nodes.values()), REFERENCE_ALIASES))
+
+    cache: Dict[str, List[str]] = {}
+    for d in dangling:
+        term = d.get("term", "")
+        if term not in cache:
+            # One spare, in case the referencing node itself is among the closest matches.
+            cache[term] = index.suggest(term, k + 1)
+        suggestions = [x for x in cache[term] if x != d.get("referencedBy")][:k]
+        if suggestions:
+            d["suggestions"] = suggestions
+
+
+# --- Structural validation ---
+
+
+def _edge_targets(n: Node, kind: str) -> Iterable[str]:
+    return n.depends_on if kind == "dependsOn" else n.modifies
+
+
+def strongly_connected_components(nodes: Dict[str, Node], kind: str) -> List[List[str]]:
+    """Iterative Tarjan SCC over one edge kind (edges to unknown ids are ignored).
+
+    Components are returned in reverse topological order: a component is emitted only after every
+    component reachable from it, so for dependsOn the dependencies always come first.
+    """
+
+    adj: Dict[str, List[str]] = {
+        nid: sorted(t for t in _edge_targets(n, kind) if t in nodes) for nid, n in nodes.items()
+    }
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    sccs: List[List[str]] = []
+    counter = 0
+
+    for root in sorted(adj):
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        # Explicit DFS stack of (node, position in its adjacency list) to avoid recursion limits.
+        work: List[Tuple[str, int]] = [(root, 0)]
+        while work:
+            v, i = work[-1]
+            succ = adj[v]
+            if i < len(succ):
+                work[-1] = (v, i + 1)
+                w = succ[i]
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, 0))
+                elif w in on_stack:
+                    low[v] = min(low[v], index[w])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == index[v]:
+                comp: List[str] = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    comp.append(w)
+                    if w == v:
+                        break
+                sccs.append(sorted(comp))
+    return sccs
+
+
+def _find_cycle(nodes: Dict[str, Node], kind: str, members: List[str]) -> List[str]:
+    """Return one concrete cycle (start ... start) inside a strongly connected component."""
+
+    allowed = set(members)
+    start = members[0]
+    # BFS from start back to itself, staying inside the component.
+    parent: Dict[str, str] = {}
+    frontier = [start]
+    while frontier:
+        nxt: List[str] = []
+        for v in frontier:
+            for w in _edge_targets(nodes[v], kind):
+                if w not in allowed:
+                    continue
+                if w == start:
+                    path = [v]
+                    while path[-1] != start:
+                        path.append(parent[path[-1]])
+                    return path[::-1] + [start]
+                if w not in parent:
+                    parent[w] = v
+                    nxt.append(w)
+        frontier = nxt
+    return members
+
+
+def validate_graph(nodes: Dict[str, Node]) -> List[Dict[str, Any]]:
+    """Check dependsOn/modifies for cycles and assign each node its dependsOn depth.
+
+    Depth is computed on the dependsOn condensation (cycle members share a layer), so evaluating
+    nodes by ascending depth always sees dependencies first. modifies is only checked for loops:
+    "spends AP" style mechanics legitimately both read and write the same resource, so mixing the
+    two edge kinds would make nearly every ability look cyclic.
+    """
+
+    cycles: List[Dict[str, Any]] = []
+
+    for kind in ("dependsOn", "modifies"):
+        sccs = strongly_connected_components(nodes, kind)
+        comp_of: Dict[str, int] = {}
+        for ci, comp in enumerate(sccs):
+            for nid in comp:
+                comp_of[nid] = ci
+
+        for ci, comp in enumerate(sccs):
+            first = nodes[comp[0]]
+            if len(comp) == 1 and comp[0] not in _edge_targets(first, kind):
+                continue
+            path = _find_cycle(nodes, kind, comp)
+            cycles.append(
+                {
+                    "kind": kind,
+                    "cycle": path,
+                    "sources": sorted({nodes[nid].source for nid in comp if nodes[nid].source}),
+                }
+            )
+
+        if kind != "dependsOn":
             continue
-        cur = out[n.id]
-        cur.depends_on |= n.depends_on
-        cur.modifies |= n.modifies
-        if not cur.formula and n.formula:
-            cur.formula = n.formula
-        if not cur.description and n.description:
-            cur.description = n.description
-        if not cur.source and n.source:
-            cur.source = n.source
-        # Prefer a concrete codeMapping if we found it now.
-        if (not cur.code_mapping) and n.code_mapping:
-            cur.code_mapping = n.code_mapping
-        if (cur.status == "unimplemented") and (n.status is None) and n.code_mapping:
-            cur.status = None
-        if n.status and not cur.status:
-            cur.status = n.status
-        cur.tags = sorted(set(cur.tags + n.tags))
+        # Tarjan emits dependencies before dependents, so one pass in emission order suffices.
+        comp_depth: List[int] = []
+        for ci, comp in enumerate(sccs):
+            d = 0
+            for nid in comp:
+                for t in _edge_targets(nodes[nid], kind):
+                    cj = comp_of.get(t)
+                    if cj is not None and cj != ci:
+                        d = max(d, comp_depth[cj] + 1)
+            comp_depth.append(d)
+            for nid in comp:
+                nodes[nid].depth = d
+
+    return cycles
+
+
+def transitive_reduction(nodes: Dict[str, Node], kind: str = "dependsOn") -> int:
+    """Drop edges already implied by a longer path; returns the number of edges removed.
+
+    Works on the SCC condensation, with each component's reachable set as an int bitset (one bit
+    per component), built in Tarjan emission order so dependencies are always done first. An
+    edge u -> v is redundant when v's component is reachable from any of u's direct targets.
+    Reachability and dependsOn depth are unchanged; edges inside a cycle and edges to unknown
+    ids are kept.
+    """
+
+    sccs = strongly_connected_components(nodes, kind)
+    comp_of: Dict[str, int] = {}
+    for ci, comp in enumerate(sccs):
+        for nid in comp:
+            comp_of[nid] = ci
+
+    reach: List[int] = []
+    for ci, comp in enumerate(sccs):
+        r = 0
+        for nid in comp:
+            for t in _edge_targets(nodes[nid], kind):
+                cj = comp_of.get(t)
+                if cj is not None and cj != ci:
+                    r |= (1 << cj) | reach[cj]
+        reach.append(r)
+
+    removed = 0
+    for nid, n in nodes.items():
+        ci = comp_of[nid]
+        targets = [(t, comp_of[t]) for t in _edge_targets(n, kind) if t in comp_of and comp_of[t] != ci]
+        implied = 0
+        for _, cj in targets:
+            implied |= reach[cj]
+        edges = n.depends_on if kind == "dependsOn" else n.modifies
+        for t, cj in targets:
+            if implied >> cj & 1:
+                edges.discard(t)
+                removed += 1
+    return removed
+
+
+def report_cycles(nodes: Dict[str, Node], cycles: List[Dict[str, Any]]) -> None:
+    for c in cycles:
+        chain = " -> ".join(
+            f"{nodes[nid].name} ({nodes[nid].source or 'core'})" for nid in c["cycle"]
+        )
+        print(f"warning: {c['kind']} cycle: {chain}")
+
+
+def merge_node(out: Dict[str, Node], n: Node) -> None:
+    cur = out.get(n.id)
+    if cur is None:
+        out[n.id] = n
+        return
+    cur.depends_on |= n.depends_on
+    cur.modifies |= n.modifies
+    if not cur.formula and n.formula:
+        cur.formula = n.formula
+    if not cur.description and n.description:
+        cur.description = n.description
+    if not cur.source and n.source:
+        cur.source = n.source
+    # Prefer a concrete codeMapping if we found it now.
+    if (not cur.code_mapping) and n.code_mapping:
+        cur.code_mapping = n.code_mapping
+    if (cur.status == "unimplemented") and (n.status is None) and n.code_mapping:
+        cur.status = None
+    if n.status and not cur.status:
+        cur.status = n.status
+    cur.tags = tuple(sorted(set(cur.tags) | set(n.tags)))
+    # The incoming node carries the current translations.
+    cur.names.update(n.names)
+
+
+NEAR_DUPLICATE_THRESHOLD = 0.8  # Jaccard similarity of word 3-grams, see tools/rule_dedupe.py
+
+# (source, macro, name) of one extracted entry; macro as in MacroEvent (abil/inna/spell/def).
+Occurrence = Tuple[str, str, str]
+OCCURRENCE_LABELS = {"abil": "\\abil", "inna": "\\inna", "spell": "\\spell", "def": "definition"}
+
+
+def merge_into(out: Dict[str, Node], new_nodes: Iterable[Node]) -> Dict[str, Node]:
+    """Merge a (possibly streaming) sequence of nodes into `out` in place."""
+    for n in new_nodes:
+        merge_node(out, n)
     return out
 
 
-def load_existing_graph() -> Dict[str, Node]:
-    if not OUT_RULE_GRAPH.exists():
+def merge_graph(existing: Dict[str, Node], new_nodes: Iterable[Node]) -> Dict[str, Node]:
+    return merge_into(dict(existing), new_nodes)
+
+
+def prune_stale_nodes(nodes: Dict[str, Node], produced: Set[str], sources: Set[str]) -> List[str]:
+    """Remove nodes attributed to an extracted file that no longer produces them (renamed or
+    deleted entries); returns their ids. Core nodes and nodes of files this run didn't extract
+    are kept."""
+    stale = sorted(nid for nid, n in nodes.items() if n.source in sources and nid not in produced)
+    for nid in stale:
+        del nodes[nid]
+    return stale
+
+
+def find_id_collisions(occurrences: Dict[str, List[Occurrence]]) -> List[Dict[str, Any]]:
+    """Ids produced by more than one rulebook entry (e.g. an \\abil and an \\inna of the same name,
+    or a keyword defined in two places)."""
+    return [
+        {"id": nid, "occurrences": occ}
+        for nid, occ in sorted(occurrences.items())
+        if len(occ) > 1
+    ]
+
+
+def report_duplicates(
+    nodes: Dict[str, Node],
+    collisions: List[Dict[str, Any]],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> None:
+    for c in collisions:
+        where = ", ".join(
+            f"{OCCURRENCE_LABELS.get(macro, macro)} '{name}' ({src})" for src, macro, name in c["occurrences"]
+        )
+        print(f"warning: id collision {c['id']}: {where}")
+    try:
+        from rule_dedupe import near_duplicates  # needs numpy
+    except ImportError as e:
+        print(f"warning: skipping near-duplicate check ({e})")
+        return
+    docs = ((nid, n.description) for nid, n in nodes.items() if n.source and n.description)
+    for a, b, sim in near_duplicates(docs, threshold):
+        print(
+            f"warning: near-duplicate descriptions ({sim:.2f}): "
+            f"{nodes[a].name} ({nodes[a].source}) ~ {nodes[b].name} ({nodes[b].source})"
+        )
+
+
+def load_existing_graph(store: Optional[RuleGraphStore] = None) -> Dict[str, Node]:
+    if store is not None and store.node_count():
+        graph = store.load_nodes()
+    elif OUT_RULE_GRAPH.exists():
+        if store is not None:
+            # A new store starts from the committed graph; write_outputs() then seeds it.
+            print(f"Seeding {store.path} from {OUT_RULE_GRAPH.name}")
+        graph = json.loads(read_text(OUT_RULE_GRAPH)).get("@graph", [])
+    else:
         return {}
-    data = json.loads(read_text(OUT_RULE_GRAPH))
-    graph = data.get("@graph", [])
     out: Dict[str, Node] = {}
     for item in graph:
-        n = Node(
-            id=item["@id"],
-            type=item.get("@type", "Mechanic"),
-            name=item.get("name") or item["@id"],
-            source=item.get("source"),
-            formula=item.get("formula"),
-            code_mapping=item.get("codeMapping"),
-            status=item.get("@status"),
-            tags=item.get("tags") or [],
-            description=item.get("description"),
-        )
         # IMPORTANT: we intentionally do NOT persist/restore dependsOn/modifies edges from disk.
         # Those edges are inferred heuristically and have historically been very noisy; they should
         # be recomputed each run by detect_dependencies(), while explicit edges are reintroduced via
-        # build_core_domain_nodes().
-        n.depends_on = set()
-        n.modifies = set()
+        # build_core_domain_nodes(). node_from_jsonld() starts with empty edge sets.
+        n = node_from_jsonld(item)
         out[n.id] = n
     return out
 
 
-def write_outputs(nodes: Dict[str, Node], dangling: List[Dict[str, Any]]) -> None:
-    context = {
-        "@vocab": "urn:ttrpg:",
-        "dependsOn": {"@type": "@id"},
-        "modifies": {"@type": "@id"},
-        "codeMapping": "https://example.invalid/codeMapping",
-    }
-    out = {
-        "@context": context,
-        "@graph": [nodes[k].to_jsonld() for k in sorted(nodes.keys())],
-    }
-    OUT_RULE_GRAPH.write_text(json.dumps(out, indent=2, ensure_ascii=False), encoding="utf-8")
+def node_from_jsonld(item: Dict[str, Any]) -> Node:
+    """Rebuild a Node from its JSON-LD form, without dependsOn/modifies edges."""
+    names = item.get("names")
+    return Node(
+        id=item["@id"],
+        type=item.get("@type", "Mechanic"),
+        name=item.get("name") or item["@id"],
+        source=item.get("source"),
+        formula=item.get("formula"),
+        code_mapping=item.get("codeMapping"),
+        status=item.get("@status"),
+        tags=item.get("tags") or [],
+        description=item.get("description"),
+        names=dict(names) if isinstance(names, dict) else None,
+    )
+
+
+JSONLD_CONTEXT: Dict[str, Any] = {
+    "@vocab": "urn:ttrpg:",
+    "dependsOn": {"@type": "@id"},
+    "modifies": {"@type": "@id"},
+    "codeMapping": "https://example.invalid/codeMapping",
+}
+
+
+def write_jsonld(path: Path, graph: Iterable[Dict[str, Any]]) -> None:
+    """Stream a JSON-LD document to `path`, one node at a time.
+
+    The bytes match json.dumps({"@context": ..., "@graph": [...]}, indent=2) without ever
+    building the whole document string.
+    """
+
+    context = json.dumps(JSONLD_CONTEXT, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+    with path.open("w", encoding="utf-8") as f:
+        f.write('{\n  "@context": ' + context + ',\n  "@graph": [')
+        empty = True
+        for node in graph:
+            f.write("\n    " if empty else ",\n    ")
+            f.write(json.dumps(node, indent=2, ensure_ascii=False).replace("\n", "\n    "))
+            empty = False
+        f.write("]\n}" if empty else "\n  ]\n}")
+
+
+def serialize_graph(nodes: Dict[str, Node]) -> List[Dict[str, Any]]:
+    """JSON-LD node dicts sorted by id: built once per run and shared by every output."""
+    return [nodes[k].to_jsonld() for k in sorted(nodes.keys())]
+
+
+def write_outputs(
+    graph: List[Dict[str, Any]],
+    dangling: List[Dict[str, Any]],
+    store: Optional[RuleGraphStore] = None,
+    shard_dir: Optional[Path] = None,
+) -> None:
+    if store is not None:
+        # Only changed nodes are written; rule_graph.json is exported on demand.
+        store.set_context(JSONLD_CONTEXT)
+        changed, unchanged, removed = store.upsert(graph, prune=True)
+        print(f"Upserted into {store.path} (changed={changed} unchanged={unchanged} removed={removed})")
+    else:
+        write_jsonld(OUT_RULE_GRAPH, graph)
+    if shard_dir is not None:
+        written, unchanged, removed = write_shards(shard_dir, graph, JSONLD_CONTEXT)
+        print(f"Wrote {shard_dir} (shards written={written} unchanged={unchanged} removed={removed})")
 
     # De-duplicate dangling entries
     seen: Set[Tuple[str, str]] = set()
@@ -774,57 +1603,231 @@ def write_outputs(nodes: Dict[str, Node], dangling: List[Dict[str, Any]]) -> Non
     OUT_DANGLING.write_text(json.dumps(deduped, indent=2, ensure_ascii=False), encoding="utf-8")
 
 
-def main() -> None:
-    if not RULEBOOK_MAIN.exists():
-        raise SystemExit(f"Rulebook not found: {RULEBOOK_MAIN}")
-
-    files = load_rulebook_files()
-    symbol_index = build_domain_symbol_index()
-
-    extracted: List[Node] = []
-    for file_rel, txt in files:
-        extracted.extend(extract_abilities(file_rel, txt))
-
-        # Colon-style definitions -> nodes (Keyword/Mechanic/DerivedValue guessed)
-        for term, definition in extract_colon_definitions(file_rel, txt):
-            # Heuristic typing
-            t = "Mechanic"
-            nid_type = "mechanic"
-            if term.upper() in {"STR", "AGI", "STA", "CON", "INT", "SPI", "DEX"}:
-                t = "Attribute"
-                nid_type = "attribute"
-            elif term.upper() in {"AP", "STA"}:
-                t = "DerivedValue"
-                nid_type = "derivedvalue"
-            elif term.lower() in {"rest", "travel", "search", "prepare"}:
-                t = "Mechanic"
-                nid_type = "mechanic"
-            else:
-                # many of these are weapon keywords etc.
-                t = "Keyword"
-                nid_type = "keyword"
-
-            formulas = find_formulas(definition)
-            node = Node(
-                id=urn(nid_type, term),
-                type=t,
-                name=term,
-                source=file_rel,
-                description=definition,
-                formula=formulas[0] if formulas else None,
-            )
-            extracted.append(node)
+# --- Language editions ---
+
+
+# (file position in document order, macro or "def", ordinal of that macro within the file)
+AlignKey = Tuple[int, str, int]
+
+
+def iter_edition_nodes(
+    root: Path,
+    keys: Optional[Dict[str, AlignKey]] = None,
+    max_buffered_bytes: int = DEFAULT_BUFFER_BYTES,
+    sources: Optional[Set[str]] = None,
+    occurrences: Optional[Dict[str, List[Occurrence]]] = None,
+) -> Iterator[Node]:
+    """Stream the nodes of one rulebook edition: files -> macro events -> nodes.
+
+    If `keys` is given, it records each node id's structural position (first occurrence);
+    `sources` collects the extracted files (including those without any entries), and
+    `occurrences` every entry by id, so entries that collapse onto the same @id can be reported
+    (see find_id_collisions).
+    """
+
+    files = iter_include_files(root, max_buffered_bytes=max_buffered_bytes)
+    for fi, (file_rel, text) in enumerate(files):
+        if sources is not None:
+            sources.add(file_rel)
+        for event in iter_macro_events(file_rel, text):
+            n = macro_node(file_rel, event)
+            if keys is not None:
+                keys.setdefault(n.id, (fi, event[0], event[1]))
+            if occurrences is not None:
+                occurrences.setdefault(n.id, []).append((file_rel, event[0], n.name))
+            yield n
+
+
+def edition_graph_path(lang: str) -> Path:
+    return OUT_RULE_GRAPH.with_name(f"{OUT_RULE_GRAPH.stem}.{lang}.json")
+
+
+def write_edition_graph(lang: str, graph: Dict[str, Node]) -> None:
+    write_jsonld(edition_graph_path(lang), (graph[k].to_jsonld() for k in sorted(graph)))
+
+
+# (structural position, @type, name) of one node of a secondary edition.
+AlignRecord = Tuple[AlignKey, str, str]
+
+
+def _edition_worker(lang: str, root: str, max_buffered_bytes: int) -> List[AlignRecord]:
+    # Runs in a worker process: writes rule_graph.<lang>.json itself and ships back only the
+    # alignment records (Node objects don't travel, EdgeSet ids are process-local).
+    reset_id_table()
+    keys: Dict[str, AlignKey] = {}
+    graph = merge_into({}, iter_edition_nodes(Path(root), keys, max_buffered_bytes))
+    write_edition_graph(lang, graph)
+    return [(keys[nid], n.type, n.name) for nid, n in graph.items() if nid in keys]
+
+
+def align_editions(
+    nodes: Dict[str, Node],
+    primary: str,
+    primary_keys: Dict[str, AlignKey],
+    others: Dict[str, List[AlignRecord]],
+) -> Dict[str, int]:
+    """Attach language-tagged names from other editions to the primary edition's nodes.
+
+    Nodes align when they sit at the same structural position: same file position in document
+    order, same macro (\\abil/\\inna/\\spell or colon definition) and same ordinal within the file,
+    and the same @type. Returns the number of unaligned nodes per secondary language.
+    """
+
+    by_key: Dict[AlignKey, Node] = {}
+    for nid, key in primary_keys.items():
+        n = nodes.get(nid)
+        if n is None:
+            continue
+        by_key[key] = n
+        n.names[primary] = n.name
+
+    unaligned: Dict[str, int] = {}
+    for lang, records in others.items():
+        # Names from an earlier run are replaced; entries that no longer align lose theirs.
+        for n in by_key.values():
+            n.names.pop(lang, None)
+        missing = 0
+        for key, ntype, name in records:
+            target = by_key.get(key)
+            if target is None or target.type != ntype:
+                missing += 1
+                continue
+            target.names[lang] = name
+        unaligned[lang] = missing
+    return unaligned
+
+
+def parse_rulebooks(specs: Optional[List[str]]) -> List[Tuple[str, Path]]:
+    if not specs:
+        return [("en", RULEBOOK_ROOT)]
+    out: List[Tuple[str, Path]] = []
+    for spec in specs:
+        lang, sep, path = spec.partition("=")
+        if not sep or not lang or not path:
+            raise SystemExit(f"--rulebook expects LANG=PATH, got {spec!r}")
+        out.append((lang, Path(path).resolve()))
+    return out
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Extract rule_graph.json from the RPG Below rulebook")
+    p.add_argument(
+        "--rulebook",
+        action="append",
+        default=None,
+        metavar="LANG=PATH",
+        help="Rulebook edition root (repeatable); the first is the primary edition. "
+        "Default: en=../RPG_Below_v7_en",
+    )
+    p.add_argument(
+        "--store",
+        default=None,
+        help="Merge into this SQLite store (see tools/rule_graph_store.py) instead of rewriting rule_graph.json",
+    )
+    p.add_argument("--export-json", action="store_true", help="With --store, also export rule_graph.json")
+    p.add_argument(
+        "--shards",
+        default=None,
+        metavar="DIR",
+        help="Also write per-type/per-chapter shards and a manifest to DIR (see tools/rule_graph_shards.py)",
+    )
+    p.add_argument("--redis", default=None, metavar="URL", help="Also publish the graph to Redis (see tools/rule_graph_redis.py)")
+    p.add_argument("--no-cache", action="store_true", help="Re-infer dependencies for every node (ignore the cache)")
+    p.add_argument(
+        "--reduce",
+        action="store_true",
+        help="Drop dependsOn edges implied by longer dependsOn paths (transitive reduction)",
+    )
+    p.add_argument(
+        "--suggestions",
+        type=int,
+        default=3,
+        metavar="K",
+        help="Suggest up to K known node ids per dangling reference (0 = off)",
+    )
+    p.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        default=DEFAULT_BUFFER_BYTES // (1024 * 1024),
+        help="Ceiling on rulebook text read ahead of extraction, per edition (MiB)",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    rulebooks = parse_rulebooks(args.rulebook)
+    for _, root in rulebooks:
+        if not (root / "main.tex").exists():
+            raise SystemExit(f"Rulebook not found: {root / 'main.tex'}")
+
+    symbol_table = load_domain_symbol_table()
+    symbol_index = build_domain_symbol_index(symbol_table)
+    budget = max(1, args.memory_limit_mb) * 1024 * 1024
+    reset_id_table()
+
+    primary, primary_root = rulebooks[0]
+    others = rulebooks[1:]
+    pool = ProcessPoolExecutor(max_workers=min(len(others), os.cpu_count() or 1)) if others else None
+    futures = {lang: pool.submit(_edition_worker, lang, str(root), budget) for lang, root in others}
+
+    store = RuleGraphStore(Path(args.store)) if args.store else None
+    merged = load_existing_graph(store)
+
+    primary_keys: Dict[str, AlignKey] = {}
+    occurrences: Dict[str, List[Occurrence]] = {}
+    sources: Set[str] = set()
+    nodes: Iterable[Node] = iter_edition_nodes(primary_root, primary_keys, budget, sources, occurrences)
+    if others:
+        # The primary edition is also written on its own, like the others.
+        edition = merge_into({}, nodes)
+        write_edition_graph(primary, edition)
+        merge_into(merged, edition.values())
+    else:
+        merge_into(merged, nodes)
+    stale = prune_stale_nodes(merged, set(occurrences), sources)
+    if stale:
+        print(f"Removed {len(stale)} node(s) no longer in the rulebook")
 
     # Add core domain nodes (implemented mechanics)
-    extracted.extend(build_core_domain_nodes(symbol_index))
+    merge_into(merged, build_core_domain_nodes(symbol_index))
 
-    existing = load_existing_graph()
-    merged = merge_graph(existing, extracted)
+    if pool is not None:
+        records = {lang: fut.result() for lang, fut in futures.items()}
+        pool.shutdown()
+        for lang, missing in align_editions(merged, primary, primary_keys, records).items():
+            print(f"{lang}: {missing} node(s) without a {primary} counterpart")
 
     dangling: List[Dict[str, Any]] = []
-    detect_dependencies(merged, dangling)
-
-    write_outputs(merged, dangling)
+    detect_dependencies(merged, dangling, None if args.no_cache else INFERENCE_CACHE)
+    if args.suggestions > 0:
+        attach_suggestions(merged, dangling, args.suggestions)
+
+    if args.reduce:
+        print(f"Transitive reduction removed {transitive_reduction(merged)} dependsOn edge(s)")
+
+    cycles = validate_graph(merged)
+    report_cycles(merged, cycles)
+    report_duplicates(merged, find_id_collisions(occurrences))
+    report_code_mappings(verify_code_mappings(merged, symbol_table))
+
+    graph = serialize_graph(merged)
+    write_outputs(graph, dangling, store, Path(args.shards) if args.shards else None)
+    if store is not None:
+        if args.export_json:
+            store.export_jsonld(OUT_RULE_GRAPH)
+        store.close()
+    update_index(graph, index_path_for(OUT_RULE_GRAPH))
+    try:
+        from rule_graph_analytics import analytics_path_for, load_analytics  # needs numpy
+    except ImportError as e:
+        print(f"warning: skipping graph analytics ({e})")
+    else:
+        load_analytics(graph, analytics_path_for(OUT_RULE_GRAPH), write=True)
+    if args.redis:
+        changed, removed, unchanged = publish_redis(connect_redis(args.redis), graph)
+        print(f"Published to {args.redis} (changed={changed} removed={removed} unchanged={unchanged})")
 
 
 if __name__ == "__main__":
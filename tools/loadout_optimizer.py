@@ -0,0 +1,288 @@
+"""Pareto-optimal armor / off-hand loadouts for the characters in `app/characters/**`.
+
+For every character, each combination of an armor from `app/armors.json` and up to
+`--max-extra` extra carried items from `app/weapons.json` (shields, spare weapons) is evaluated
+on three objectives:
+
+- protection: armor `prot` + the best `deflection` of every carried weapon (maximize)
+- gear penalty: armor + weapon + container penalties, as `getGearPenalties` (minimize)
+- movement: run + jump - stand cost, from AGI - gear penalty (maximize)
+
+The run/jump/stand and Action Surge formulas are read from the core nodes of `rule_graph.json`
+(falling back to the same formulas built into the extractor), so the optimizer follows the graph.
+The character's own weapons and containers are kept; only the armor and the extras vary.
+
+Options that can't be on any front (e.g. a weapon with no deflection, which only adds penalty) are
+pruned before combining, and the whole roster is evaluated at once as (characters x loadouts)
+NumPy arrays. The result is the Pareto front per character.
+
+Examples:
+
+    # Fronts for the whole roster
+    python tools/loadout_optimizer.py
+
+    # Only the proficient humanoids, allowing two extra items, as JSON
+    python tools/loadout_optimizer.py --characters app/characters/humanoid/proficient --max-extra 2 --json fronts.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ARMORS_PATH = REPO_ROOT / "app" / "armors.json"
+WEAPONS_PATH = REPO_ROOT / "app" / "weapons.json"
+CHARACTERS_ROOT = REPO_ROOT / "app" / "characters"
+RULE_GRAPH = REPO_ROOT / "rule_graph.json"
+
+# Core node -> formula; defaults match build_core_domain_nodes() in extract_rule_graph.py.
+FORMULA_NODES = {
+    "run": "urn:ttrpg:derivedvalue:run_movement",
+    "jump": "urn:ttrpg:derivedvalue:jump_movement",
+    "stand": "urn:ttrpg:derivedvalue:stand_cost",
+    "surge": "urn:ttrpg:mechanic:action_surge",
+}
+DEFAULT_FORMULAS = {
+    "run": "floor((AGI - gear_penalty) / 3) + run",
+    "jump": "floor((AGI - gear_penalty) / 4) + jump",
+    "stand": "5 - floor((AGI - gear_penalty) / 5) + stand",
+    "surge": "3 + floor(gear_penalty / 3)",
+}
+# The stored movement offsets appear as both `run` and `run_base` in graph formulas.
+MOVEMENT_KEYS = ("run", "jump", "stand")
+FORMULA_NAMES = {"floor", "AGI", "gear_penalty", *MOVEMENT_KEYS, *(f"{k}_base" for k in MOVEMENT_KEYS)}
+
+
+def load_formulas(graph_path: Path) -> Dict[str, str]:
+    formulas = dict(DEFAULT_FORMULAS)
+    if not graph_path.exists():
+        return formulas
+    by_id = {
+        n.get("@id"): n.get("formula")
+        for n in json.loads(graph_path.read_text(encoding="utf-8")).get("@graph", [])
+        if isinstance(n, dict)
+    }
+    for key, node_id in FORMULA_NODES.items():
+        f = by_id.get(node_id)
+        if not isinstance(f, str):
+            continue
+        if key == "surge":
+            # "cost = 3 + floor(gear_penalty / 3); effect: ..." -> the cost expression
+            f = f.split(";", 1)[0].split("=", 1)[-1]
+        formulas[key] = f.strip()
+    return formulas
+
+
+def compile_formula(expr: str) -> Any:
+    code = compile(expr, "<formula>", "eval")
+    unknown = set(code.co_names) - FORMULA_NAMES
+    if unknown:
+        raise ValueError(f"Unsupported names in formula {expr!r}: {', '.join(sorted(unknown))}")
+    return code
+
+
+def eval_formula(code: Any, **values: np.ndarray) -> np.ndarray:
+    return eval(code, {"__builtins__": {}, "floor": np.floor}, values)
+
+
+# --- Options ---
+
+
+def weapon_deflection(weapon: Dict[str, Any]) -> float:
+    return max((a.get("deflection", 0) for a in weapon.get("attacks") or []), default=0)
+
+
+def load_armors(path: Path = ARMORS_PATH) -> Tuple[List[str], np.ndarray]:
+    """Armor names and an (n, 2) array of [protection, penalty]."""
+    armors = json.loads(path.read_text(encoding="utf-8"))
+    names = sorted(armors)
+    return names, np.array([[armors[k]["prot"], armors[k]["penalty"]] for k in names], dtype=float).reshape(-1, 2)
+
+
+def load_weapons(path: Path = WEAPONS_PATH) -> Tuple[List[str], np.ndarray]:
+    """Weapon names and an (n, 2) array of [deflection, penalty]."""
+    weapons = json.loads(path.read_text(encoding="utf-8"))
+    names = sorted(weapons)
+    rows = [[weapon_deflection(weapons[k]), weapons[k]["penalty"]] for k in names]
+    return names, np.array(rows, dtype=float).reshape(-1, 2)
+
+
+def pareto_mask(objectives: np.ndarray) -> np.ndarray:
+    """Non-dominated rows of (..., n, k) objectives, all maximized; ties are all kept."""
+    a = objectives[..., :, None, :]
+    b = objectives[..., None, :, :]
+    # dominated[i] if some j is >= on every objective and > on at least one
+    dominates = np.all(b >= a, axis=-1) & np.any(b > a, axis=-1)
+    return ~dominates.any(axis=-1)
+
+
+def prune(names: List[str], values: np.ndarray, picks: int = 1) -> Tuple[List[str], np.ndarray]:
+    """Drop options dominated on [benefit, penalty] (benefit maximized, penalty minimized).
+
+    When up to `picks` options are combined, one is only dropped if at least `picks` others
+    dominate it: a weaker shield can still be worth carrying next to the better one, but any
+    set holding it then leaves a dominating option out to swap in.
+    """
+    v = values * np.array([1.0, -1.0])
+    a, b = v[:, None, :], v[None, :, :]
+    dominated_by = (np.all(b >= a, axis=-1) & np.any(b > a, axis=-1)).sum(axis=-1)
+    keep = dominated_by < max(1, picks)
+    return [n for n, k in zip(names, keep) if k], values[keep]
+
+
+def extra_sets(names: List[str], values: np.ndarray, max_extra: int) -> Tuple[List[Tuple[str, ...]], np.ndarray]:
+    """All combinations of 0..max_extra extra items, pruned again as combined options.
+
+    Among sets with identical totals only the smallest is kept (carrying a dagger that adds
+    nothing is not a distinct loadout).
+    """
+    sets: List[Tuple[str, ...]] = [()]
+    rows = [np.zeros(2)]
+    for r in range(1, max_extra + 1):
+        for combo in combinations(range(len(names)), r):
+            sets.append(tuple(names[i] for i in combo))
+            rows.append(values[list(combo)].sum(axis=0))
+    keep = pareto_mask(np.array(rows) * np.array([1.0, -1.0]))
+    seen = set()
+    for i, row in enumerate(rows):
+        key = tuple(row)
+        if keep[i] and key in seen:
+            keep[i] = False
+        seen.add(key)
+    return [s for s, k in zip(sets, keep) if k], np.array(rows)[keep]
+
+
+# --- Roster ---
+
+
+def load_roster(root: Path = CHARACTERS_ROOT) -> List[Tuple[str, Dict[str, Any]]]:
+    """Characters with the humanoid sheet layout (characteristics + movement)."""
+    out: List[Tuple[str, Dict[str, Any]]] = []
+    for p in sorted(root.rglob("*.json")):
+        c = json.loads(p.read_text(encoding="utf-8"))
+        if isinstance(c, dict) and "characteristics" in c and "movement" in c:
+            out.append((str(p.relative_to(root)).replace("\\", "/"), c))
+    return out
+
+
+def optimize_roster(
+    roster: List[Tuple[str, Dict[str, Any]]],
+    armors: Tuple[List[str], np.ndarray],
+    weapons: Tuple[List[str], np.ndarray],
+    formulas: Dict[str, str],
+    max_extra: int = 1,
+) -> List[Dict[str, Any]]:
+    """Pareto front of loadouts for every character, evaluated as one (characters x loadouts) batch."""
+
+    armor_names, armor_vals = prune(*armors)
+    extra_names, extra_vals = extra_sets(*prune(*weapons, picks=max_extra), max_extra)
+
+    # Loadouts = armor x extra set, flattened.
+    ai, ei = np.meshgrid(np.arange(len(armor_names)), np.arange(len(extra_names)), indexing="ij")
+    ai, ei = ai.ravel(), ei.ravel()
+    load_prot = armor_vals[ai, 0] + extra_vals[ei, 0]
+    load_pen = armor_vals[ai, 1] + extra_vals[ei, 1]
+
+    fixed_pen, fixed_prot, agi = [], [], []
+    raw: Dict[str, List[float]] = {k: [] for k in MOVEMENT_KEYS}
+    for _, c in roster:
+        own = list((c.get("weapons") or {}).values())
+        fixed_pen.append(
+            sum(w.get("penalty", 0) for w in own)
+            + sum(x.get("penalty", 0) for x in (c.get("containers") or {}).values())
+        )
+        fixed_prot.append(sum(weapon_deflection(w) for w in own))
+        agi.append(c["characteristics"].get("AGI", 0))
+        for k in raw:
+            raw[k].append(c["movement"].get(k, 0))
+
+    def col(xs: List[float]) -> np.ndarray:
+        return np.array(xs, dtype=float)[:, None]  # (characters, 1)
+
+    penalty = col(fixed_pen) + load_pen[None, :]
+    protection = col(fixed_prot) + load_prot[None, :]
+    env = {"AGI": col(agi), "gear_penalty": penalty}
+    for k, v in raw.items():
+        env[k] = env[f"{k}_base"] = col(v)
+    shape = penalty.shape
+    run = np.broadcast_to(eval_formula(compile_formula(formulas["run"]), **env), shape)
+    jump = np.broadcast_to(eval_formula(compile_formula(formulas["jump"]), **env), shape)
+    stand = np.broadcast_to(eval_formula(compile_formula(formulas["stand"]), **env), shape)
+    surge = np.broadcast_to(eval_formula(compile_formula(formulas["surge"]), **env), shape)
+    movement = run + jump - stand
+
+    front = pareto_mask(np.stack([protection, -penalty, movement], axis=-1))
+
+    results: List[Dict[str, Any]] = []
+    for ci, (rel, c) in enumerate(roster):
+        idx = np.flatnonzero(front[ci])
+        idx = idx[np.lexsort((penalty[ci, idx], -protection[ci, idx]))]
+        results.append(
+            {
+                "character": rel,
+                "name": c.get("name", rel),
+                "current": c.get("armor", {}).get("name"),
+                "front": [
+                    {
+                        "armor": armor_names[ai[li]],
+                        "extra": list(extra_names[ei[li]]),
+                        "protection": float(protection[ci, li]),
+                        "penalty": float(penalty[ci, li]),
+                        "movement": float(movement[ci, li]),
+                        "run": float(run[ci, li]),
+                        "jump": float(jump[ci, li]),
+                        "stand": float(stand[ci, li]),
+                        "actionSurgeCost": float(surge[ci, li]),
+                    }
+                    for li in idx
+                ],
+            }
+        )
+    return results
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Pareto-optimal armor/extra-item loadouts per character")
+    p.add_argument("--characters", default=str(CHARACTERS_ROOT), help="Character sheet directory (searched recursively)")
+    p.add_argument("--graph", default=str(RULE_GRAPH), help="rule_graph.json to read movement formulas from")
+    p.add_argument("--max-extra", type=int, default=1, help="Extra weapons/shields carried on top of the character's own")
+    p.add_argument("--json", dest="json_out", default=None, help="Write the fronts as JSON to this path")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    roster = load_roster(Path(args.characters))
+    results = optimize_roster(
+        roster,
+        load_armors(),
+        load_weapons(),
+        load_formulas(Path(args.graph)),
+        max_extra=max(0, args.max_extra),
+    )
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Wrote {args.json_out} (characters={len(results)})")
+        return
+
+    for r in results:
+        print(f"{r['name']}  ({r['character']}, wearing {r['current']})")
+        for x in r["front"]:
+            extra = " + " + ", ".join(x["extra"]) if x["extra"] else ""
+            print(
+                f"  {x['armor']}{extra}: prot={x['protection']:g} penalty={x['penalty']:g} "
+                f"run={x['run']:g} jump={x['jump']:g} stand={x['stand']:g} surge={x['actionSurgeCost']:g}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Near-duplicate rule descriptions via MinHash + locality-sensitive hashing.
+
+Abilities copied between chapters (and lightly edited) end up as separate nodes with nearly the
+same description. Comparing every pair of descriptions is quadratic; instead each description is
+reduced to a MinHash signature over word shingles, signatures are split into LSH bands, and only
+nodes that share a band bucket become candidate pairs. Candidates are then confirmed with the
+exact Jaccard similarity of their shingle sets.
+
+`tools/extract_rule_graph.py` runs this over the merged graph and prints the pairs it finds,
+alongside id collisions (different rulebook entries that slugify to the same @id).
+
+Examples:
+
+    # Near-duplicate descriptions in the current graph, as JSON
+    python tools/rule_dedupe.py --threshold 0.7
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from rule_search import load_jsonld_graph
+
+
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: pairs above ~0.45 Jaccard very likely share a bucket
+MERSENNE = (1 << 61) - 1
+MIN_SHINGLES = 4  # descriptions shorter than this are too generic to compare
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> Set[int]:
+    words = WORD_RE.findall(text.lower())
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i : i + k]).encode("utf-8")) for i in range(len(words) - k + 1)}
+
+
+class MinHasher:
+    """MinHash signatures from NUM_PERM universal hash functions (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 42) -> None:
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE, size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: Set[int]) -> np.ndarray:
+        x = np.fromiter(items, dtype=np.uint64, count=len(items))
+        # x < 2^32 and a, b < 2^61: the product wraps mod 2^64, which is still a fine
+        # pseudo-random permutation family for MinHash purposes.
+        h = (x[:, None] * self.a[None, :] + self.b[None, :]) % np.uint64(MERSENNE)
+        return h.min(axis=0)
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def near_duplicates(
+    docs: Iterable[Tuple[str, str]],
+    threshold: float = 0.8,
+    bands: int = BANDS,
+) -> List[Tuple[str, str, float]]:
+    """(id, id, similarity) for every pair of documents at or above `threshold` Jaccard."""
+
+    hasher = MinHasher()
+    rows = NUM_PERM // bands
+    ids: List[str] = []
+    sets: List[Set[int]] = []
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    for doc_id, text in docs:
+        sh = shingles(text)
+        if len(sh) < MIN_SHINGLES:
+            continue
+        i = len(ids)
+        ids.append(doc_id)
+        sets.append(sh)
+        sig = hasher.signature(sh)
+        for band in range(bands):
+            buckets.setdefault((band, sig[band * rows : (band + 1) * rows].tobytes()), []).append(i)
+
+    candidates: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                candidates.add((members[x], members[y]))
+
+    out: List[Tuple[str, str, float]] = []
+    for i, j in candidates:
+        sim = jaccard(sets[i], sets[j])
+        if sim >= threshold:
+            a, b = sorted((ids[i], ids[j]))
+            out.append((a, b, sim))
+    out.sort(key=lambda x: (-x[2], x[0], x[1]))
+    return out
+
+
+def describe_pairs(
+    pairs: List[Tuple[str, str, float]],
+    names: Dict[str, str],
+    sources: Dict[str, Optional[str]],
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "similarity": round(sim, 3),
+            "nodes": [
+                {"@id": nid, "name": names.get(nid, nid), "source": sources.get(nid)} for nid in (a, b)
+            ],
+        }
+        for a, b, sim in pairs
+    ]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Find near-duplicate node descriptions (MinHash/LSH)")
+    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+    p.add_argument("--threshold", type=float, default=0.8, help="Minimum Jaccard similarity of word 3-grams")
+    p.add_argument("--all", action="store_true", help="Include core nodes (default: rulebook-sourced only)")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    nodes = [n for n in load_jsonld_graph(Path(args.in_path)) if args.all or n.get("source")]
+    pairs = near_duplicates(
+        ((n["@id"], n.get("description") or "") for n in nodes),
+        threshold=args.threshold,
+    )
+    names = {n["@id"]: n.get("name") or n["@id"] for n in nodes}
+    sources = {n["@id"]: n.get("source") for n in nodes}
+    print(json.dumps(describe_pairs(pairs, names, sources), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
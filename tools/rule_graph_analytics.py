@@ -0,0 +1,367 @@
+"""Node importance metrics for the rule graph, computed once per graph version.
+
+For every node, over dependsOn + modifies edges (only between nodes in the graph):
+
+- inDegree / outDegree
+- pagerank: damped PageRank; a node ranks high when important nodes depend on or modify it
+- betweenness: approximate betweenness centrality (Brandes' algorithm from a fixed random sample
+  of source nodes, scaled to the full graph; exact when the graph has at most that many nodes)
+- dependencies / dependents: how many nodes this one transitively depends on, and how many
+  transitively depend on it (dependsOn only)
+
+Everything runs on edge arrays with NumPy (a CSR adjacency for the BFS sweeps, bincount-based
+PageRank iteration, packed bit rows over the strongly connected components for reachability), so
+no graph library is needed.
+
+The results are cached in a sidecar next to the graph (`rule_graph.analytics.json`) keyed by a
+hash of the graph structure (ids and edges): the extractor refreshes it after each run, and the
+visualizer (label selection), search ranking and the query daemon read it instead of
+recomputing. Edits that only touch descriptions or formulas keep the cache valid.
+
+Examples:
+
+    # Most central nodes by PageRank
+    python tools/rule_graph_analytics.py --top 15
+
+    # Mechanics that sit on the most dependency paths
+    python tools/rule_graph_analytics.py --by betweenness --type Mechanic
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rule_graph_store import EDGE_KINDS
+
+
+NodeJson = Dict[str, Any]
+Metrics = Dict[str, Dict[str, float]]
+
+ANALYTICS_VERSION = 1
+METRICS = ("inDegree", "outDegree", "pagerank", "betweenness", "dependencies", "dependents")
+
+DAMPING = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 200
+BETWEENNESS_SAMPLES = 64  # BFS sources for the betweenness estimate
+SEED = 7
+
+
+def analytics_path_for(graph_path: Path) -> Path:
+    if graph_path.is_dir():
+        return graph_path / "analytics.json"
+    return graph_path.with_name(f"{graph_path.stem}.analytics.json")
+
+
+def graph_hash(nodes: Sequence[NodeJson]) -> str:
+    """Hash of the graph structure: node ids and their edges, independent of node order."""
+
+    h = hashlib.sha1()
+    for node in sorted(nodes, key=lambda n: str(n.get("@id"))):
+        parts = [str(node.get("@id"))]
+        for kind in EDGE_KINDS:
+            parts.append(",".join(sorted(x for x in node.get(kind) or [] if isinstance(x, str))))
+        h.update("\x1f".join(parts).encode("utf-8") + b"\x1e")
+    return h.hexdigest()
+
+
+def edge_arrays(
+    ids: List[str], nodes: Sequence[NodeJson], kinds: Tuple[str, ...] = EDGE_KINDS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(src, dst) index arrays of the distinct edges of `kinds` between known nodes, no self-loops."""
+
+    pos = {nid: i for i, nid in enumerate(ids)}
+    pairs = set()
+    for node in nodes:
+        i = pos.get(node.get("@id"))
+        if i is None:
+            continue
+        for kind in kinds:
+            for t in node.get(kind) or []:
+                j = pos.get(t)
+                if j is not None and j != i:
+                    pairs.add((i, j))
+    if not pairs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    arr = np.array(sorted(pairs), dtype=np.int64)
+    return arr[:, 0], arr[:, 1]
+
+
+def csr(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(indptr, indices) of the out-adjacency; `src` must be sorted."""
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst
+
+
+def pagerank(n: int, src: np.ndarray, dst: np.ndarray, damping: float = DAMPING) -> np.ndarray:
+    if n == 0:
+        return np.zeros(0)
+    out_deg = np.bincount(src, minlength=n).astype(float)
+    dangling = out_deg == 0
+    r = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_MAX_ITER):
+        share = np.divide(r, out_deg, out=np.zeros(n), where=~dangling)
+        # Rank of nodes without out-edges is spread evenly, so the total stays 1.
+        nxt = (1.0 - damping) / n + damping * (np.bincount(dst, weights=share[src], minlength=n) + r[dangling].sum() / n)
+        done = np.abs(nxt - r).sum() < PAGERANK_TOL
+        r = nxt
+        if done:
+            break
+    return r
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(source, neighbor) for every out-edge of the frontier nodes."""
+    starts, ends = indptr[frontier], indptr[frontier + 1]
+    counts = ends - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    u = np.repeat(frontier, counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return u, indices[np.repeat(starts, counts) + offsets]
+
+
+def betweenness(
+    n: int,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    samples: int = BETWEENNESS_SAMPLES,
+    seed: int = SEED,
+) -> np.ndarray:
+    """Brandes betweenness from `samples` BFS sources (all nodes if fewer), level-synchronous."""
+
+    bc = np.zeros(n)
+    if n == 0:
+        return bc
+    if n <= samples:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=samples, replace=False))
+
+    for s in sources:
+        dist = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        dist[s], sigma[s] = 0, 1.0
+        frontier = np.array([s], dtype=np.int64)
+        levels: List[Tuple[np.ndarray, np.ndarray]] = []  # shortest-path edges per BFS level
+        d = 0
+        while frontier.size:
+            u, v = _gather(indptr, indices, frontier)
+            new = np.unique(v[dist[v] < 0])
+            dist[new] = d + 1
+            on_path = dist[v] == d + 1
+            u, v = u[on_path], v[on_path]
+            np.add.at(sigma, v, sigma[u])
+            levels.append((u, v))
+            frontier = new
+            d += 1
+
+        delta = np.zeros(n)
+        for u, v in reversed(levels):
+            np.add.at(delta, u, sigma[u] / sigma[v] * (1.0 + delta[v]))
+        delta[s] = 0.0
+        bc += delta
+
+    return bc * (n / len(sources))
+
+
+# Set bits per byte value, for counting packed bit rows without unpacking them.
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def strongly_connected(n: int, indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, int]:
+    """(component label per node, number of components), by iterative Tarjan.
+
+    Components are labeled in the order Tarjan completes them, which is reverse topological:
+    every edge between two components goes from a higher label to a lower one.
+    """
+
+    comp = np.full(n, -1, dtype=np.int64)
+    order = np.full(n, -1, dtype=np.int64)
+    low = np.zeros(n, dtype=np.int64)
+    on_stack = np.zeros(n, dtype=bool)
+    stack: List[int] = []
+    counter = labels = 0
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        work = [(root, int(indptr[root]))]
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, i = work[-1]
+            if i < indptr[v + 1]:
+                work[-1] = (v, i + 1)
+                w = int(indices[i])
+                if order[w] < 0:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, int(indptr[w])))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                low[u] = min(low[u], low[v])
+            if low[v] == order[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    comp[w] = labels
+                    if w == v:
+                        break
+                labels += 1
+    return comp, labels
+
+
+def reachable_counts(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Nodes reachable from each node along src -> dst, excluding the node itself.
+
+    Works on the condensation: components are visited sinks first, and each one's reach set (a
+    packed bit row over nodes) is its members OR-ed with the rows of its successor components,
+    one OR per condensed edge. A row is dropped as soon as its last predecessor has used it, so
+    only the rows of the current frontier are held at once.
+    """
+
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.argsort(src, kind="stable")
+    indptr, indices = csr(n, src[order], dst[order])
+    comp, k = strongly_connected(n, indptr, indices)
+
+    pairs = np.unique(np.stack([comp[src], comp[dst]], axis=1).reshape(-1, 2), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    cptr, csucc = csr(k, pairs[:, 0], pairs[:, 1])
+    waiting = np.bincount(pairs[:, 1], minlength=k)  # predecessors that still need a row
+    members = np.argsort(comp, kind="stable")
+    mptr = np.zeros(k + 1, dtype=np.int64)
+    np.cumsum(np.bincount(comp, minlength=k), out=mptr[1:])
+
+    width = (n + 7) // 8
+    rows: Dict[int, np.ndarray] = {}
+    counts = np.zeros(n, dtype=np.int64)
+    for c in range(k):  # successors always have smaller labels, so they are done already
+        row = np.zeros(width, dtype=np.uint8)
+        own = members[mptr[c] : mptr[c + 1]]
+        np.bitwise_or.at(row, own >> 3, (0x80 >> (own & 7)).astype(np.uint8))
+        for d in csucc[cptr[c] : cptr[c + 1]]:
+            d = int(d)
+            np.bitwise_or(row, rows[d], out=row)
+            waiting[d] -= 1
+            if waiting[d] == 0:
+                del rows[d]
+        counts[own] = int(POPCOUNT[row].sum()) - 1  # members reach each other, not themselves
+        if waiting[c]:
+            rows[c] = row
+    return counts
+
+
+def reachability_counts(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(nodes reachable from each node, nodes reaching each node), excluding the node itself."""
+    return reachable_counts(n, src, dst), reachable_counts(n, dst, src)
+
+
+def compute_analytics(nodes: Sequence[NodeJson]) -> Metrics:
+    ids = sorted(n["@id"] for n in nodes if isinstance(n.get("@id"), str) and n["@id"])
+    n = len(ids)
+    src, dst = edge_arrays(ids, nodes)
+    indptr, indices = csr(n, src, dst)
+
+    in_deg = np.bincount(dst, minlength=n)
+    out_deg = np.bincount(src, minlength=n)
+    pr = pagerank(n, src, dst)
+    bc = betweenness(n, indptr, indices)
+    deps, dependents = reachability_counts(n, *edge_arrays(ids, nodes, ("dependsOn",)))
+
+    return {
+        nid: {
+            "inDegree": int(in_deg[i]),
+            "outDegree": int(out_deg[i]),
+            "pagerank": round(float(pr[i]), 8),
+            "betweenness": round(float(bc[i]), 4),
+            "dependencies": int(deps[i]),
+            "dependents": int(dependents[i]),
+        }
+        for i, nid in enumerate(ids)
+    }
+
+
+def load_analytics(nodes: Sequence[NodeJson], path: Path, write: bool = False) -> Metrics:
+    """Metrics for `nodes`, from the sidecar at `path` if it matches their graph hash.
+
+    On a miss they are computed and, with `write`, stored for the next reader. Only the
+    extractor writes; readers (which may hold just part of the graph) leave the sidecar alone.
+    """
+
+    key = graph_hash(nodes)
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            data = {}
+        if data.get("version") == ANALYTICS_VERSION and data.get("graphHash") == key:
+            return data["nodes"]
+    metrics = compute_analytics(nodes)
+    if write:
+        path.write_text(
+            json.dumps({"version": ANALYTICS_VERSION, "graphHash": key, "nodes": metrics}, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+    return metrics
+
+
+def normalized(metrics: Metrics, key: str = "pagerank") -> Dict[str, float]:
+    """`key` scaled to [0, 1] by its maximum (for use as a ranking prior)."""
+    top = max((m[key] for m in metrics.values()), default=0.0)
+    if top <= 0:
+        return {}
+    return {nid: m[key] / top for nid, m in metrics.items()}
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Rank rule graph nodes by centrality (cached sidecar)")
+    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file or shard directory")
+    p.add_argument("--by", choices=METRICS, default="pagerank", help="Metric to rank by")
+    p.add_argument("--type", dest="types", nargs="*", default=None, help="Only list these @type values")
+    p.add_argument("--top", type=int, default=20, help="Number of nodes to list")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from rule_search import load_jsonld_graph  # rule_search imports this module
+
+    args = parse_args(argv)
+
+    graph_path = Path(args.in_path)
+    nodes = load_jsonld_graph(graph_path)
+    metrics = load_analytics(nodes, analytics_path_for(graph_path))
+
+    by_id = {n["@id"]: n for n in nodes}
+    types = set(args.types) if args.types else None
+    ranked = sorted(
+        (nid for nid in metrics if not types or by_id[nid].get("@type") in types),
+        key=lambda nid: (-metrics[nid][args.by], nid),
+    )
+    for nid in ranked[: args.top]:
+        m = metrics[nid]
+        print(
+            f"{m[args.by]:12.6g}  {by_id[nid].get('name', nid)}  [{by_id[nid].get('@type')}]  "
+            f"in={m['inDegree']} out={m['outDegree']} deps={m['dependencies']} dependents={m['dependents']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
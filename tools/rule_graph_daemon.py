@@ -0,0 +1,401 @@
+"""Long-running local query daemon for the JSON-LD rule graph (`rule_graph.json`).
+
+Keeps the graph, its id/name/reverse-edge indexes and the BM25 search index (see
+`tools/rule_search.py`) hot in memory, and answers JSON queries so the app and scripts don't pay
+for spawning Python and re-parsing the graph on every lookup.
+
+Transports:
+
+- HTTP on localhost: `POST /query` with one query object or a list of them (a batch);
+  `GET /health` returns the loaded graph version.
+- Unix socket (`--socket PATH`): newline-delimited JSON, one query or batch per line.
+
+Queries (`op` selects the operation):
+
+    {"op": "node", "id": "urn:ttrpg:mechanic:action_surge"}
+    {"op": "node", "name": "Action Surge"}
+    {"op": "neighbors", "id": "...", "kind": "dependsOn", "direction": "out"}
+    {"op": "dependents", "id": "urn:ttrpg:derivedvalue:ap", "transitive": true}
+    {"op": "search", "q": "prone grapple", "type": ["Mechanic"], "tags": ["ability"], "limit": 10}
+    {"op": "rank", "by": "pagerank", "type": ["Mechanic"], "limit": 10}
+    {"op": "metrics", "id": "urn:ttrpg:derivedvalue:ap"}
+
+Centrality metrics (rank/metrics, and the search ranking boost) come from the analytics sidecar
+next to the graph (see tools/rule_graph_analytics.py), recomputed only when the graph changed.
+
+Queries arriving concurrently are coalesced into batches that are answered against the same
+graph snapshot. The graph is reloaded in the background when `rule_graph.json` changes on disk.
+
+Examples:
+
+    python tools/rule_graph_daemon.py --in rule_graph.json --port 8765
+    curl -s localhost:8765/query -d '{"op": "node", "name": "AP"}'
+
+    python tools/rule_graph_daemon.py --socket /tmp/rule_graph.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from rule_graph_analytics import METRICS, Metrics, analytics_path_for, load_analytics, normalized
+from rule_search import SearchIndex, index_path_for, load_jsonld_graph
+
+
+NodeJson = Dict[str, Any]
+
+EDGE_KINDS = ("dependsOn", "modifies")
+
+# Upper bound on queries answered per batch; keeps one huge batch from starving the reloader.
+MAX_BATCH = 256
+
+
+class QueryError(Exception):
+    pass
+
+
+def _limit(q: Dict[str, Any], default: int = 20) -> int:
+    v = q.get("limit", default)
+    # bool is an int subclass; "limit": true is a mistake, not 1.
+    if isinstance(v, bool) or not isinstance(v, int) or v < 0:
+        raise QueryError(f"'limit' must be a non-negative integer, got {v!r}")
+    return v
+
+
+def _optional_str(q: Dict[str, Any], key: str) -> Optional[str]:
+    v = q.get(key)
+    if v is not None and not isinstance(v, str):
+        raise QueryError(f"'{key}' must be a string, got {v!r}")
+    return v
+
+
+def _ensure_list(v: Any) -> List[str]:
+    if v is None:
+        return []
+    if isinstance(v, list):
+        return [x for x in v if isinstance(x, str)]
+    if isinstance(v, str):
+        return [v]
+    return []
+
+
+class GraphState:
+    """Immutable snapshot of the graph plus lookup indexes."""
+
+    def __init__(self, nodes: Sequence[NodeJson], mtime: float, search: SearchIndex, metrics: Metrics) -> None:
+        self.mtime = mtime
+        self.by_id: Dict[str, NodeJson] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        self.out_edges: Dict[str, Dict[str, List[str]]] = {k: {} for k in EDGE_KINDS}
+        self.in_edges: Dict[str, Dict[str, List[str]]] = {k: {} for k in EDGE_KINDS}
+        self.search = search
+        self.metrics = metrics
+        self.prior = normalized(metrics)
+
+        for node in nodes:
+            node_id = node.get("@id")
+            if not isinstance(node_id, str) or not node_id:
+                continue
+            self.by_id[node_id] = node
+            name = node.get("name")
+            if isinstance(name, str) and name:
+                self.by_name.setdefault(name.strip().lower(), []).append(node_id)
+
+        for node_id, node in self.by_id.items():
+            for kind in EDGE_KINDS:
+                targets = [t for t in _ensure_list(node.get(kind)) if t in self.by_id]
+                self.out_edges[kind][node_id] = targets
+                for t in targets:
+                    self.in_edges[kind].setdefault(t, []).append(node_id)
+
+    @classmethod
+    def load(cls, graph_path: Path) -> "GraphState":
+        mtime = graph_path.stat().st_mtime
+        nodes = load_jsonld_graph(graph_path)
+        # Start from the stored index so only changed nodes are re-tokenized.
+        search = SearchIndex.load(index_path_for(graph_path))
+        search.update(nodes)
+        return cls(nodes, mtime, search, load_analytics(nodes, analytics_path_for(graph_path)))
+
+    # --- query handlers ---
+
+    def _resolve(self, q: Dict[str, Any]) -> str:
+        node_id = _optional_str(q, "id")
+        if node_id is not None:
+            if node_id not in self.by_id:
+                raise QueryError(f"unknown id: {node_id}")
+            return node_id
+        name = _optional_str(q, "name")
+        if name is not None:
+            ids = self.by_name.get(name.strip().lower())
+            if not ids:
+                raise QueryError(f"unknown name: {name}")
+            return ids[0]
+        raise QueryError("query needs 'id' or 'name'")
+
+    def _kinds(self, q: Dict[str, Any]) -> Tuple[str, ...]:
+        kind = _optional_str(q, "kind")
+        if kind is None:
+            return EDGE_KINDS
+        if kind not in EDGE_KINDS:
+            raise QueryError(f"unknown edge kind: {kind}")
+        return (kind,)
+
+    def node(self, q: Dict[str, Any]) -> Any:
+        if isinstance(q.get("name"), str) and not isinstance(q.get("id"), str):
+            ids = self.by_name.get(q["name"].strip().lower(), [])
+            if not ids:
+                raise QueryError(f"unknown name: {q['name']}")
+            return [self.by_id[i] for i in ids]
+        return self.by_id[self._resolve(q)]
+
+    def neighbors(self, q: Dict[str, Any]) -> Any:
+        node_id = self._resolve(q)
+        direction = q.get("direction", "both")
+        if not isinstance(direction, str) or direction not in {"out", "in", "both"}:
+            raise QueryError(f"unknown direction: {direction}")
+        out: List[Dict[str, str]] = []
+        for kind in self._kinds(q):
+            if direction in {"out", "both"}:
+                out += [{"id": t, "kind": kind, "direction": "out"} for t in self.out_edges[kind].get(node_id, [])]
+            if direction in {"in", "both"}:
+                out += [{"id": s, "kind": kind, "direction": "in"} for s in self.in_edges[kind].get(node_id, [])]
+        return out
+
+    def dependents(self, q: Dict[str, Any]) -> Any:
+        node_id = self._resolve(q)
+        kinds = self._kinds(q) if q.get("kind") else ("dependsOn",)
+        if not q.get("transitive"):
+            return sorted({s for k in kinds for s in self.in_edges[k].get(node_id, [])})
+        seen: Set[str] = set()
+        frontier = [node_id]
+        while frontier:
+            nxt: List[str] = []
+            for v in frontier:
+                for k in kinds:
+                    for s in self.in_edges[k].get(v, []):
+                        if s not in seen and s != node_id:
+                            seen.add(s)
+                            nxt.append(s)
+            frontier = nxt
+        return sorted(seen)
+
+    def search_nodes(self, q: Dict[str, Any]) -> Any:
+        text = q.get("q")
+        if not isinstance(text, str):
+            raise QueryError("search needs 'q'")
+        results = self.search.search(
+            text,
+            limit=_limit(q),
+            types=set(_ensure_list(q.get("type"))) or None,
+            tags=set(_ensure_list(q.get("tags"))) or None,
+            status=_optional_str(q, "status"),
+            prefix=bool(q.get("prefix")),
+            prior=self.prior,
+        )
+        return [
+            {"id": nid, "score": round(score, 4), "name": self.search.docs[nid]["name"]}
+            for nid, score in results
+        ]
+
+    def metrics_of(self, q: Dict[str, Any]) -> Any:
+        return self.metrics.get(self._resolve(q), {})
+
+    def rank(self, q: Dict[str, Any]) -> Any:
+        by = q.get("by", "pagerank")
+        if not isinstance(by, str) or by not in METRICS:
+            raise QueryError(f"unknown metric: {by}")
+        types = set(_ensure_list(q.get("type")))
+        ranked = sorted(
+            (nid for nid in self.metrics if not types or self.by_id[nid].get("@type") in types),
+            key=lambda nid: (-self.metrics[nid][by], nid),
+        )
+        return [
+            {"id": nid, "name": self.by_id[nid].get("name"), by: self.metrics[nid][by]}
+            for nid in ranked[: _limit(q)]
+        ]
+
+    def answer(self, q: Any) -> Dict[str, Any]:
+        handlers = {
+            "node": self.node,
+            "neighbors": self.neighbors,
+            "dependents": self.dependents,
+            "search": self.search_nodes,
+            "metrics": self.metrics_of,
+            "rank": self.rank,
+        }
+        if not isinstance(q, dict):
+            return {"ok": False, "error": "query must be a JSON object"}
+        op = q.get("op")
+        handler = handlers.get(op) if isinstance(op, str) else None
+        if handler is None:
+            return {"ok": False, "error": f"unknown op: {q.get('op')!r}"}
+        try:
+            return {"ok": True, "result": handler(q)}
+        except QueryError as e:
+            return {"ok": False, "error": str(e)}
+
+
+class RuleGraphDaemon:
+    def __init__(self, graph_path: Path, poll_interval: float) -> None:
+        self.graph_path = graph_path
+        self.poll_interval = poll_interval
+        self.state = GraphState.load(graph_path)
+        self.queue: "asyncio.Queue[Tuple[Any, asyncio.Future[Dict[str, Any]]]]" = asyncio.Queue()
+
+    async def submit(self, queries: List[Any]) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for q in queries:
+            fut: asyncio.Future[Dict[str, Any]] = loop.create_future()
+            self.queue.put_nowait((q, fut))
+            futures.append(fut)
+        return list(await asyncio.gather(*futures))
+
+    async def batch_worker(self) -> None:
+        # Drain everything queued since the last tick and answer it against one snapshot.
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            state = self.state
+            for q, fut in batch:
+                if fut.done():
+                    continue
+                try:
+                    fut.set_result(state.answer(q))
+                except Exception as e:
+                    # A bad query must never take the worker (and with it the daemon) down.
+                    fut.set_result({"ok": False, "error": f"internal error: {type(e).__name__}: {e}"})
+            await asyncio.sleep(0)
+
+    async def reload_watcher(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                mtime = self.graph_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime == self.state.mtime:
+                continue
+            try:
+                # Parse off the event loop; queries keep hitting the old snapshot meanwhile.
+                self.state = await asyncio.to_thread(GraphState.load, self.graph_path)
+                print(f"Reloaded {self.graph_path} (nodes={len(self.state.by_id)})")
+            except (OSError, ValueError) as e:
+                # Most likely caught the extractor mid-write; retry on the next poll.
+                print(f"Reload of {self.graph_path} failed: {e}")
+
+    # --- transports ---
+
+    async def _answer_payload(self, payload: bytes) -> Any:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return {"ok": False, "error": "invalid JSON"}
+        if isinstance(data, list):
+            return await self.submit(data)
+        return (await self.submit([data]))[0]
+
+    async def handle_socket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                resp = await self._answer_payload(line)
+                writer.write(json.dumps(resp, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in {b"\r\n", b"\n", b""}:
+                        break
+                    k, _, v = line.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0") or 0))
+
+                method, target = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+                if method == "POST" and target == "/query":
+                    status, resp = "200 OK", await self._answer_payload(body)
+                elif method == "GET" and target == "/health":
+                    status, resp = "200 OK", {"ok": True, "nodes": len(self.state.by_id), "mtime": self.state.mtime}
+                else:
+                    status, resp = "404 Not Found", {"ok": False, "error": f"no route for {method} {target}"}
+
+                out = json.dumps(resp, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(out)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + out
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: Optional[int], socket_path: Optional[str]) -> None:
+        servers = []
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            servers.append(await asyncio.start_unix_server(self.handle_socket, path=socket_path))
+            print(f"Listening on unix:{socket_path}")
+        if port is not None:
+            servers.append(await asyncio.start_server(self.handle_http, host=host, port=port))
+            print(f"Listening on http://{host}:{port}")
+        print(f"Serving {self.graph_path} (nodes={len(self.state.by_id)})")
+
+        await asyncio.gather(self.batch_worker(), self.reload_watcher(), *(s.serve_forever() for s in servers))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Serve rule_graph.json lookups from memory")
+    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+    p.add_argument("--host", default="127.0.0.1", help="HTTP bind address (keep it local)")
+    p.add_argument("--port", type=int, default=8765, help="HTTP port (0 or negative disables HTTP)")
+    p.add_argument("--socket", default=None, help="Also serve newline-delimited JSON on this Unix socket")
+    p.add_argument("--poll", type=float, default=1.0, help="Seconds between checks for a changed graph file")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    async def run() -> None:
+        daemon = RuleGraphDaemon(Path(args.in_path), poll_interval=args.poll)
+        port = args.port if args.port and args.port > 0 else None
+        if port is None and not args.socket:
+            raise SystemExit("Nothing to serve: pass --port and/or --socket")
+        await daemon.serve(args.host, port, args.socket)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
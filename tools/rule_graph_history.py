@@ -0,0 +1,377 @@
+"""Extract the rule graph for every revision of a git-tracked rulebook.
+
+Shows how mechanics and their dependencies evolved, without checking out each commit and
+re-running the full extractor. Revisions are read straight from the object database:
+
+- `git log` lists the revisions (oldest first), `git ls-tree` gives each revision's file ->
+  blob mapping, and blobs are streamed from one long-lived `git cat-file --batch` process.
+- Includes are resolved against the revision's tree, exactly as `iter_include_files` resolves
+  them on disk.
+- Per-file parsing (comment stripping, includes, macro events) is cached by blob hash, so a file
+  that didn't change between revisions is never re-parsed; a revision whose included files are
+  all unchanged reuses the previous graph outright. Dependency inference reuses the per-node
+  inference cache, so only nodes whose text changed are re-analyzed.
+- Revisions are split into contiguous runs processed in parallel worker processes (contiguous,
+  so each worker's blob cache stays warm).
+
+Output (`--out`, default rule_graph.history/):
+
+    index.json          one entry per revision, in commit-time order: revision, time, subject,
+                        node/edge counts, added/changed/removed node counts, and its file
+    0000-<rev>.json     the first revision's full JSON-LD graph
+    0001-<rev>.json     with --mode graphs: every revision's full graph
+    0001-<rev>.diff.json  with --mode diffs (default): added/changed nodes and removed ids
+                        relative to the previous revision
+
+Core domain nodes (and their codeMappings) come from the current app/domain, so differences
+between revisions are differences in the rulebook.
+
+Examples:
+
+    # Diffs for every revision of the rulebook repository
+    python tools/rule_graph_history.py --repo ../RPG_Below_v7_en
+
+    # Full graphs for the last 50 revisions of a rulebook kept in a subdirectory
+    python tools/rule_graph_history.py --repo ../rulebooks --subdir en --max-count 50 --mode graphs
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from extract_rule_graph import (
+    CACHE_DIR,
+    RULEBOOK_ROOT,
+    MacroEvent,
+    build_core_domain_nodes,
+    build_domain_symbol_index,
+    detect_dependencies,
+    include_candidates,
+    iter_macro_events,
+    load_domain_symbol_table,
+    macro_node,
+    merge_into,
+    parse_includes,
+    reset_id_table,
+    strip_tex_comments,
+    validate_graph,
+    write_jsonld,
+)
+from rule_graph_store import EDGE_KINDS, node_hash
+
+
+NodeJson = Dict[str, Any]
+Graph = Dict[str, NodeJson]
+
+# (commit sha, commit time as a unix timestamp, subject)
+Revision = Tuple[str, int, str]
+
+HISTORY_CACHE_DIR = CACHE_DIR / "history"
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True, encoding="utf-8"
+    ).stdout
+
+
+def list_revisions(
+    repo: Path,
+    ref: str = "HEAD",
+    subdir: str = "",
+    since: Optional[str] = None,
+    max_count: Optional[int] = None,
+) -> List[Revision]:
+    """Revisions of `ref` that touch `subdir` (the whole tree if empty), oldest first."""
+
+    args = ["log", "--reverse", "--format=%H%x1f%ct%x1f%s"]
+    if since:
+        args.append(f"--since={since}")
+    if max_count:
+        args.append(f"--max-count={max_count}")
+    args.append(ref)
+    if subdir:
+        args += ["--", subdir]
+    out: List[Revision] = []
+    for line in git(repo, *args).splitlines():
+        sha, ts, subject = line.split("\x1f", 2)
+        out.append((sha, int(ts), subject))
+    return out
+
+
+def list_tree(repo: Path, rev: str, subdir: str = "") -> Dict[str, str]:
+    """Path (relative to `subdir`) -> blob sha, for every file of `rev` under `subdir`."""
+
+    prefix = subdir.strip("/") + "/" if subdir.strip("/") else ""
+    args = ["ls-tree", "-r", "-z", "--full-tree", rev]
+    if prefix:
+        args += ["--", prefix]
+    out: Dict[str, str] = {}
+    for entry in git(repo, *args).split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, kind, blob = meta.split()
+        if kind == "blob" and path.startswith(prefix):
+            out[path[len(prefix) :]] = blob
+    return out
+
+
+class BlobReader:
+    """Blob contents from a long-lived `git cat-file --batch` process (no checkouts)."""
+
+    def __init__(self, repo: Path) -> None:
+        self.proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, blob: str) -> str:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self.proc.stdin.write(blob.encode("ascii") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:
+            raise ValueError(f"Unknown blob {blob}")
+        data = self.proc.stdout.read(int(header[2]) + 1)[:-1]  # content + trailing newline
+        return data.decode("utf-8", errors="ignore")
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+
+def resolve_tree_include(files: Dict[str, str], parent: str, cmd: str, name: str) -> Optional[str]:
+    # Same candidates as resolve_include(), looked up in a revision's tree instead of on disk.
+    # Paths outside the tree (\\input{../shared/x}) can't be read from it and don't resolve.
+    for cand in include_candidates(parent, cmd, name):
+        if cand in files:
+            return cand
+    return None
+
+
+# Per-blob parse result: include commands and macro events of the comment-stripped text.
+ParsedBlob = Tuple[List[Tuple[str, str]], List[MacroEvent]]
+
+
+class RevisionExtractor:
+    """Builds one revision's graph at a time, re-parsing only blobs it hasn't seen."""
+
+    def __init__(self, repo: Path, symbol_index: Dict[str, str], cache_path: Optional[Path]) -> None:
+        self.symbol_index = symbol_index
+        self.cache_path = cache_path
+        self.reader = BlobReader(repo)
+        self.parsed: Dict[str, ParsedBlob] = {}
+        self.unresolved: Set[Tuple[str, str]] = set()  # (file, include) pairs already warned about
+
+    def close(self) -> None:
+        self.reader.close()
+
+    def _parse(self, blob: str) -> ParsedBlob:
+        hit = self.parsed.get(blob)
+        if hit is None:
+            text = strip_tex_comments(self.reader.read(blob))
+            # Macro events don't depend on the file's path, so one parse serves every path.
+            hit = (parse_includes(text), list(iter_macro_events("", text)))
+            self.parsed[blob] = hit
+        return hit
+
+    def included_files(self, tree: Dict[str, str]) -> List[Tuple[str, str]]:
+        """(path, blob) of every file included from main.tex, in document order."""
+
+        if "main.tex" not in tree:
+            return []
+        out: List[Tuple[str, str]] = []
+        visited = set()
+        stack = ["main.tex"]
+        while stack:
+            rel = stack.pop()
+            if rel in visited:
+                continue
+            visited.add(rel)
+            includes, _ = self._parse(tree[rel])
+            children: List[str] = []
+            for cmd, name in includes:
+                child = resolve_tree_include(tree, rel, cmd, name)
+                if child is not None:
+                    children.append(child)
+                elif (rel, name) not in self.unresolved:
+                    self.unresolved.add((rel, name))
+                    print(f"warning: {rel}: \\{cmd}{{{name}}} is not in the revision's tree, skipped")
+            stack.extend(c for c in reversed(children) if c not in visited)
+            if rel != "main.tex":
+                out.append((rel, tree[rel]))
+        return out
+
+    def graph(self, files: List[Tuple[str, str]]) -> Graph:
+        reset_id_table()
+        nodes = merge_into(
+            {},
+            (macro_node(rel, event) for rel, blob in files for event in self._parse(blob)[1]),
+        )
+        merge_into(nodes, build_core_domain_nodes(self.symbol_index))
+        detect_dependencies(nodes, [], self.cache_path)
+        validate_graph(nodes)
+        return {k: nodes[k].to_jsonld() for k in sorted(nodes)}
+
+
+# (revision, graph, or None if identical to the previous revision of the run)
+RevisionGraph = Tuple[Revision, Optional[Graph]]
+
+
+def _history_worker(
+    repo: str,
+    subdir: str,
+    revisions: List[Revision],
+    symbol_index: Dict[str, str],
+    cache_path: Optional[str],
+) -> List[RevisionGraph]:
+    # Runs in a worker process over a contiguous run of revisions.
+    extractor = RevisionExtractor(Path(repo), symbol_index, Path(cache_path) if cache_path else None)
+    out: List[RevisionGraph] = []
+    previous: Optional[List[Tuple[str, str]]] = None
+    try:
+        for rev in revisions:
+            files = extractor.included_files(list_tree(Path(repo), rev[0], subdir))
+            out.append((rev, extractor.graph(files) if files != previous else None))
+            previous = files
+    finally:
+        extractor.close()
+    return out
+
+
+def diff_graphs(old: Graph, old_hashes: Dict[str, str], new: Graph, new_hashes: Dict[str, str]) -> Dict[str, Any]:
+    added = [n for nid, n in new.items() if nid not in old]
+    changed = [n for nid, n in new.items() if nid in old and new_hashes[nid] != old_hashes[nid]]
+    removed = sorted(nid for nid in old if nid not in new)
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def edge_count(graph: Graph) -> int:
+    return sum(len(n.get(kind) or []) for n in graph.values() for kind in EDGE_KINDS)
+
+
+def run_history(
+    repo: Path,
+    out_dir: Path,
+    revisions: List[Revision],
+    subdir: str = "",
+    mode: str = "diffs",
+    workers: int = 1,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """Extract every revision and write the series to `out_dir`; returns the index entries."""
+
+    symbol_index = build_domain_symbol_index(load_domain_symbol_table())
+    workers = max(1, min(workers, len(revisions)))
+    size = -(-len(revisions) // workers) if revisions else 1
+    runs = [revisions[i : i + size] for i in range(0, len(revisions), size)]
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    entries: List[Dict[str, Any]] = []
+    prev_graph: Graph = {}
+    prev_hashes: Dict[str, str] = {}
+    prev_file: Optional[str] = None
+    no_change: Dict[str, Any] = {"added": [], "changed": [], "removed": []}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # One inference cache file per run index, so concurrent workers never share one.
+        futures = [
+            pool.submit(
+                _history_worker,
+                str(repo),
+                subdir,
+                run,
+                symbol_index,
+                str(HISTORY_CACHE_DIR / f"inference.{i}.json") if use_cache else None,
+            )
+            for i, run in enumerate(runs)
+        ]
+        for fut in futures:
+            for (sha, ts, subject), graph in fut.result():
+                i = len(entries)
+                if graph is None:
+                    graph, hashes, diff = prev_graph, prev_hashes, no_change
+                else:
+                    hashes = {nid: node_hash(n) for nid, n in graph.items()}
+                    diff = diff_graphs(prev_graph, prev_hashes, graph, hashes)
+
+                if i > 0 and not any(diff.values()):
+                    file = prev_file if mode == "graphs" else None
+                elif i == 0 or mode == "graphs":
+                    file = f"{i:04d}-{sha[:12]}.json"
+                    write_jsonld(out_dir / file, graph.values())
+                else:
+                    file = f"{i:04d}-{sha[:12]}.diff.json"
+                    body = {"base": entries[-1]["rev"], "rev": sha, **diff}
+                    (out_dir / file).write_text(json.dumps(body, indent=2, ensure_ascii=False), encoding="utf-8")
+
+                entries.append(
+                    {
+                        "rev": sha,
+                        "time": datetime.fromtimestamp(ts, timezone.utc).isoformat(),
+                        "subject": subject,
+                        "nodes": len(graph),
+                        "edges": edge_count(graph),
+                        "added": len(diff["added"]),
+                        "changed": len(diff["changed"]),
+                        "removed": len(diff["removed"]),
+                        "file": file,
+                    }
+                )
+                prev_graph, prev_hashes, prev_file = graph, hashes, file
+
+    index = {"repo": str(repo), "subdir": subdir, "mode": mode, "revisions": entries}
+    (out_dir / "index.json").write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+    return entries
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Extract the rule graph for every revision of a git-tracked rulebook")
+    p.add_argument("--repo", default=str(RULEBOOK_ROOT), help="Git repository containing the rulebook")
+    p.add_argument("--subdir", default="", help="Rulebook directory (containing main.tex) inside the repository")
+    p.add_argument("--ref", default="HEAD", help="Branch, tag or commit whose history is walked")
+    p.add_argument("--since", default=None, help="Only revisions after this date (any `git log --since` value)")
+    p.add_argument("--max-count", type=int, default=None, help="Only the most recent N revisions")
+    p.add_argument("--mode", choices=["diffs", "graphs"], default="diffs", help="Write per-revision diffs or full graphs")
+    p.add_argument("--out", dest="out_dir", default="rule_graph.history", help="Output directory")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    p.add_argument("--no-cache", action="store_true", help="Don't reuse cached dependency inference")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    repo = Path(args.repo).resolve()
+    revisions = list_revisions(repo, args.ref, args.subdir.strip("/"), args.since, args.max_count)
+    if not revisions:
+        raise SystemExit(f"No revisions found in {repo} ({args.ref})")
+    entries = run_history(
+        repo,
+        Path(args.out_dir),
+        revisions,
+        subdir=args.subdir.strip("/"),
+        mode=args.mode,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+    )
+    for e in entries:
+        print(
+            f"{e['time'][:19]}  {e['rev'][:12]}  nodes={e['nodes']} edges={e['edges']} "
+            f"+{e['added']} ~{e['changed']} -{e['removed']}  {e['subject']}"
+        )
+    print(f"Wrote {args.out_dir} (revisions={len(entries)})")
+
+
+if __name__ == "__main__":
+    main()
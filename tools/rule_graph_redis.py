@@ -0,0 +1,324 @@
+"""Publish the JSON-LD rule graph to Redis for per-node lookups from the app.
+
+Key layout (all keys share a prefix, `rg:` by default):
+
+    rg:node:<id>              hash   name, type, status, source, formula, codeMapping,
+                                     description, depth, tags (JSON list), names (JSON object)
+    rg:out:<kind>:<id>        set    targets of <id>'s dependsOn/modifies edges
+    rg:in:<kind>:<id>         set    nodes whose <kind> edges point at <id>
+    rg:type:<type>            set    node ids by @type
+    rg:tag:<tag>              set    node ids by tag
+    rg:status:<status>        set    node ids by @status
+    rg:ids                    set    every published node id
+    rg:hashes                 hash   node id -> content hash of the published version
+
+Publishing is diff-based: `rg:hashes` is compared against the new graph, and only changed or
+removed nodes are touched (their hash, edge sets and index memberships). Commands go out in
+pipelined batches; a node's `rg:hashes` entry is written in the same batch as the rest of its
+keys, so an interrupted publish is simply picked up by the next one.
+
+`redis` (redis-py) is only needed for a real server; `MemoryRedis` is an in-process stand-in
+with the same command surface, for tests.
+
+Examples:
+
+    # Publish (or re-publish) the graph
+    python tools/rule_graph_redis.py --url redis://localhost:6379/0 --in rule_graph.json
+
+    # What a publish would change (only reads rg:hashes from the server)
+    python tools/rule_graph_redis.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from rule_graph_store import EDGE_KINDS, node_hash
+from rule_search import load_jsonld_graph
+
+
+NodeJson = Dict[str, Any]
+
+DEFAULT_PREFIX = "rg:"
+DEFAULT_BATCH = 200  # nodes per pipeline round trip
+
+# Node JSON-LD key -> field of the rg:node:<id> hash (lists/objects are stored as JSON).
+SCALAR_FIELDS = (
+    ("name", "name"),
+    ("@type", "type"),
+    ("@status", "status"),
+    ("source", "source"),
+    ("formula", "formula"),
+    ("codeMapping", "codeMapping"),
+    ("description", "description"),
+    ("depth", "depth"),
+)
+JSON_FIELDS = (("tags", "tags"), ("names", "names"))
+
+
+class MemoryRedis:
+    """In-process stand-in for the subset of redis-py used here (decode_responses=True)."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = {}
+
+    def pipeline(self, transaction: bool = False) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def hset(self, name: str, mapping: Dict[str, str]) -> int:
+        h = self.data.setdefault(name, {})
+        added = sum(k not in h for k in mapping)
+        h.update((k, str(v)) for k, v in mapping.items())
+        return added
+
+    def hdel(self, name: str, *keys: str) -> int:
+        h = self.data.get(name, {})
+        n = sum(h.pop(k, None) is not None for k in keys)
+        if not h:
+            self.data.pop(name, None)
+        return n
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        return dict(self.data.get(name, {}))
+
+    def hmget(self, name: str, keys: Sequence[str]) -> List[Optional[str]]:
+        h = self.data.get(name, {})
+        return [h.get(k) for k in keys]
+
+    def sadd(self, name: str, *values: str) -> int:
+        s = self.data.setdefault(name, set())
+        before = len(s)
+        s.update(values)
+        return len(s) - before
+
+    def srem(self, name: str, *values: str) -> int:
+        s = self.data.get(name, set())
+        before = len(s)
+        s.difference_update(values)
+        if not s:
+            self.data.pop(name, None)
+        return before - len(s)
+
+    def smembers(self, name: str) -> Set[str]:
+        return set(self.data.get(name, set()))
+
+
+class MemoryPipeline:
+    def __init__(self, client: MemoryRedis) -> None:
+        self.client = client
+        self.calls: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def __getattr__(self, cmd: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> "MemoryPipeline":
+            self.calls.append((cmd, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        calls, self.calls = self.calls, []
+        return [getattr(self.client, cmd)(*args, **kwargs) for cmd, args, kwargs in calls]
+
+
+def connect(url: str) -> Any:
+    import redis  # optional dependency, only needed for a real server
+
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+class Keys:
+    def __init__(self, prefix: str = DEFAULT_PREFIX) -> None:
+        self.prefix = prefix
+        self.ids = f"{prefix}ids"
+        self.hashes = f"{prefix}hashes"
+
+    def node(self, node_id: str) -> str:
+        return f"{self.prefix}node:{node_id}"
+
+    def out(self, kind: str, node_id: str) -> str:
+        return f"{self.prefix}out:{kind}:{node_id}"
+
+    def inbound(self, kind: str, node_id: str) -> str:
+        return f"{self.prefix}in:{kind}:{node_id}"
+
+    def index(self, field: str, value: str) -> str:
+        return f"{self.prefix}{field}:{value}"
+
+
+def node_fields(node: NodeJson) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    for key, field in SCALAR_FIELDS:
+        v = node.get(key)
+        if v is not None and v != "":
+            fields[field] = str(v)
+    for key, field in JSON_FIELDS:
+        if node.get(key):
+            fields[field] = json.dumps(node[key], ensure_ascii=False)
+    return fields
+
+
+def index_memberships(node: NodeJson) -> Set[Tuple[str, str]]:
+    """(index, value) pairs the node belongs to: its type, status and each tag."""
+    out = {("type", node.get("@type", "Mechanic"))}
+    if node.get("@status"):
+        out.add(("status", node["@status"]))
+    out.update(("tag", t) for t in node.get("tags") or [] if isinstance(t, str))
+    return out
+
+
+PublishedState = Tuple[Set[Tuple[str, str]], Dict[str, Set[str]]]
+
+
+def _published_state(client: Any, keys: Keys, node_ids: List[str]) -> Dict[str, PublishedState]:
+    """Index memberships and out-edges of already-published nodes, fetched in one round trip."""
+
+    pipe = client.pipeline(transaction=False)
+    for node_id in node_ids:
+        pipe.hmget(keys.node(node_id), ["type", "status", "tags"])
+        for kind in EDGE_KINDS:
+            pipe.smembers(keys.out(kind, node_id))
+    results = pipe.execute()
+
+    state: Dict[str, PublishedState] = {}
+    step = 1 + len(EDGE_KINDS)
+    for i, node_id in enumerate(node_ids):
+        ntype, status, tags = results[i * step]
+        old = {"@status": status, "tags": json.loads(tags) if tags else []}
+        if ntype is not None:
+            old["@type"] = ntype
+        edges = {kind: set(results[i * step + 1 + j]) for j, kind in enumerate(EDGE_KINDS)}
+        state[node_id] = (index_memberships(old) if ntype is not None else set(), edges)
+    return state
+
+
+def _hashed(nodes: Iterable[NodeJson]) -> Tuple[Dict[str, NodeJson], Dict[str, str]]:
+    new_nodes: Dict[str, NodeJson] = {}
+    new_hashes: Dict[str, str] = {}
+    for node in nodes:
+        node_id = node.get("@id")
+        if isinstance(node_id, str) and node_id:
+            new_nodes[node_id] = node
+            new_hashes[node_id] = node_hash(node)
+    return new_nodes, new_hashes
+
+
+def _compare(published: Dict[str, str], new_hashes: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    changed = sorted(nid for nid, h in new_hashes.items() if published.get(nid) != h)
+    removed = sorted(nid for nid in published if nid not in new_hashes)
+    return changed, removed
+
+
+def diff(client: Any, nodes: Iterable[NodeJson], prefix: str = DEFAULT_PREFIX) -> Tuple[List[str], List[str], int]:
+    """What publish() would do, without writing: (changed ids, removed ids, unchanged count).
+
+    Reads only the published `rg:hashes`.
+    """
+
+    _, new_hashes = _hashed(nodes)
+    changed, removed = _compare(client.hgetall(Keys(prefix).hashes), new_hashes)
+    return changed, removed, len(new_hashes) - len(changed)
+
+
+def publish(
+    client: Any,
+    nodes: Iterable[NodeJson],
+    prefix: str = DEFAULT_PREFIX,
+    batch: int = DEFAULT_BATCH,
+) -> Tuple[int, int, int]:
+    """Bring Redis in line with `nodes`, touching only changed keys; returns (changed, removed, unchanged)."""
+
+    keys = Keys(prefix)
+    published = client.hgetall(keys.hashes)
+
+    new_nodes, new_hashes = _hashed(nodes)
+    changed, removed = _compare(published, new_hashes)
+    unchanged = len(new_hashes) - len(changed)
+
+    touched = changed + removed
+    for start in range(0, len(touched), batch):
+        chunk = touched[start : start + batch]
+        old_state = _published_state(client, keys, [nid for nid in chunk if nid in published])
+        pipe = client.pipeline(transaction=False)
+        for node_id in chunk:
+            old_index, old_edges = old_state.get(node_id, (set(), {kind: set() for kind in EDGE_KINDS}))
+            node = new_nodes.get(node_id)
+
+            if node is None:
+                new_index: Set[Tuple[str, str]] = set()
+                new_edges: Dict[str, Set[str]] = {kind: set() for kind in EDGE_KINDS}
+                pipe.delete(keys.node(node_id))
+                pipe.srem(keys.ids, node_id)
+            else:
+                new_index = index_memberships(node)
+                new_edges = {kind: {x for x in node.get(kind) or [] if isinstance(x, str)} for kind in EDGE_KINDS}
+                pipe.delete(keys.node(node_id))
+                pipe.hset(keys.node(node_id), mapping=node_fields(node))
+                pipe.sadd(keys.ids, node_id)
+
+            for field, value in old_index - new_index:
+                pipe.srem(keys.index(field, value), node_id)
+            for field, value in new_index - old_index:
+                pipe.sadd(keys.index(field, value), node_id)
+
+            for kind in EDGE_KINDS:
+                gone = old_edges[kind] - new_edges[kind]
+                added = new_edges[kind] - old_edges[kind]
+                if gone:
+                    pipe.srem(keys.out(kind, node_id), *sorted(gone))
+                    for dst in sorted(gone):
+                        pipe.srem(keys.inbound(kind, dst), node_id)
+                if added:
+                    pipe.sadd(keys.out(kind, node_id), *sorted(added))
+                    for dst in sorted(added):
+                        pipe.sadd(keys.inbound(kind, dst), node_id)
+
+            if node is None:
+                pipe.hdel(keys.hashes, node_id)
+            else:
+                pipe.hset(keys.hashes, mapping={node_id: new_hashes[node_id]})
+        pipe.execute()
+
+    return len(changed), len(removed), unchanged
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Publish rule_graph.json to Redis (hashes, edge sets, indexes)")
+    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+    p.add_argument(
+        "--url",
+        default=os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+        help="Redis URL (default: $REDIS_URL or redis://localhost:6379/0)",
+    )
+    p.add_argument("--prefix", default=DEFAULT_PREFIX, help="Key prefix")
+    p.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="Nodes per pipelined batch")
+    p.add_argument("--dry-run", action="store_true", help="Only report what would change (reads rg:hashes, writes nothing)")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    client = connect(args.url)
+    nodes = load_jsonld_graph(Path(args.in_path))
+    if args.dry_run:
+        changed_ids, removed_ids, unchanged = diff(client, nodes, prefix=args.prefix)
+        for nid in changed_ids:
+            print(f"changed  {nid}")
+        for nid in removed_ids:
+            print(f"removed  {nid}")
+        print(f"Would publish to {args.url} (changed={len(changed_ids)} removed={len(removed_ids)} unchanged={unchanged})")
+        return
+
+    changed, removed, unchanged = publish(client, nodes, prefix=args.prefix, batch=max(1, args.batch))
+    print(f"Published to {args.url} (changed={changed} removed={removed} unchanged={unchanged})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Sharded JSON-LD output: one file per (@type, source chapter), plus a manifest.
+
+Consumers that only need a slice of the graph (say Attributes and DerivedValues) shouldn't have
+to parse every Keyword and Mechanic description in `rule_graph.json`. With
+`tools/extract_rule_graph.py --shards rule_graph.shards`, the graph is additionally split into
+small JSON-LD documents, one per @type and source chapter (core nodes use the chapter `core`):
+
+    rule_graph.shards/
+        manifest.json
+        attribute.core.json
+        keyword.chapters_combat.json
+        mechanic.chapters_magic.json
+        ...
+
+`manifest.json` records, per shard, its @type, chapter, node count and content hash, the shard
+of every node id, and the edges that cross shards (counted per shard pair and edge kind), so a
+loader can pick shards by type/chapter and pull in the shards their edges point into.
+
+Shards are rewritten only when their content hash changes: editing one chapter rewrites only
+that chapter's shards (and the manifest).
+
+Sidecars computed from a shard directory (`search.json`, `analytics.json`) live inside it, so they
+never clash with those of `rule_graph.json`.
+
+Examples:
+
+    # Split an existing rule_graph.json
+    python tools/rule_graph_shards.py split --in rule_graph.json --out rule_graph.shards
+
+    # Export just the attribute/derived-value shards (and what they depend on) as one document
+    python tools/rule_graph_shards.py export --dir rule_graph.shards --types Attribute DerivedValue --deps --out core.json
+
+    # Loaders accept the shard directory directly
+    python tools/visualize_schema.py --in rule_graph.shards --include-types Attribute DerivedValue
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from rule_graph_store import DEFAULT_CONTEXT, EDGE_KINDS
+
+
+NodeJson = Dict[str, Any]
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+CORE_CHAPTER = "core"
+
+
+def is_shard_path(path: str) -> bool:
+    p = Path(path)
+    return p.is_dir() and (p / MANIFEST_NAME).exists()
+
+
+def shard_key(node: NodeJson) -> Tuple[str, str]:
+    """(@type, chapter) of a node; the chapter is its source file, or `core`."""
+    return node.get("@type") or "Mechanic", node.get("source") or CORE_CHAPTER
+
+
+def shard_file(ntype: str, chapter: str, disambiguate: bool = False) -> str:
+    """File name of the (@type, chapter) shard. Normalization can map different keys to the same
+    name (`a-b.tex` and `a_b.tex`); with `disambiguate`, a hash of the exact key is appended."""
+    stem = re.sub(r"\.tex$", "", chapter)
+    stem = re.sub(r"[^a-z0-9]+", "_", stem.lower()).strip("_") or CORE_CHAPTER
+    if disambiguate:
+        stem += "-" + hashlib.sha1(f"{ntype}\x1f{chapter}".encode("utf-8")).hexdigest()[:8]
+    return f"{ntype.lower()}.{stem}.json"
+
+
+def shard_files(keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+    """File name per (@type, chapter) key; keys whose plain names collide all get a hash suffix,
+    so a name never depends on which of them was seen first."""
+    by_name: Dict[str, Set[Tuple[str, str]]] = {}
+    for key in keys:
+        by_name.setdefault(shard_file(*key), set()).add(key)
+    out: Dict[Tuple[str, str], str] = {}
+    for name, group in by_name.items():
+        for key in group:
+            out[key] = name if len(group) == 1 else shard_file(*key, disambiguate=True)
+    return out
+
+
+def render_shard(context: Dict[str, Any], nodes: List[NodeJson]) -> str:
+    # Same layout as rule_graph.json, so each shard is a standalone JSON-LD document.
+    return json.dumps({"@context": context, "@graph": nodes}, indent=2, ensure_ascii=False)
+
+
+def load_manifest(shard_dir: Path) -> Dict[str, Any]:
+    path = shard_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data
+
+
+def write_shards(
+    shard_dir: Path,
+    nodes: Iterable[NodeJson],
+    context: Optional[Dict[str, Any]] = None,
+) -> Tuple[int, int, int]:
+    """Write the shards of `nodes` into `shard_dir`; returns (written, unchanged, removed)."""
+
+    context = context or DEFAULT_CONTEXT
+    keyed = [(node, shard_key(node)) for node in nodes if isinstance(node.get("@id"), str) and node["@id"]]
+    names = shard_files(key for _, key in keyed)
+    groups: Dict[str, List[NodeJson]] = {}
+    keys: Dict[str, Tuple[str, str]] = {}
+    index: Dict[str, str] = {}
+    for node, key in keyed:
+        name = names[key]
+        keys[name] = key
+        groups.setdefault(name, []).append(node)
+        index[node["@id"]] = name
+
+    cross: Dict[Tuple[str, str, str], int] = {}
+    for name, members in groups.items():
+        for node in members:
+            for kind in EDGE_KINDS:
+                for dst in node.get(kind) or []:
+                    other = index.get(dst)
+                    if other is not None and other != name:
+                        cross[(name, other, kind)] = cross.get((name, other, kind), 0) + 1
+
+    old_shards = load_manifest(shard_dir).get("shards", {})
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    written = unchanged = 0
+    for name in sorted(groups):
+        members = sorted(groups[name], key=lambda n: n["@id"])
+        text = render_shard(context, members)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        ntype, chapter = keys[name]
+        shards[name] = {"type": ntype, "chapter": chapter, "count": len(members), "hash": digest}
+        if old_shards.get(name, {}).get("hash") == digest and (shard_dir / name).exists():
+            unchanged += 1
+            continue
+        (shard_dir / name).write_text(text, encoding="utf-8")
+        written += 1
+
+    removed = 0
+    for name in old_shards:
+        if name not in shards and (shard_dir / name).exists():
+            (shard_dir / name).unlink()
+            removed += 1
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "@context": context,
+        "shards": shards,
+        "crossEdges": [
+            {"from": src, "to": dst, "kind": kind, "count": n}
+            for (src, dst, kind), n in sorted(cross.items())
+        ],
+        "index": dict(sorted(index.items())),
+    }
+    # Written last (and atomically), so a reader never sees a manifest ahead of its shards.
+    tmp = shard_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(shard_dir / MANIFEST_NAME)
+    return written, unchanged, removed
+
+
+def select_shards(
+    manifest: Dict[str, Any],
+    types: Optional[Set[str]] = None,
+    chapters: Optional[Set[str]] = None,
+    with_dependencies: bool = False,
+) -> List[str]:
+    """Shard files matching the type/chapter filters (None = any), optionally closed over
+    cross-shard edges so every edge target of the selection is loaded too."""
+
+    shards = manifest.get("shards", {})
+    selected = {
+        name
+        for name, info in shards.items()
+        if (not types or info.get("type") in types) and (not chapters or info.get("chapter") in chapters)
+    }
+    if with_dependencies:
+        out_edges: Dict[str, Set[str]] = {}
+        for e in manifest.get("crossEdges", []):
+            out_edges.setdefault(e["from"], set()).add(e["to"])
+        stack = list(selected)
+        while stack:
+            for dst in out_edges.get(stack.pop(), ()):
+                if dst not in selected and dst in shards:
+                    selected.add(dst)
+                    stack.append(dst)
+    return sorted(selected)
+
+
+def load_shards(
+    shard_dir: Path,
+    types: Optional[Set[str]] = None,
+    chapters: Optional[Set[str]] = None,
+    with_dependencies: bool = False,
+) -> List[NodeJson]:
+    """Nodes of the selected shards, sorted by id (the order rule_graph.json uses)."""
+
+    manifest = load_manifest(shard_dir)
+    if not manifest:
+        raise ValueError(f"No shard manifest at {shard_dir / MANIFEST_NAME}")
+    out: List[NodeJson] = []
+    for name in select_shards(manifest, types, chapters, with_dependencies):
+        data = json.loads((shard_dir / name).read_text(encoding="utf-8"))
+        out.extend(x for x in data.get("@graph", []) if isinstance(x, dict))
+    out.sort(key=lambda n: n["@id"])
+    return out
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Split rule_graph.json into per-type/per-chapter shards, or load shards")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    split = sub.add_parser("split", help="Write shards + manifest from a JSON-LD file")
+    split.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+    split.add_argument("--out", dest="out_dir", default="rule_graph.shards", help="Shard directory")
+
+    exp = sub.add_parser("export", help="Write the selected shards as one JSON-LD document")
+    exp.add_argument("--dir", default="rule_graph.shards", help="Shard directory")
+    exp.add_argument("--types", nargs="*", default=None, help="Only shards of these @type values")
+    exp.add_argument("--chapters", nargs="*", default=None, help="Only shards of these source files (or core)")
+    exp.add_argument("--deps", action="store_true", help="Also load shards that selected nodes have edges into")
+    exp.add_argument("--out", dest="out_path", default="rule_graph.partial.json", help="Output JSON-LD path")
+
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.cmd == "split":
+        data = json.loads(Path(args.in_path).read_text(encoding="utf-8"))
+        written, unchanged, removed = write_shards(
+            Path(args.out_dir),
+            (x for x in data.get("@graph", []) if isinstance(x, dict)),
+            data.get("@context") or DEFAULT_CONTEXT,
+        )
+        print(f"Wrote {args.out_dir} (written={written} unchanged={unchanged} removed={removed})")
+        return
+
+    shard_dir = Path(args.dir)
+    nodes = load_shards(
+        shard_dir,
+        set(args.types) if args.types else None,
+        set(args.chapters) if args.chapters else None,
+        with_dependencies=args.deps,
+    )
+    context = load_manifest(shard_dir).get("@context") or DEFAULT_CONTEXT
+    Path(args.out_path).write_text(render_shard(context, nodes), encoding="utf-8")
+    print(f"Wrote {args.out_path} (nodes={len(nodes)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""SQLite-backed storage for the JSON-LD rule graph.
+
+An alternative to round-tripping all of `rule_graph.json` on every extraction: nodes, edges,
+tags and provenance live in tables, and `tools/extract_rule_graph.py --store rule_graph.sqlite`
+upserts only nodes whose content changed, in a single transaction. The database runs in WAL mode
+so readers (the visualizer, scripts) can query it while an extraction is writing.
+
+`rule_graph.json` is exported from the store on demand. A new (empty) store is seeded from the
+existing `rule_graph.json` on its first extraction, and nodes missing from an extraction are
+deleted, so the store holds exactly the graph the JSON file would.
+
+Examples:
+
+    # Extract into the store instead of rewriting rule_graph.json
+    python tools/extract_rule_graph.py --store rule_graph.sqlite
+
+    # Export the JSON-LD file from the store
+    python tools/rule_graph_store.py export --db rule_graph.sqlite --out rule_graph.json
+
+    # Seed a store from an existing rule_graph.json
+    python tools/rule_graph_store.py import --db rule_graph.sqlite --in rule_graph.json
+
+    # The visualizer reads the store directly
+    python tools/visualize_schema.py --in rule_graph.sqlite --exclude-types Keyword
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+NodeJson = Dict[str, Any]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    source TEXT,
+    formula TEXT,
+    code_mapping TEXT,
+    description TEXT,
+    depth INTEGER,
+    names TEXT,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    src TEXT NOT NULL REFERENCES nodes(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    PRIMARY KEY (src, kind, dst)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    node_id TEXT NOT NULL REFERENCES nodes(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (node_id, tag)
+);
+CREATE TABLE IF NOT EXISTS provenance (
+    node_id TEXT PRIMARY KEY REFERENCES nodes(id) ON DELETE CASCADE,
+    source TEXT,
+    first_seen TEXT NOT NULL,
+    last_changed TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_type ON nodes(type);
+CREATE INDEX IF NOT EXISTS nodes_status ON nodes(status);
+CREATE INDEX IF NOT EXISTS nodes_name ON nodes(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS edges_dst ON edges(dst, kind);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags(tag);
+"""
+
+EDGE_KINDS = ("dependsOn", "modifies")
+
+DEFAULT_CONTEXT: Dict[str, Any] = {
+    "@vocab": "urn:ttrpg:",
+    "dependsOn": {"@type": "@id"},
+    "modifies": {"@type": "@id"},
+    "codeMapping": "https://example.invalid/codeMapping",
+}
+
+
+def node_hash(node: NodeJson) -> str:
+    return hashlib.sha1(json.dumps(node, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def is_store_path(path: str) -> bool:
+    return Path(path).suffix.lower() in {".sqlite", ".sqlite3", ".db"}
+
+
+class RuleGraphStore:
+    def __init__(self, path: Path, readonly: bool = False) -> None:
+        self.path = path
+        # isolation_level=None: transactions are managed explicitly (upsert/load_nodes).
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, isolation_level=None)
+        else:
+            self.conn = sqlite3.connect(str(path), isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._migrate()
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # Wait for a concurrent writer's commit instead of failing immediately.
+        self.conn.execute("PRAGMA busy_timeout=5000")
+
+    def _migrate(self) -> None:
+        cols = {row[1] for row in self.conn.execute("PRAGMA table_info(nodes)")}
+        if "names" not in cols:
+            # Language-tagged names (JSON object), added with multi-edition extraction.
+            self.conn.execute("ALTER TABLE nodes ADD COLUMN names TEXT")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RuleGraphStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # --- writing ---
+
+    def set_context(self, context: Dict[str, Any]) -> None:
+        self.conn.execute(
+            "INSERT INTO meta(key, value) VALUES('context', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (json.dumps(context),),
+        )
+
+    def hashes(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT id, hash FROM nodes"))
+
+    def node_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def upsert(self, nodes: Iterable[NodeJson], prune: bool = False) -> Tuple[int, int, int]:
+        """Write nodes whose content hash changed; returns (changed, unchanged, removed).
+
+        With `prune`, `nodes` is the whole graph and stored nodes not among them are deleted
+        (with their edges, tags and provenance). Everything happens in one IMMEDIATE transaction,
+        so readers see either the previous graph or the new one, never a half-written mix.
+        """
+
+        existing = self.hashes()
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        changed = unchanged = 0
+        seen: Set[str] = set()
+
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            for node in nodes:
+                node_id = node["@id"]
+                seen.add(node_id)
+                h = node_hash(node)
+                if existing.get(node_id) == h:
+                    unchanged += 1
+                    continue
+                changed += 1
+                cur.execute(
+                    "INSERT INTO nodes(id, type, name, status, source, formula, code_mapping, description, depth, names, hash) "
+                    "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET type = excluded.type, name = excluded.name, "
+                    "status = excluded.status, source = excluded.source, formula = excluded.formula, "
+                    "code_mapping = excluded.code_mapping, description = excluded.description, "
+                    "depth = excluded.depth, names = excluded.names, hash = excluded.hash",
+                    (
+                        node_id,
+                        node.get("@type", "Mechanic"),
+                        node.get("name") or node_id,
+                        node.get("@status"),
+                        node.get("source"),
+                        node.get("formula"),
+                        node.get("codeMapping"),
+                        node.get("description"),
+                        node.get("depth"),
+                        json.dumps(node["names"], ensure_ascii=False) if node.get("names") else None,
+                        h,
+                    ),
+                )
+                cur.execute("DELETE FROM edges WHERE src = ?", (node_id,))
+                cur.executemany(
+                    "INSERT INTO edges(src, kind, dst) VALUES(?, ?, ?)",
+                    [(node_id, kind, dst) for kind in EDGE_KINDS for dst in node.get(kind) or []],
+                )
+                cur.execute("DELETE FROM tags WHERE node_id = ?", (node_id,))
+                cur.executemany(
+                    "INSERT INTO tags(node_id, tag) VALUES(?, ?)",
+                    [(node_id, t) for t in node.get("tags") or []],
+                )
+                cur.execute(
+                    "INSERT INTO provenance(node_id, source, first_seen, last_changed) VALUES(?, ?, ?, ?) "
+                    "ON CONFLICT(node_id) DO UPDATE SET source = excluded.source, last_changed = excluded.last_changed",
+                    (node_id, node.get("source"), now, now),
+                )
+            stale = [nid for nid in existing if nid not in seen] if prune else []
+            cur.executemany("DELETE FROM nodes WHERE id = ?", [(nid,) for nid in stale])
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        return changed, unchanged, len(stale)
+
+    # --- reading ---
+
+    def context(self) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'context'").fetchone()
+        return json.loads(row[0]) if row else dict(DEFAULT_CONTEXT)
+
+    def load_nodes(self, types: Optional[Set[str]] = None) -> List[NodeJson]:
+        """Rebuild JSON-LD node dicts (same key order as the extractor writes), sorted by id."""
+
+        # One read transaction, so a concurrent upsert can't interleave between the queries.
+        self.conn.execute("BEGIN")
+        try:
+            sql = "SELECT id, type, name, status, source, formula, code_mapping, description, depth, names FROM nodes"
+            params: List[Any] = []
+            if types:
+                sql += f" WHERE type IN ({','.join('?' * len(types))})"
+                params = sorted(types)
+            rows = self.conn.execute(sql + " ORDER BY id", params).fetchall()
+
+            edges: Dict[Tuple[str, str], List[str]] = {}
+            for src, kind, dst in self.conn.execute("SELECT src, kind, dst FROM edges ORDER BY src, kind, dst"):
+                edges.setdefault((src, kind), []).append(dst)
+            tags: Dict[str, List[str]] = {}
+            for node_id, tag in self.conn.execute("SELECT node_id, tag FROM tags ORDER BY node_id, tag"):
+                tags.setdefault(node_id, []).append(tag)
+        finally:
+            self.conn.execute("COMMIT")
+
+        out: List[NodeJson] = []
+        for node_id, ntype, name, status, source, formula, code_mapping, description, depth, names in rows:
+            data: NodeJson = {
+                "@id": node_id,
+                "@type": ntype,
+                "name": name,
+                "dependsOn": edges.get((node_id, "dependsOn"), []),
+                "modifies": edges.get((node_id, "modifies"), []),
+            }
+            if formula:
+                data["formula"] = formula
+            if source:
+                data["source"] = source
+            if code_mapping:
+                data["codeMapping"] = code_mapping
+            if status:
+                data["@status"] = status
+            if node_id in tags:
+                data["tags"] = tags[node_id]
+            if description:
+                data["description"] = description
+            if depth is not None:
+                data["depth"] = depth
+            if names:
+                data["names"] = json.loads(names)
+            out.append(data)
+        return out
+
+    def export_jsonld(self, out_path: Path) -> int:
+        nodes = self.load_nodes()
+        out = {"@context": self.context(), "@graph": nodes}
+        out_path.write_text(json.dumps(out, indent=2, ensure_ascii=False), encoding="utf-8")
+        return len(nodes)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Import/export rule_graph.json to/from the SQLite store")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    exp = sub.add_parser("export", help="Write rule_graph.json from the store")
+    exp.add_argument("--db", default="rule_graph.sqlite", help="SQLite store path")
+    exp.add_argument("--out", dest="out_path", default="rule_graph.json", help="Output JSON-LD path")
+
+    imp = sub.add_parser("import", help="Upsert the nodes of a JSON-LD file into the store")
+    imp.add_argument("--db", default="rule_graph.sqlite", help="SQLite store path")
+    imp.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.cmd == "export":
+        with RuleGraphStore(Path(args.db), readonly=True) as store:
+            n = store.export_jsonld(Path(args.out_path))
+        print(f"Wrote {args.out_path} (nodes={n})")
+        return
+
+    data = json.loads(Path(args.in_path).read_text(encoding="utf-8"))
+    with RuleGraphStore(Path(args.db)) as store:
+        store.set_context(data.get("@context") or DEFAULT_CONTEXT)
+        changed, unchanged, _ = store.upsert(x for x in data.get("@graph", []) if isinstance(x, dict))
+    print(f"Upserted into {args.db} (changed={changed} unchanged={unchanged})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Full-text search over the JSON-LD rule graph (`rule_graph.json`).
+
+Builds a tokenized inverted index over node `name`, `description` and `formula` and ranks
+matches with BM25. The index is stored next to the graph (`rule_graph.search.json`) and is
+updated incrementally: only nodes whose text or metadata changed are re-tokenized.
+`tools/extract_rule_graph.py` refreshes it after every extraction. Scores get a small boost
+from node centrality, read from the analytics sidecar (see tools/rule_graph_analytics.py).
+
+Examples:
+
+    # Which abilities mention prone or grapple?
+    python tools/rule_search.py "prone grapple" --tag ability
+
+    # Prefix matching ("grap*" matches grapple, grappled, ...), only unimplemented Mechanics
+    python tools/rule_search.py "grap*" --type Mechanic --status unimplemented
+
+    # Force a full rebuild of the index
+    python tools/rule_search.py --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import math
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from rule_graph_shards import is_shard_path, load_shards, shard_key
+
+NodeJson = Dict[str, Any]
+
+INDEX_VERSION = 1
+
+# BM25 parameters (standard defaults).
+K1 = 1.2
+B = 0.75
+
+# Name matches count more than a passing mention in a description.
+FIELD_WEIGHTS = (("name", 3), ("description", 1), ("formula", 1))
+
+# With a centrality prior (normalized PageRank, see tools/rule_graph_analytics.py), a score is
+# multiplied by 1 + PRIOR_WEIGHT * prior: a tie-breaker toward central rules, not a re-ranking.
+PRIOR_WEIGHT = 0.25
+
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def normalize_token(tok: str) -> str:
+    # Light plural folding so "grapples" finds "grapple"; deliberately not a full stemmer.
+    if len(tok) > 4 and tok.endswith("ies"):
+        return tok[:-3] + "y"
+    if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+        return tok[:-1]
+    return tok
+
+
+def tokenize(text: str) -> List[str]:
+    return [normalize_token(t) for t in TOKEN_RE.findall(text.lower())]
+
+
+def index_path_for(graph_path: Path) -> Path:
+    # A shard directory keeps its own sidecar, apart from the single-file graph's.
+    if graph_path.is_dir():
+        return graph_path / "search.json"
+    return graph_path.with_name(f"{graph_path.stem}.search.json")
+
+
+def load_jsonld_graph(
+    path: Path,
+    types: Optional[Set[str]] = None,
+    chapters: Optional[Set[str]] = None,
+) -> List[NodeJson]:
+    """Nodes of a JSON-LD file, or of the matching shards of a shard directory.
+
+    `types`/`chapters` (None = all) select by @type and source file (`core` for core nodes).
+    """
+    if is_shard_path(str(path)):
+        return load_shards(path, types, chapters)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and isinstance(data.get("@graph"), list):
+        nodes = [x for x in data["@graph"] if isinstance(x, dict)]
+    elif isinstance(data, list):
+        nodes = [x for x in data if isinstance(x, dict)]
+    else:
+        raise ValueError(f"Unsupported JSON-LD input at {path}")
+    if types or chapters:
+        nodes = [
+            n
+            for n in nodes
+            if (not types or shard_key(n)[0] in types) and (not chapters or shard_key(n)[1] in chapters)
+        ]
+    return nodes
+
+
+def _fingerprint(node: NodeJson) -> str:
+    parts = [str(node.get(k) or "") for k in ("name", "description", "formula", "@type", "@status")]
+    parts.append(",".join(sorted(x for x in node.get("tags") or [] if isinstance(x, str))))
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class SearchIndex:
+    """Inverted index: term -> {node id -> weighted term frequency}."""
+
+    def __init__(self) -> None:
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_len = 0
+        self._vocab: Optional[List[str]] = None
+
+    # --- persistence ---
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        idx = cls()
+        if not path.exists():
+            return idx
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != INDEX_VERSION:
+            return idx
+        idx.docs = data.get("docs", {})
+        idx.postings = data.get("postings", {})
+        idx.total_len = sum(d["len"] for d in idx.docs.values())
+        return idx
+
+    def save(self, path: Path) -> None:
+        out = {"version": INDEX_VERSION, "docs": self.docs, "postings": self.postings}
+        path.write_text(json.dumps(out, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    # --- building ---
+
+    def _remove(self, node_id: str) -> None:
+        doc = self.docs.pop(node_id)
+        self.total_len -= doc["len"]
+        for term in doc["terms"]:
+            plist = self.postings.get(term)
+            if plist is None:
+                continue
+            plist.pop(node_id, None)
+            if not plist:
+                del self.postings[term]
+
+    def _add(self, node: NodeJson, fp: str) -> None:
+        node_id = node["@id"]
+        tf: Dict[str, int] = {}
+        for field, weight in FIELD_WEIGHTS:
+            v = node.get(field)
+            if not isinstance(v, str):
+                continue
+            for tok in tokenize(v):
+                tf[tok] = tf.get(tok, 0) + weight
+        length = sum(tf.values())
+        self.docs[node_id] = {
+            "fp": fp,
+            "len": length,
+            "name": node.get("name") or node_id,
+            "type": node.get("@type"),
+            "status": node.get("@status"),
+            "tags": [x for x in node.get("tags") or [] if isinstance(x, str)],
+            "terms": sorted(tf),
+        }
+        self.total_len += length
+        for term, n in tf.items():
+            self.postings.setdefault(term, {})[node_id] = n
+
+    def update(self, nodes: Iterable[NodeJson]) -> Tuple[int, int, int]:
+        """Sync the index with `nodes`; returns (added, updated, removed) counts."""
+
+        added = updated = 0
+        seen: Set[str] = set()
+        for node in nodes:
+            node_id = node.get("@id")
+            if not isinstance(node_id, str) or not node_id:
+                continue
+            seen.add(node_id)
+            fp = _fingerprint(node)
+            cur = self.docs.get(node_id)
+            if cur is not None and cur["fp"] == fp:
+                continue
+            if cur is not None:
+                self._remove(node_id)
+                updated += 1
+            else:
+                added += 1
+            self._add(node, fp)
+
+        stale = [nid for nid in self.docs if nid not in seen]
+        for nid in stale:
+            self._remove(nid)
+
+        if added or updated or stale:
+            self._vocab = None
+        return added, updated, len(stale)
+
+    # --- querying ---
+
+    def _expand(self, tok: str) -> List[str]:
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        lo = bisect.bisect_left(self._vocab, tok)
+        hi = bisect.bisect_left(self._vocab, tok + "\uffff")
+        return self._vocab[lo:hi]
+
+    def _accept(
+        self,
+        doc: Dict[str, Any],
+        types: Optional[Set[str]],
+        tags: Optional[Set[str]],
+        status: Optional[str],
+    ) -> bool:
+        if types and doc.get("type") not in types:
+            return False
+        if tags and not tags.issubset(doc.get("tags") or []):
+            return False
+        if status is not None:
+            # "none" selects nodes without an @status (i.e. implemented/core rules).
+            want = None if status == "none" else status
+            if doc.get("status") != want:
+                return False
+        return True
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        types: Optional[Set[str]] = None,
+        tags: Optional[Set[str]] = None,
+        status: Optional[str] = None,
+        prefix: bool = False,
+        prior: Optional[Dict[str, float]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Rank nodes for `query` with BM25 (OR semantics across query terms).
+
+        A query term ending in `*` (or every term, with `prefix=True`) matches all indexed terms
+        starting with it; each document scores its best expansion per query term. `prior` (node
+        id -> [0, 1]) boosts central nodes, see PRIOR_WEIGHT.
+        """
+
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_len = self.total_len / n_docs or 1.0
+
+        scores: Dict[str, float] = {}
+        for raw in query.lower().split():
+            is_prefix = prefix or raw.endswith("*")
+            toks = TOKEN_RE.findall(raw)
+            if not toks:
+                continue
+            for i, tok in enumerate(toks):
+                if is_prefix and i == len(toks) - 1:
+                    # Indexed terms are plural-folded: "fireballs*" has to look for "fireball...".
+                    # The raw prefix goes first so a partial word ("gras*") isn't shortened.
+                    terms = self._expand(tok) or self._expand(normalize_token(tok))
+                else:
+                    terms = [normalize_token(tok)]
+
+                best: Dict[str, float] = {}
+                for term in terms:
+                    plist = self.postings.get(term)
+                    if not plist:
+                        continue
+                    df = len(plist)
+                    idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                    for node_id, tf in plist.items():
+                        dl = self.docs[node_id]["len"]
+                        s = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avg_len))
+                        if s > best.get(node_id, 0.0):
+                            best[node_id] = s
+                for node_id, s in best.items():
+                    scores[node_id] = scores.get(node_id, 0.0) + s
+
+        ranked = [
+            (nid, s * (1.0 + PRIOR_WEIGHT * prior.get(nid, 0.0)) if prior else s)
+            for nid, s in scores.items()
+            if self._accept(self.docs[nid], types, tags, status)
+        ]
+        ranked.sort(key=lambda x: (-x[1], x[0]))
+        return ranked[:limit]
+
+
+def update_index(nodes: Iterable[NodeJson], index_path: Path) -> Tuple[int, int, int]:
+    idx = SearchIndex.load(index_path)
+    counts = idx.update(nodes)
+    if any(counts) or not index_path.exists():
+        idx.save(index_path)
+    return counts
+
+
+def load_prior(nodes: Sequence[NodeJson], graph_path: Path) -> Optional[Dict[str, float]]:
+    """Normalized PageRank for `nodes`, or None (text relevance only) when numpy is missing."""
+    try:
+        from rule_graph_analytics import analytics_path_for, load_analytics, normalized  # needs numpy
+    except ImportError as e:
+        print(f"warning: ranking without the centrality prior ({e})")
+        return None
+    return normalized(load_analytics(nodes, analytics_path_for(graph_path)))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="BM25 full-text search over rule_graph.json")
+    p.add_argument("query", nargs="?", default="", help="Search terms (suffix a term with * for prefix match)")
+    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+    p.add_argument("--index", default=None, help="Index path (default: <graph>.search.json next to the graph)")
+    p.add_argument("--type", dest="types", nargs="*", default=None, help="Only these @type values")
+    p.add_argument("--tag", dest="tags", nargs="*", default=None, help="Require all of these tags")
+    p.add_argument("--status", default=None, help="Only this @status ('none' = no status)")
+    p.add_argument("--prefix", action="store_true", help="Treat every query term as a prefix")
+    p.add_argument("--limit", type=int, default=20, help="Maximum number of results")
+    p.add_argument("--rebuild", action="store_true", help="Discard the stored index and rebuild it")
+    p.add_argument("--no-prior", action="store_true", help="Rank by text relevance only (no centrality boost)")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    graph_path = Path(args.in_path)
+    index_path = Path(args.index) if args.index else index_path_for(graph_path)
+
+    idx = SearchIndex() if args.rebuild else SearchIndex.load(index_path)
+    nodes = load_jsonld_graph(graph_path)
+    added, updated, removed = idx.update(nodes)
+    if added or updated or removed or not index_path.exists():
+        idx.save(index_path)
+        print(f"Indexed {index_path} (added={added} updated={updated} removed={removed})")
+
+    if not args.query:
+        return
+
+    prior = None if args.no_prior else load_prior(nodes, graph_path)
+
+    t0 = time.perf_counter()
+    results = idx.search(
+        args.query,
+        limit=args.limit,
+        types=set(args.types) if args.types else None,
+        tags=set(args.tags) if args.tags else None,
+        status=args.status,
+        prefix=args.prefix,
+        prior=prior,
+    )
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    for node_id, score in results:
+        doc = idx.docs[node_id]
+        print(f"{score:7.3f}  {doc['name']}  [{doc['type']}]  {node_id}")
+    print(f"{len(results)} result(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
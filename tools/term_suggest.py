@@ -0,0 +1,187 @@
+"""Did-you-mean suggestions for dangling rule terms.
+
+`tools/extract_rule_graph.py` logs terms it can't resolve to `dangling_references.json`. This
+module indexes every known node name and reference alias in a BK-tree (a metric tree over
+Levenshtein distance), so each dangling term can be matched against the closest known terms
+without comparing it to all of them: the triangle inequality prunes whole subtrees per lookup.
+
+Terms are normalized before indexing and lookup (case, whitespace, punctuation, light plural
+folding shared with tools/rule_search.py), so "Action Point" and "action-points" are the same
+key and plural-only differences cost nothing.
+
+Examples:
+
+    # Suggestions for an ad-hoc term against the current graph
+    python tools/term_suggest.py "Batle Trance" "Grapples"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from rule_search import load_jsonld_graph, normalize_token
+
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+ACRONYM_RE = re.compile(r"[A-Z0-9]+")
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(normalize_token(w) for w in WORD_RE.findall(term.lower()))
+
+
+def edit_distance(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def max_distance(term: str) -> int:
+    """Edit distance tolerated for `term` (as written, before normalization).
+
+    Acronyms and very short words get none: one edit turns XP into AP and SD into SM, so any
+    typo allowance there suggests an unrelated rule. Longer words tolerate a typo per ~6 letters.
+    """
+    raw = term.strip()
+    key = normalize_term(raw)
+    if len(key) <= 3 or ACRONYM_RE.fullmatch(raw):
+        return 0
+    if len(key) <= 6:
+        return 1
+    if len(key) <= 12:
+        return 2
+    return 3
+
+
+class BKTree:
+    """Burkhard-Keller tree over strings with Levenshtein distance."""
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self) -> None:
+        # node = [term, {distance: child node}]
+        self._root: Optional[List[Any]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, term: str) -> None:
+        if self._root is None:
+            self._root = [term, {}]
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            d = edit_distance(term, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [term, {}]
+                self._size += 1
+                return
+            node = child
+
+    def search(self, term: str, tolerance: int) -> List[Tuple[int, str]]:
+        """All (distance, indexed term) within `tolerance` of `term`."""
+
+        out: List[Tuple[int, str]] = []
+        if self._root is None:
+            return out
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = edit_distance(term, node[0])
+            if d <= tolerance:
+                out.append((d, node[0]))
+            for k, child in node[1].items():
+                if d - tolerance <= k <= d + tolerance:
+                    stack.append(child)
+        return out
+
+
+class SuggestionIndex:
+    """Normalized known term -> node ids, searchable by edit distance."""
+
+    def __init__(self, terms: Iterable[Tuple[str, str]] = ()) -> None:
+        self.ids: Dict[str, Set[str]] = {}
+        self.tree = BKTree()
+        for term, node_id in terms:
+            self.add(term, node_id)
+
+    def add(self, term: str, node_id: str) -> None:
+        key = normalize_term(term)
+        if not key:
+            return
+        if key not in self.ids:
+            self.ids[key] = set()
+            self.tree.add(key)
+        self.ids[key].add(node_id)
+
+    def suggest(self, term: str, k: int = 3) -> List[str]:
+        """Up to `k` node ids whose name/alias is closest to `term` (nearest first)."""
+
+        key = normalize_term(term)
+        if not key or k <= 0:
+            return []
+        ranked: List[Tuple[int, int, str]] = []
+        for d, hit in self.tree.search(key, max_distance(term)):
+            for node_id in self.ids[hit]:
+                ranked.append((d, abs(len(hit) - len(key)), node_id))
+        ranked.sort()
+
+        out: List[str] = []
+        for _, _, node_id in ranked:
+            if node_id not in out:
+                out.append(node_id)
+                if len(out) == k:
+                    break
+        return out
+
+
+def known_terms(names: Iterable[Tuple[str, str]], aliases: Dict[str, str]) -> Iterator[Tuple[str, str]]:
+    """(term, node id) pairs to index: every non-empty node name, then each alias whose target
+    node exists. The extractor and the CLI both index exactly this vocabulary."""
+
+    ids: Set[str] = set()
+    for name, node_id in names:
+        ids.add(node_id)
+        if name:
+            yield name, node_id
+    for alias, node_id in aliases.items():
+        if node_id in ids:
+            yield alias, node_id
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Suggest known rule graph nodes for unknown terms")
+    p.add_argument("terms", nargs="+", help="Terms to look up")
+    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
+    p.add_argument("-k", type=int, default=3, help="Suggestions per term")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from extract_rule_graph import REFERENCE_ALIASES  # the extractor imports this module
+
+    args = parse_args(argv)
+
+    nodes = load_jsonld_graph(Path(args.in_path))
+    index = SuggestionIndex(known_terms(((n.get("name") or "", n["@id"]) for n in nodes), REFERENCE_ALIASES))
+    for term in args.terms:
+        print(json.dumps({"term": term, "suggestions": index.suggest(term, args.k)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import json
+import random
+
+import pytest
+
+from extract_rule_graph import (
+    JSONLD_CONTEXT,
+    EdgeSet,
+    Node,
+    align_editions,
+    detect_dependencies,
+    include_dependents,
+    iter_edition_nodes,
+    load_include_graph,
+    merge_into,
+    reset_id_table,
+    transitive_reduction,
+    urn,
+    validate_graph,
+    write_jsonld,
+)
+
+
+def test_edge_set_sorted_insert_and_dedupe():
+    ids = [f"urn:ttrpg:keyword:k{i}" for i in range(50)]
+    shuffled = ids * 2
+    random.Random(4).shuffle(shuffled)
+    edges = EdgeSet(shuffled)
+    assert list(edges) == sorted(ids) and len(edges) == 50
+    assert ids[7] in edges and "urn:ttrpg:keyword:missing" not in edges and 3 not in edges
+    edges.discard(ids[7])
+    edges.discard("urn:ttrpg:keyword:missing")
+    assert ids[7] not in edges and len(edges) == 49
+    assert list(EdgeSet()) == [] and "x" not in EdgeSet()
+
+
+def test_edge_set_merge():
+    a, b = EdgeSet(["b", "d", "f"]), EdgeSet(["a", "d", "g"])
+    a |= b
+    assert list(a) == ["a", "b", "d", "f", "g"]
+    empty = EdgeSet()
+    empty |= b
+    assert list(empty) == ["a", "d", "g"]
+    # Sets built under an earlier id table merge by id, not by their (stale) ints.
+    reset_id_table()
+    c = EdgeSet(["c", "a"])
+    c |= a
+    assert list(c) == ["a", "b", "c", "d", "f", "g"]
+
+
+def test_node_is_slotted():
+    n = Node(id="n", type="Keyword", name="N", depends_on=["z", "y", "z"])
+    with pytest.raises(AttributeError):
+        n.extra = 1
+    assert n.to_jsonld()["dependsOn"] == ["y", "z"]
+    assert n.to_jsonld()["modifies"] == []
+
+
+def graph(depends_on=None, modifies=None, **sources):
+    """Nodes a..e with the given {id: targets} edges."""
+    depends_on, modifies = depends_on or {}, modifies or {}
+    return {
+        nid: Node(
+            id=nid,
+            type="Mechanic",
+            name=nid.upper(),
+            source=sources.get(nid),
+            depends_on=depends_on.get(nid, ()),
+            modifies=modifies.get(nid, ()),
+        )
+        for nid in "abcde"
+    }
+
+
+def test_validate_graph_layers_and_cycles():
+    # a -> b <-> c -> d, e alone; "x" is a dangling target and is ignored.
+    nodes = graph({"a": ["b", "x"], "b": ["c"], "c": ["b", "d"]}, {"e": ["e"]}, b="ch/b.tex")
+    cycles = validate_graph(nodes)
+    assert [(c["kind"], sorted(c["cycle"][:-1]), c["sources"]) for c in cycles] == [
+        ("dependsOn", ["b", "c"], ["ch/b.tex"]),
+        ("modifies", ["e"], []),
+    ]
+    assert cycles[0]["cycle"][0] == cycles[0]["cycle"][-1]
+    # Cycle members share a layer, one above what they depend on.
+    assert {nid: n.depth for nid, n in nodes.items()} == {"a": 2, "b": 1, "c": 1, "d": 0, "e": 0}
+
+
+def test_validate_graph_ignores_dangling_edges():
+    nodes = graph({"a": ["missing"], "b": ["a"]})
+    assert validate_graph(nodes) == []
+    assert nodes["a"].depth == 0 and nodes["b"].depth == 1
+
+
+def test_transitive_reduction():
+    # a -> b -> c -> d plus shortcuts a -> c, a -> d; b <-> e is a cycle whose edges stay.
+    nodes = graph({"a": ["b", "c", "d", "x"], "b": ["c", "e"], "c": ["d"], "e": ["b", "d"]})
+    validate_graph(nodes)
+    depths = {nid: n.depth for nid, n in nodes.items()}
+    # a -> c and a -> d are implied through b. Only a node's own targets count, so e -> d stays
+    # even though its cycle-mate b reaches d.
+    assert transitive_reduction(nodes) == 2
+    assert {nid: list(n.depends_on) for nid, n in nodes.items()} == {
+        "a": ["b", "x"],
+        "b": ["c", "e"],
+        "c": ["d"],
+        "d": [],
+        "e": ["b", "d"],
+    }
+    validate_graph(nodes)
+    assert {nid: n.depth for nid, n in nodes.items()} == depths
+    assert transitive_reduction(nodes) == 0
+
+
+def test_no_inference_from_bootstrap_descriptions():
+    res, base = urn("derivedvalue", "res"), urn("derivedvalue", "res_base")
+    nodes = {
+        res: Node(id=res, type="DerivedValue", name="RES", depends_on=[base], formula="RES_base * DM"),
+        base: Node(id=base, type="DerivedValue", name="RES_base", description="Base additive term for RES"),
+        "rule": Node(id="rule", type="Mechanic", name="Rule", source="ch/a.tex", description="Raises RES"),
+    }
+    detect_dependencies(nodes, [])
+    assert list(nodes[base].depends_on) == []
+    assert list(nodes["rule"].depends_on) == [res]
+    assert validate_graph(nodes) == []
+
+
+def test_includes_resolve_and_skip_comments(tmp_path):
+    files = {
+        "main.tex": "\\include{chapters/a}\n"
+        "% \\input{chapters/hidden}\n"
+        "50\\% done \\input{chapters/b.tex}\n"
+        "\\\\% \\input{chapters/hidden} after a line break\n",
+        # \subfile looks next to the including file first, \input next to main.tex.
+        "chapters/a.tex": "\\subfile{c}\n\\input{d}\nText % trailing comment\n",
+        "chapters/b.tex": "\\input{chapters/a}\n",  # already read: not yielded twice
+        "chapters/c.tex": "\\input{main}\n",  # cycle back to main.tex is cut
+        "chapters/d.tex": "wrong d\n",
+        "chapters/hidden.tex": "",
+        "d.tex": "root d\n",
+    }
+    for rel, text in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text, encoding="utf-8")
+
+    texts, dag = load_include_graph(tmp_path)
+    assert [rel for rel, _ in texts] == ["chapters/a.tex", "chapters/c.tex", "d.tex", "chapters/b.tex"]
+    assert dict(texts)["chapters/a.tex"] == "\\subfile{c}\n\\input{d}\nText \n"
+    assert dag == {
+        "main.tex": ["chapters/a.tex", "chapters/b.tex"],
+        "chapters/a.tex": ["chapters/c.tex", "d.tex"],
+        "chapters/c.tex": ["main.tex"],
+        "d.tex": [],
+        "chapters/b.tex": ["chapters/a.tex"],
+    }
+    assert include_dependents(dag, "d.tex") == {"d.tex", "chapters/a.tex", "chapters/b.tex", "main.tex", "chapters/c.tex"}
+
+
+def test_align_editions(tmp_path):
+    chapters = {
+        "en": "\\abil{Grapple}{Action}{2 AP}{-}{Grab a foe.}\n\\abil{Shove}{Action}{1 AP}{-}{Push a foe.}\n",
+        "pt": "\\abil{Agarrar}{Ação}{2 AP}{-}{Agarra.}\n\\abil{Empurrar}{Ação}{1 AP}{-}{Empurra.}\n"
+        "\\abil{Rolar}{Ação}{1 AP}{-}{Só na edição pt.}\n",
+    }
+    graphs, keys = {}, {}
+    for lang, chapter in chapters.items():
+        root = tmp_path / lang
+        (root / "chapters").mkdir(parents=True)
+        (root / "main.tex").write_text("\\input{chapters/combat}\n", encoding="utf-8")
+        (root / "chapters" / "combat.tex").write_text(chapter, encoding="utf-8")
+        keys[lang] = {}
+        graphs[lang] = merge_into({}, iter_edition_nodes(root, keys[lang]))
+
+    nodes = graphs["en"]
+    grapple, shove = urn("mechanic", "grapple"), urn("mechanic", "shove")
+    assert sorted(nodes) == [grapple, shove]
+    nodes[shove].names["pt"] = "stale"
+    records = [(keys["pt"][nid], n.type, n.name) for nid, n in graphs["pt"].items()]
+
+    assert align_editions(nodes, "en", keys["en"], {"pt": records}) == {"pt": 1}
+    assert nodes[grapple].names == {"en": "Grapple", "pt": "Agarrar"}
+    assert nodes[shove].names == {"en": "Shove", "pt": "Empurrar"}
+
+    # Without the second ability in pt, Shove has no counterpart and loses its old name.
+    records = [r for r in records if r[2] != "Empurrar"]
+    assert align_editions(nodes, "en", keys["en"], {"pt": records}) == {"pt": 1}
+    assert nodes[shove].names == {"en": "Shove"}
+
+
+@pytest.mark.parametrize("count", [0, 1, 4])
+def test_write_jsonld_matches_json_dumps(tmp_path, sample_graph, count):
+    graph = sample_graph()[:count]
+    for n in graph:
+        n["description"] += " (ação)"  # written as-is, not \u-escaped
+    path = tmp_path / "rule_graph.json"
+    write_jsonld(path, iter(graph))
+    expected = json.dumps({"@context": JSONLD_CONTEXT, "@graph": graph}, indent=2, ensure_ascii=False)
+    assert path.read_text(encoding="utf-8") == expected
+    assert json.loads(expected)["@graph"] == graph
+
+
+def test_inference_cache_hit_and_invalidation(tmp_path):
+    cache_path = tmp_path / "inference.json"
+    ap, dl, str_ = urn("derivedvalue", "ap"), urn("keyword", "dl"), urn("attribute", "str")
+
+    def rule_deps(description, *extra):
+        rule = Node(id="rule", type="Mechanic", name="Rule", source="ch/a.tex", description=description)
+        nodes = {n.id: n for n in (rule, *extra)}
+        detect_dependencies(nodes, [], cache_path)
+        return list(rule.depends_on)
+
+    def plant():
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        cache["nodes"]["rule"]["dependsOn"] = ["planted"]
+        cache_path.write_text(json.dumps(cache), encoding="utf-8")
+
+    assert rule_deps("Costs 2 AP, STR vs DL.") == [ap, dl]
+    # Same text: the cached entry is used as-is (a planted edge shows it wasn't recomputed).
+    plant()
+    assert rule_deps("Costs 2 AP, STR vs DL.") == ["planted"]
+    # An edited description is re-analyzed.
+    assert rule_deps("Costs 2 AP.") == [ap]
+    # So is unchanged text once the set of known alias targets changes (STR now exists).
+    plant()
+    strength = Node(id=str_, type="Attribute", name="STR")
+    assert rule_deps("Costs 2 AP.", strength) == [ap]
+    assert rule_deps("Costs 2 AP, STR vs DL.", strength) == [str_, ap, dl]
+    assert json.loads(cache_path.read_text(encoding="utf-8"))["nodes"]["rule"]["dependsOn"] == [str_, ap, dl]
@@ -0,0 +1,67 @@
+import math
+import random
+from itertools import combinations
+
+import numpy as np
+
+from loadout_optimizer import DEFAULT_FORMULAS, optimize_roster
+
+
+def options(table):
+    names = sorted(table)
+    return names, np.array([table[k] for k in names], dtype=float).reshape(-1, 2)
+
+
+def brute_force_front(character, armors, weapons, max_extra):
+    """(protection, penalty, movement) of every Pareto-optimal loadout, by full enumeration."""
+    agi, mv = character["characteristics"]["AGI"], character["movement"]
+    points = set()
+    for prot, pen in armors.values():
+        for r in range(max_extra + 1):
+            for extra in combinations(weapons.values(), r):
+                p = prot + sum(defl for defl, _ in extra)
+                g = pen + sum(wpen for _, wpen in extra)
+                run = math.floor((agi - g) / 3) + mv["run"]
+                jump = math.floor((agi - g) / 4) + mv["jump"]
+                stand = 5 - math.floor((agi - g) / 5) + mv["stand"]
+                points.add((p, g, run + jump - stand))
+    return {
+        a
+        for a in points
+        if not any(b != a and b[0] >= a[0] and b[1] <= a[1] and b[2] >= a[2] for b in points)
+    }
+
+
+def test_front_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(10):
+        armors = {f"armor{i}": (rng.randint(0, 6), rng.randint(0, 6)) for i in range(6)}
+        # Few distinct values, so weapons dominate and tie each other.
+        weapons = {f"weapon{i}": (rng.randint(0, 3), rng.randint(0, 3)) for i in range(6)}
+        roster = [
+            (
+                f"c{i}.json",
+                {
+                    "characteristics": {"AGI": rng.randint(-2, 12)},
+                    "movement": {"run": rng.randint(0, 3), "jump": 0, "stand": rng.randint(0, 2)},
+                },
+            )
+            for i in range(3)
+        ]
+        for max_extra in (0, 1, 2, 3):
+            results = optimize_roster(roster, options(armors), options(weapons), DEFAULT_FORMULAS, max_extra)
+            for (_, c), r in zip(roster, results):
+                front = {(x["protection"], x["penalty"], x["movement"]) for x in r["front"]}
+                assert front == brute_force_front(c, armors, weapons, max_extra)
+                for x in r["front"]:
+                    items = [armors[x["armor"]], *(weapons[w] for w in x["extra"])]
+                    assert (x["protection"], x["penalty"]) == tuple(map(sum, zip(*items)))
+
+
+def test_weaker_item_is_kept_next_to_the_better_one():
+    # The buckler is dominated by the shield, but carrying both beats either alone.
+    weapons = {"buckler": (1, 1), "dagger": (0, 1), "shield": (2, 1)}
+    roster = [("c.json", {"characteristics": {"AGI": 9}, "movement": {"run": 0, "jump": 0, "stand": 0}})]
+    for max_extra, expected in ((1, [[], ["shield"]]), (2, [[], ["buckler", "shield"], ["shield"]])):
+        (result,) = optimize_roster(roster, options({"none": (0, 0)}), options(weapons), DEFAULT_FORMULAS, max_extra)
+        assert sorted(x["extra"] for x in result["front"]) == expected
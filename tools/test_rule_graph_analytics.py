@@ -0,0 +1,81 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from conftest import AP, GRAPPLE, PRONE, STR
+from rule_graph_analytics import betweenness, compute_analytics, csr, pagerank, reachability_counts
+
+
+def edges(pairs):
+    arr = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1]
+
+
+def test_pagerank_spreads_dangling_rank():
+    # 0 -> 2 <- 1; node 2 has no out-edges, so its rank is spread over all three.
+    # With x = r0 = r1 and y = r2: x = (1 - d)/3 + d*y/3 and 2x + y = 1, so x = 1/(3 + 2d).
+    d = 0.85
+    r = pagerank(3, *edges([(0, 2), (1, 2)]), damping=d)
+    x = 1 / (3 + 2 * d)
+    assert r == pytest.approx([x, x, 1 - 2 * x], abs=1e-6)
+    assert pagerank(2, *edges([(0, 1), (1, 0)])) == pytest.approx([0.5, 0.5])
+
+
+def test_betweenness_exact_on_small_graphs():
+    # Path 0 -> 1 -> 2: only node 1 is between anything.
+    assert betweenness(3, *csr(3, *edges([(0, 1), (1, 2)]))) == pytest.approx([0, 1, 0])
+    # Diamond 0 -> {1, 2} -> 3: the one pair (0, 3) has two shortest paths.
+    diamond = csr(4, *edges([(0, 1), (0, 2), (1, 3), (2, 3)]))
+    assert betweenness(4, *diamond) == pytest.approx([0, 0.5, 0.5, 0])
+
+
+def test_sampled_betweenness_on_a_cycle():
+    # In a directed n-cycle every source adds (n-1)(n-2)/2 in total, so a sample scaled by
+    # n/samples keeps the exact total even though the per-node values are estimates.
+    n = 12
+    graph = csr(n, *edges([(i, (i + 1) % n) for i in range(n)]))
+    exact = betweenness(n, *graph, samples=n)
+    assert exact == pytest.approx(np.full(n, (n - 1) * (n - 2) / 2))
+    sampled = betweenness(n, *graph, samples=4, seed=3)
+    assert sampled.sum() == pytest.approx(exact.sum())
+    assert sampled == pytest.approx(betweenness(n, *graph, samples=4, seed=3))
+
+
+def test_reachability_counts_with_a_cycle():
+    # 0 -> 1 <-> 2 -> 3, and 4 on its own; 1 and 2 reach each other but not themselves.
+    deps, dependents = reachability_counts(5, *edges([(0, 1), (1, 2), (2, 1), (2, 3)]))
+    assert deps.tolist() == [3, 2, 2, 0, 0]
+    assert dependents.tolist() == [0, 2, 2, 3, 0]
+    assert [c.tolist() for c in reachability_counts(0, *edges([]))] == [[], []]
+
+
+def test_reachability_counts_match_bfs():
+    rng = np.random.default_rng(1)
+    n = 40
+    pairs = {(int(a), int(b)) for a, b in rng.integers(0, n, size=(70, 2)) if a != b}
+    adj = {i: [b for a, b in pairs if a == i] for i in range(n)}
+
+    def reach(i):
+        seen, todo = set(), deque(adj[i])
+        while todo:
+            j = todo.popleft()
+            if j not in seen:
+                seen.add(j)
+                todo.extend(adj[j])
+        return seen - {i}
+
+    deps, dependents = reachability_counts(n, *edges(pairs))
+    sets = [reach(i) for i in range(n)]
+    assert deps.tolist() == [len(s) for s in sets]
+    assert dependents.tolist() == [sum(i in s for s in sets) for i in range(n)]
+
+
+def test_compute_analytics(sample_graph):
+    m = compute_analytics(sample_graph())
+    assert [m[i]["dependencies"] for i in (STR, AP, PRONE, GRAPPLE)] == [0, 1, 0, 3]
+    assert [m[i]["dependents"] for i in (STR, AP, PRONE, GRAPPLE)] == [2, 1, 1, 0]
+    assert m[STR]["inDegree"] == 2 and m[GRAPPLE]["outDegree"] == 3
+    # The only two-hop path, grapple -> AP -> STR, has the direct grapple -> STR (modifies) beside it.
+    assert all(v["betweenness"] == 0 for v in m.values())
+    assert sum(v["pagerank"] for v in m.values()) == pytest.approx(1.0)
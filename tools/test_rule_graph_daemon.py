@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from conftest import AP, GRAPPLE, PRONE, STR
+from rule_graph_analytics import compute_analytics
+from rule_graph_daemon import GraphState, RuleGraphDaemon
+from rule_search import SearchIndex
+
+
+def state(graph):
+    search = SearchIndex()
+    search.update(graph)
+    return GraphState(graph, 0.0, search, compute_analytics(graph))
+
+
+def test_queries(sample_graph):
+    s = state(sample_graph())
+    assert s.answer({"op": "node", "name": "ap"})["result"][0]["@id"] == AP
+    assert s.answer({"op": "neighbors", "id": STR, "kind": "modifies", "direction": "in"})["result"] == [
+        {"id": GRAPPLE, "kind": "modifies", "direction": "in"}
+    ]
+    assert s.answer({"op": "dependents", "name": "STR", "transitive": True})["result"] == [AP, GRAPPLE]
+    assert [r["id"] for r in s.answer({"op": "search", "q": "prone", "limit": 5})["result"]] == [PRONE]
+    assert s.answer({"op": "rank", "by": "dependents", "limit": 1})["result"][0]["id"] == STR
+
+
+def test_bad_parameters_are_query_errors(sample_graph):
+    s = state(sample_graph())
+    bad = [
+        {"op": "search", "q": "prone", "limit": None},
+        {"op": "search", "q": "prone", "limit": "5"},
+        {"op": "search", "q": "prone", "status": ["x"]},
+        {"op": "rank", "limit": -1},
+        {"op": "rank", "by": []},
+        {"op": "neighbors", "name": "AP", "direction": []},
+        {"op": "neighbors", "name": "AP", "kind": []},
+        {"op": "node", "id": 3},
+        {"op": []},
+        ["not", "an", "object"],
+    ]
+    for q in bad:
+        res = s.answer(q)
+        assert res["ok"] is False and res["error"], q
+
+
+def test_worker_survives_failing_query(tmp_path, sample_graph):
+    graph = tmp_path / "rule_graph.json"
+    graph.write_text(json.dumps({"@graph": sample_graph()}), encoding="utf-8")
+
+    async def run():
+        daemon = RuleGraphDaemon(graph, poll_interval=60)
+        real_answer = daemon.state.answer
+
+        def answer(q):
+            if q.get("op") == "boom":
+                raise RuntimeError("handler bug")
+            return real_answer(q)
+
+        daemon.state.answer = answer
+        worker = asyncio.create_task(daemon.batch_worker())
+        try:
+            first = await daemon.submit([{"op": "boom"}, {"op": "node", "name": "AP"}])
+            second = await daemon.submit([{"op": "node", "name": "STR"}])
+        finally:
+            worker.cancel()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first[0]["ok"] is False and "handler bug" in first[0]["error"]
+    assert first[1]["ok"] is True
+    assert second[0]["ok"] is True
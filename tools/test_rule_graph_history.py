@@ -0,0 +1,66 @@
+import subprocess
+
+import pytest
+
+from rule_graph_history import RevisionExtractor, list_revisions, list_tree, resolve_tree_include
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def commit(repo, files, message):
+    for rel, text in files.items():
+        path = repo / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    git(repo, "add", "-A")
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def rulebook(tmp_path):
+    """A rulebook repository with two revisions; the second edits one ability."""
+    repo = tmp_path / "rulebook"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    main = "\\input{chapters/combat}\n% \\input{chapters/old}\n\\input{../shared/macros}\n"
+    combat = "\\subfile{grapple}\n\\abil{Shove}{Action}{1 AP}{-}{Push a foe.}\n"
+    grapple = "\\abil{Grapple}{Action}{2 AP}{-}{Grab a foe.}\n"
+    commit(repo, {"main.tex": main, "chapters/combat.tex": combat, "chapters/grapple.tex": grapple}, "first")
+    commit(repo, {"chapters/grapple.tex": grapple.replace("Grab", "Seize")}, "second")
+    return repo
+
+
+def test_resolve_tree_include():
+    files = {"main.tex": "", "chapters/a.tex": "", "chapters/b.tex": "", "b.tex": ""}
+    assert resolve_tree_include(files, "main.tex", "input", "chapters/a") == "chapters/a.tex"
+    # \input is relative to the main document first, \subfile to the including file first.
+    assert resolve_tree_include(files, "chapters/a.tex", "input", "b") == "b.tex"
+    assert resolve_tree_include(files, "chapters/a.tex", "subfile", "b") == "chapters/b.tex"
+    assert resolve_tree_include(files, "chapters/a.tex", "input", "./chapters/../b.tex") == "b.tex"
+    assert resolve_tree_include(files, "main.tex", "input", "../shared/macros") is None
+
+
+def test_revisions_and_included_files(rulebook, capsys):
+    revisions = list_revisions(rulebook)
+    assert [subject for _, _, subject in revisions] == ["first", "second"]
+    trees = [list_tree(rulebook, sha) for sha, _, _ in revisions]
+    assert sorted(trees[0]) == ["chapters/combat.tex", "chapters/grapple.tex", "main.tex"]
+
+    extractor = RevisionExtractor(rulebook, {}, None)
+    try:
+        files = [extractor.included_files(tree) for tree in trees]
+        # The commented-out include is ignored; the one outside the tree is dropped with a
+        # warning, given once even though both revisions contain it.
+        assert [rel for rel, _ in files[0]] == ["chapters/combat.tex", "chapters/grapple.tex"]
+        assert capsys.readouterr().out.count("../shared/macros") == 1
+        assert files[0][0] == files[1][0] and files[0][1] != files[1][1]
+
+        graphs = [extractor.graph(f) for f in files]
+    finally:
+        extractor.close()
+    grapple = [n for n in graphs[1].values() if n["name"] == "Grapple"]
+    assert len(grapple) == 1 and "Seize" in grapple[0]["description"]
+    assert grapple[0]["source"] == "chapters/grapple.tex"
+    assert graphs[0].keys() == graphs[1].keys()
@@ -0,0 +1,48 @@
+from conftest import AP, GRAPPLE, PRONE, STR
+from rule_graph_redis import MemoryRedis, diff, publish
+
+
+def test_republish_is_a_no_op(sample_graph):
+    r = MemoryRedis()
+    assert publish(r, sample_graph()) == (4, 0, 0)
+    snapshot = {k: (set(v) if isinstance(v, set) else dict(v)) for k, v in r.data.items()}
+    assert publish(r, sample_graph()) == (0, 0, 4)
+    assert r.data == snapshot
+
+
+def test_edit_updates_edges_and_indexes(sample_graph):
+    r = MemoryRedis()
+    publish(r, sample_graph())
+    assert r.smembers(f"rg:in:dependsOn:{AP}") == {GRAPPLE}
+    assert r.smembers("rg:status:unimplemented") == {GRAPPLE}
+
+    edited = sample_graph()
+    edited[3].update(dependsOn=[STR], modifies=[], tags=["spell"])
+    del edited[3]["@status"]
+    assert publish(r, edited) == (1, 0, 3)
+    assert r.smembers(f"rg:out:dependsOn:{GRAPPLE}") == {STR}
+    assert r.smembers(f"rg:in:dependsOn:{STR}") == {AP, GRAPPLE}
+    for gone in (f"rg:in:dependsOn:{AP}", f"rg:in:dependsOn:{PRONE}", f"rg:in:modifies:{STR}"):
+        assert gone not in r.data
+    assert "rg:status:unimplemented" not in r.data
+    assert "rg:tag:ability" not in r.data
+    assert r.smembers("rg:tag:spell") == {GRAPPLE}
+
+
+def test_remove_clears_node_keys(sample_graph):
+    r = MemoryRedis()
+    publish(r, sample_graph())
+    assert publish(r, sample_graph()[:3]) == (0, 1, 3)
+    assert r.smembers("rg:ids") == {STR, AP, PRONE}
+    assert GRAPPLE not in r.hgetall("rg:hashes")
+    assert not [k for k in r.data if k.endswith(GRAPPLE)]
+    assert f"rg:in:dependsOn:{AP}" not in r.data
+    assert r.smembers("rg:type:Mechanic") == set()
+
+
+def test_diff_reads_only(sample_graph):
+    r = MemoryRedis()
+    publish(r, sample_graph()[:2])
+    before = dict(r.data)
+    assert diff(r, sample_graph()[1:]) == ([PRONE, GRAPPLE], [STR], 1)
+    assert r.data == before
@@ -0,0 +1,54 @@
+import json
+
+from conftest import PRONE
+from rule_graph_analytics import analytics_path_for
+from rule_graph_shards import MANIFEST_NAME, load_manifest, load_shards, write_shards
+from rule_search import index_path_for, load_jsonld_graph
+
+
+def test_round_trip_and_partial_load(tmp_path, sample_graph):
+    d = tmp_path / "rule_graph.shards"
+    assert write_shards(d, sample_graph()) == (4, 0, 0)
+    assert load_shards(d) == sample_graph()
+    assert load_jsonld_graph(d, types={"Keyword"}) == [sample_graph()[2]]
+
+    mechanics = load_shards(d, types={"Mechanic"}, with_dependencies=True)
+    assert [n["@id"] for n in mechanics] == [n["@id"] for n in sample_graph()]
+
+
+def test_only_changed_shards_are_rewritten(tmp_path, sample_graph):
+    d = tmp_path / "rule_graph.shards"
+    write_shards(d, sample_graph())
+    assert write_shards(d, sample_graph()) == (0, 4, 0)
+
+    edited = sample_graph()
+    edited[2]["description"] = "Knocked to the ground"
+    assert write_shards(d, edited) == (1, 3, 0)
+    assert write_shards(d, edited[:2] + edited[3:]) == (0, 3, 1)
+    assert not (d / "keyword.chapters_combat.json").exists()
+
+
+def test_colliding_file_names_are_disambiguated(tmp_path, sample_graph):
+    d = tmp_path / "rule_graph.shards"
+    graph = sample_graph()
+    graph[2]["source"] = "chapters/combat-rules.tex"
+    graph.append(dict(graph[2], **{"@id": "urn:ttrpg:keyword:blind", "name": "Blind", "source": "chapters/combat_rules.tex"}))
+    write_shards(d, graph)
+
+    keyword_shards = sorted(n for n in load_manifest(d)["shards"] if n.startswith("keyword."))
+    assert len(keyword_shards) == 2
+    assert all(n.startswith("keyword.chapters_combat_rules-") for n in keyword_shards)
+    assert [n["@id"] for n in load_shards(d, types={"Keyword"})] == ["urn:ttrpg:keyword:blind", PRONE]
+
+
+def test_sidecars_live_inside_the_shard_directory(tmp_path, sample_graph):
+    d = tmp_path / "rule_graph.shards"
+    write_shards(d, sample_graph())
+    graph = tmp_path / "rule_graph.json"
+    graph.write_text(json.dumps({"@graph": sample_graph()}), encoding="utf-8")
+
+    assert index_path_for(d) == d / "search.json"
+    assert analytics_path_for(d) == d / "analytics.json"
+    assert index_path_for(graph) != index_path_for(d)
+    assert analytics_path_for(graph) != analytics_path_for(d)
+    assert (d / MANIFEST_NAME).exists()
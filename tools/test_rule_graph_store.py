@@ -0,0 +1,34 @@
+from conftest import GRAPPLE
+from rule_graph_store import RuleGraphStore
+
+
+def test_round_trip(tmp_path, sample_graph):
+    with RuleGraphStore(tmp_path / "rg.sqlite") as store:
+        assert store.node_count() == 0
+        assert store.upsert(sample_graph()) == (4, 0, 0)
+        assert store.load_nodes() == sample_graph()
+        assert [n["@id"] for n in store.load_nodes({"Mechanic"})] == [GRAPPLE]
+
+
+def test_upsert_writes_only_changes(tmp_path, sample_graph):
+    with RuleGraphStore(tmp_path / "rg.sqlite") as store:
+        store.upsert(sample_graph())
+        assert store.upsert(sample_graph()) == (0, 4, 0)
+        edited = sample_graph()
+        edited[3]["modifies"] = []
+        assert store.upsert(edited) == (1, 3, 0)
+        assert store.load_nodes()[3]["modifies"] == []
+
+
+def test_prune_deletes_missing_nodes(tmp_path, sample_graph):
+    with RuleGraphStore(tmp_path / "rg.sqlite") as store:
+        store.upsert(sample_graph())
+        # Without prune, a partial upsert leaves the other nodes alone.
+        assert store.upsert(sample_graph()[:3]) == (0, 3, 0)
+        assert store.node_count() == 4
+
+        assert store.upsert(sample_graph()[:3], prune=True) == (0, 3, 1)
+        assert store.load_nodes() == sample_graph()[:3]
+        for table, col in (("edges", "src"), ("tags", "node_id"), ("provenance", "node_id")):
+            rows = store.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {col} = ?", (GRAPPLE,))
+            assert rows.fetchone()[0] == 0
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from conftest import AP, GRAPPLE, PRONE
+from rule_search import SearchIndex, update_index
+
+
+def test_update_is_incremental(sample_graph):
+    idx = SearchIndex()
+    assert idx.update(sample_graph()) == (4, 0, 0)
+    assert idx.update(sample_graph()) == (0, 0, 0)
+
+    edited = sample_graph()
+    edited[2]["description"] = "Knocked down; standing up costs AP"
+    assert idx.update(edited) == (0, 1, 0)
+    assert idx.update(edited[:2] + edited[3:]) == (0, 0, 1)
+    assert PRONE not in idx.docs
+    assert all(PRONE not in plist for plist in idx.postings.values())
+
+
+def test_search_ranks_and_filters(sample_graph):
+    idx = SearchIndex()
+    idx.update(sample_graph())
+
+    assert idx.search("grapples")[0][0] == GRAPPLE  # plural folding
+    assert [nid for nid, _ in idx.search("grap*")] == [GRAPPLE]
+    # Prefixes are folded like exact terms: plural and capitalized forms still expand.
+    assert [nid for nid, _ in idx.search("Grapples*")] == [GRAPPLE]
+    assert [nid for nid, _ in idx.search("points", prefix=True)] == [AP]
+    assert idx.search("ap", types={"Keyword"}) == []
+    assert [nid for nid, _ in idx.search("ap", tags={"ability"})] == [GRAPPLE]
+
+    plain = dict(idx.search("ap"))
+    boosted = dict(idx.search("ap", prior={GRAPPLE: 1.0}))
+    assert boosted[GRAPPLE] > plain[GRAPPLE]
+    assert boosted[AP] == plain[AP]
+
+
+def test_update_index_round_trip(tmp_path: Path, sample_graph):
+    path = tmp_path / "g.search.json"
+    assert update_index(sample_graph(), path) == (4, 0, 0)
+    assert update_index(sample_graph(), path) == (0, 0, 0)
+    assert SearchIndex.load(path).search("prone")[0][0] == PRONE
@@ -0,0 +1,39 @@
+import random
+
+from conftest import AP, GRAPPLE, PRONE, STR
+from term_suggest import BKTree, SuggestionIndex, edit_distance, known_terms, max_distance
+
+
+def test_bktree_matches_brute_force():
+    rng = random.Random(3)
+    words = {"".join(rng.choice("abcde") for _ in range(rng.randint(1, 7))) for _ in range(300)}
+    tree = BKTree()
+    for w in words:
+        tree.add(w)
+    assert len(tree) == len(words)
+    for q in ["abc", "eeee", "a", "bacded"]:
+        for tol in range(3):
+            expected = sorted((edit_distance(q, w), w) for w in words if edit_distance(q, w) <= tol)
+            assert sorted(tree.search(q, tol)) == expected
+
+
+def test_max_distance():
+    assert [max_distance(t) for t in ("XP", "NPC", "PEN", "Toe", "Prone", "Strenght", "Battle Trance")] == [0, 0, 0, 0, 1, 2, 3]
+    assert max_distance("STUN") == 0  # all-caps acronym
+    assert max_distance("Stun") == 1
+
+
+def test_suggest_near_misses_but_not_acronym_collisions(sample_graph):
+    extra = [("DM", "urn:ttrpg:derivedvalue:dm"), ("SM", "urn:ttrpg:derivedvalue:sm"), ("TN", "urn:ttrpg:keyword:tn")]
+    names = [(n["name"], n["@id"]) for n in sample_graph()] + extra
+    index = SuggestionIndex(known_terms(names, {"Strength": STR, "Unknown": "urn:ttrpg:attribute:none"}))
+
+    assert index.suggest("Strenght") == [STR]  # via the alias
+    assert index.suggest("Grappel") == [GRAPPLE]
+    assert index.suggest("grapples") == [GRAPPLE]
+    assert index.suggest("Prone!") == [PRONE]
+    assert index.suggest("ap") == [AP]
+    for acronym in ("XP", "GP", "HP", "MM", "SD", "TE"):
+        assert index.suggest(acronym) == [], acronym
+    # Aliases only count when their target exists.
+    assert index.suggest("Unknown") == []
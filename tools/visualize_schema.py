@@ -7,6 +7,15 @@ is now large (~600 nodes). To make it usable, this provides:
 - Optional focus mode (n-hop neighborhood around a node)
 - Optional removal of isolates
 - Save as PNG or SVG
+- A fast collection-based renderer (default); `--renderer networkx` keeps the old per-edge patches
+- Interactive HTML output (`--out graph.html`): one offline file with precomputed layout,
+  canvas rendering, search and hover details (description / formula / codeMapping)
+- Overview mode: collapse communities / source chapters / types into weighted supernodes,
+  and drill down into a single cluster
+- Hierarchical edge bundling (`--bundle community`): edges between the same clusters share a
+  curved trunk through the cluster centroids
+- Label selection by PageRank from the analytics sidecar (see tools/rule_graph_analytics.py)
+- Sharded input (`--in rule_graph.shards`): only the shards of `--include-types` are read
 
 Examples:
 
@@ -15,11 +24,22 @@ Examples:
 
     # Focus around the "Action Surge" node, 2 hops
     python tools/visualize_schema.py --focus "Action Surge" --hops 2 --out action_surge.svg
+
+    # Interactive viewer of the full graph (pan/zoom, search, hover details)
+    python tools/visualize_schema.py --out graph.html
+
+    # Overview of the full graph by community, then drill into one cluster
+    python tools/visualize_schema.py --overview community --out overview.svg
+    python tools/visualize_schema.py --overview community --drill c2 --out cluster_c2.svg
+
+    # Bundled edges by source chapter
+    python tools/visualize_schema.py --exclude-types Keyword --bundle source --out bundled.png
 """
 
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import re
 from pathlib import Path
@@ -27,7 +47,12 @@ from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
 
+from rule_graph_analytics import analytics_path_for, load_analytics
+from rule_graph_shards import is_shard_path, load_shards
+from rule_graph_store import RuleGraphStore, is_store_path
 
 NodeJson = Dict[str, Any]
 
@@ -42,7 +67,14 @@ def _ensure_list(v: Any) -> List[str]:
     return []
 
 
-def load_jsonld_graph(path: str) -> List[NodeJson]:
+def load_jsonld_graph(path: str, types: Optional[Set[str]] = None) -> List[NodeJson]:
+    if is_store_path(path):
+        # SQLite store written by `extract_rule_graph.py --store`; safe to read mid-extraction.
+        with RuleGraphStore(Path(path), readonly=True) as store:
+            return store.load_nodes(types)
+    if is_shard_path(path):
+        # Shard directory written by `extract_rule_graph.py --shards`: only the needed shards are read.
+        return load_shards(Path(path), types)
     data = json.loads(Path(path).read_text(encoding="utf-8"))
     if isinstance(data, dict) and isinstance(data.get("@graph"), list):
         return [x for x in data["@graph"] if isinstance(x, dict)]
@@ -73,7 +105,14 @@ def build_graph(nodes: Sequence[NodeJson]) -> nx.DiGraph:
         if not isinstance(status, str):
             status = None
 
-        g.add_node(node_id, name=name, type=node_type, status=status)
+        source = node.get("source")
+        if not isinstance(source, str):
+            source = None
+
+        # Detail fields are only used by the HTML viewer's hover card.
+        details = {k: node.get(k) for k in ("description", "formula", "codeMapping") if isinstance(node.get(k), str)}
+
+        g.add_node(node_id, name=name, type=node_type, status=status, source=source, **details)
 
     # Edges (only between nodes that exist)
     node_ids = set(g.nodes)
@@ -166,10 +205,92 @@ def drop_isolates(g: nx.DiGraph) -> nx.DiGraph:
     return g.subgraph(keep).copy()
 
 
+def cluster_nodes(g: nx.DiGraph, by: str) -> Dict[str, List[str]]:
+    """Group nodes into clusters keyed `c0`, `c1`, ... (largest first).
+
+    `by` is `community` (Louvain modularity communities on the undirected graph), `source`
+    (rulebook chapter; core domain nodes without a source form their own cluster) or `type`.
+    """
+
+    groups: List[List[str]]
+    if by == "community":
+        groups = [sorted(c) for c in nx.community.louvain_communities(g.to_undirected(), seed=42)]
+        # Louvain leaves every isolate as its own community; fold them into one cluster.
+        isolates = sorted(n for c in groups if len(c) == 1 and g.degree(c[0]) == 0 for n in c)
+        groups = [c for c in groups if not (len(c) == 1 and g.degree(c[0]) == 0)]
+        if isolates:
+            groups.append(isolates)
+    else:
+        attr = "source" if by == "source" else "type"
+        by_key: Dict[str, List[str]] = {}
+        for n in g.nodes:
+            by_key.setdefault(g.nodes[n].get(attr) or "core", []).append(n)
+        groups = list(by_key.values())
+    groups.sort(key=lambda c: (-len(c), c[0]))
+    return {f"c{i}": members for i, members in enumerate(groups)}
+
+
+def _cluster_label(g: nx.DiGraph, members: List[str], by: str) -> str:
+    if by == "source":
+        return g.nodes[members[0]].get("source") or "core"
+    if by == "type":
+        return str(g.nodes[members[0]].get("type"))
+    if all(g.degree(n) == 0 for n in members):
+        return "isolated"
+    # Name a community after its best-connected member.
+    hub = max(members, key=lambda n: (g.degree(n), n))
+    return str(g.nodes[hub].get("name", hub))
+
+
+def quotient_graph(g: nx.DiGraph, clusters: Dict[str, List[str]], by: str) -> nx.DiGraph:
+    """Collapse each cluster into a supernode; parallel edges become one weighted edge.
+
+    Supernodes take the most common @type of their members (for color) and a marker size that
+    grows with the member count; an inter-cluster edge takes the majority kind of the edges it
+    replaces and a width that grows with their number.
+    """
+
+    q = nx.DiGraph()
+    owner: Dict[str, str] = {}
+    for key, members in clusters.items():
+        for n in members:
+            owner[n] = key
+        types: Dict[str, int] = {}
+        for n in members:
+            t = g.nodes[n].get("type", "Unknown")
+            types[t] = types.get(t, 0) + 1
+        dominant = max(types.items(), key=lambda x: (x[1], x[0]))[0]
+        q.add_node(
+            key,
+            name=f"{key}: {_cluster_label(g, members, by)} ({len(members)})",
+            type=dominant,
+            members=len(members),
+            size=min(6000.0, NODE_SIZE * (1 + np.log2(len(members)))),
+        )
+
+    counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for u, v, d in g.edges(data=True):
+        cu, cv = owner[u], owner[v]
+        if cu == cv:
+            continue
+        per_kind = counts.setdefault((cu, cv), {})
+        per_kind[d.get("kind", "dependsOn")] = per_kind.get(d.get("kind", "dependsOn"), 0) + 1
+
+    for (cu, cv), per_kind in counts.items():
+        weight = sum(per_kind.values())
+        kind = max(per_kind.items(), key=lambda x: (x[1], x[0]))[0]
+        q.add_edge(cu, cv, kind=kind, weight=weight, width=EDGE_STYLES[kind]["width"] * (1 + np.log2(weight)))
+    return q
+
+
 def compute_layout(g: nx.DiGraph, layout: str) -> Dict[str, Tuple[float, float]]:
     # For static images, GraphViz is usually better. If it's not available,
     # fall back to spring layout.
     layout = layout.lower().strip()
+    if any("members" in d for _, d in g.nodes(data=True)) and layout != "spring":
+        # Overview quotient graphs are small and often disconnected; Kamada-Kawai keeps
+        # components close together and spreads the (large) supernodes evenly.
+        return nx.kamada_kawai_layout(g.to_undirected())
     if layout in {"dot", "sfdp", "neato"}:
         try:
             from networkx.drawing.nx_agraph import graphviz_layout  # type: ignore
@@ -183,6 +304,216 @@ def compute_layout(g: nx.DiGraph, layout: str) -> Dict[str, Tuple[float, float]]
     return nx.spring_layout(g, k=k, iterations=200, seed=42)
 
 
+# Node colors by type
+NODE_COLORS = {
+    "Attribute": "#87CEEB",  # skyblue
+    "DerivedValue": "#FFA500",  # orange
+    "Mechanic": "#90EE90",  # lightgreen
+    "Keyword": "#D3D3D3",  # lightgray
+    "Unknown": "#B0B0B0",
+}
+
+# Edge styling per kind: dependsOn (solid gray) vs modifies (dashed firebrick)
+EDGE_STYLES = {
+    "dependsOn": {"width": 1.0, "color": "#666", "style": "solid"},
+    "modifies": {"width": 1.2, "color": "#B22222", "style": "dashed"},
+}
+
+NODE_SIZE = 900  # points^2, as passed to scatter
+ARROW_LENGTH_PT = 6.0
+ARROW_HALF_WIDTH_PT = 2.5
+
+
+def _pick_labels(g: nx.DiGraph, label_limit: int, rank: Optional[Dict[str, float]] = None) -> Dict[str, str]:
+    # Labels: only if graph is small enough
+    if g.number_of_nodes() <= label_limit:
+        return nx.get_node_attributes(g, "name")
+    # Label only the top 30: by precomputed PageRank when available (see
+    # tools/rule_graph_analytics.py), else by degree (e.g. overview supernodes).
+    if rank:
+        top = heapq.nlargest(30, g.nodes, key=lambda n: (rank.get(n, -1.0), g.degree(n)))
+    else:
+        top = heapq.nlargest(30, g.nodes, key=g.degree)
+    return {n: g.nodes[n].get("name", n) for n in top}
+
+
+def _edges_by_kind(g: nx.DiGraph) -> Dict[str, List[Tuple[str, str]]]:
+    # Split edges by kind so we can style them differently
+    return {
+        kind: [(u, v) for u, v, d in g.edges(data=True) if d.get("kind") == kind] for kind in EDGE_STYLES
+    }
+
+
+def _draw_networkx(g: nx.DiGraph, pos: Dict[str, Tuple[float, float]], labels: Dict[str, str]) -> None:
+    colors = [NODE_COLORS.get(g.nodes[n].get("type"), "#B0B0B0") for n in g.nodes]
+    nx.draw_networkx_nodes(g, pos, node_color=colors, node_size=NODE_SIZE, linewidths=0.8, edgecolors="#444")
+    for kind, edges in _edges_by_kind(g).items():
+        st = EDGE_STYLES[kind]
+        nx.draw_networkx_edges(
+            g,
+            pos,
+            edgelist=edges,
+            arrows=True,
+            arrowstyle="-|>",
+            width=st["width"],
+            edge_color=st["color"],
+            style=st["style"],
+        )
+    nx.draw_networkx_labels(g, pos, labels=labels, font_size=8)
+
+
+BUNDLE_SAMPLES = 16  # points per bundled edge curve
+
+
+def _bundle_edges(
+    src: np.ndarray,
+    dst: np.ndarray,
+    anchor_src: np.ndarray,
+    anchor_dst: np.ndarray,
+    r_src: np.ndarray,
+    r_dst: np.ndarray,
+    head_len: float,
+    head_half: float,
+    strength: float,
+) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray]:
+    """Hierarchical edge bundling (Holten 2006) over a two-level hierarchy, in display space.
+
+    An edge u -> v follows the hierarchy path [u, cluster(u), cluster(v), v] as the control points
+    of a cubic Bezier, pulled back towards the straight chord by `1 - strength`, so edges between
+    the same pair of clusters share a trunk. Returns (polylines trimmed to the marker boundaries,
+    arrowheads, mask of the edges that were long enough to draw).
+    """
+
+    chord = dst - src
+    p1 = strength * anchor_src + (1 - strength) * (src + chord / 3)
+    p2 = strength * anchor_dst + (1 - strength) * (src + chord * 2 / 3)
+    t = np.linspace(0.0, 1.0, BUNDLE_SAMPLES)[None, :, None]
+    curves = (
+        (1 - t) ** 3 * src[:, None]
+        + 3 * (1 - t) ** 2 * t * p1[:, None]
+        + 3 * (1 - t) * t**2 * p2[:, None]
+        + t**3 * dst[:, None]
+    )
+    d_src = np.linalg.norm(curves - src[:, None], axis=2)
+    d_dst = np.linalg.norm(curves - dst[:, None], axis=2)
+    inside = (d_src > r_src[:, None]) & (d_dst > (r_dst + head_len)[:, None])
+    keep = inside.any(axis=1) & (np.linalg.norm(chord, axis=1) > 0)
+
+    polylines: List[np.ndarray] = []
+    heads: List[np.ndarray] = []
+    for i in np.flatnonzero(keep):
+        pts = curves[i][inside[i]]
+        first = (pts[0] - src[i]) / np.linalg.norm(pts[0] - src[i])
+        last = (dst[i] - pts[-1]) / np.linalg.norm(dst[i] - pts[-1])
+        normal = np.array([-last[1], last[0]])
+        tip = dst[i] - last * r_dst[i]
+        base = tip - last * head_len
+        polylines.append(np.vstack([src[i] + first * r_src[i], pts, base]))
+        heads.append(np.stack([tip, base + normal * head_half, base - normal * head_half]))
+    return polylines, np.array(heads).reshape(-1, 3, 2), keep
+
+
+def _draw_fast(
+    ax: Any,
+    g: nx.DiGraph,
+    pos: Dict[str, Tuple[float, float]],
+    labels: Dict[str, str],
+    rasterize: bool,
+    anchors: Optional[Dict[str, Tuple[float, float]]] = None,
+    bundle_strength: float = 0.85,
+) -> None:
+    """Draw with one collection per artist kind instead of one patch per edge.
+
+    All edges of a kind are a single LineCollection and their arrowheads a single PolyCollection;
+    nodes are one scatter. Geometry (shrinking edges to the marker boundary, arrowhead shape) is
+    computed in display space and mapped back to data coordinates, so it must run after the axes
+    limits and figure layout are final.
+
+    With `anchors` (node -> its cluster's centroid), edges are bundled through the centroids
+    instead of drawn straight (see _bundle_edges).
+    """
+
+    nodes = list(g.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    xy = np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+
+    to_px = ax.transData
+    to_data = ax.transData.inverted()
+    px_per_pt = ax.figure.dpi / 72.0
+    # Per-node marker size (overview supernodes are scaled by cluster size).
+    sizes = np.array([g.nodes[n].get("size", NODE_SIZE) for n in nodes], dtype=float)
+    radius_px = np.sqrt(sizes) / 2 * px_per_pt
+    head_len_px = ARROW_LENGTH_PT * px_per_pt
+    head_half_px = ARROW_HALF_WIDTH_PT * px_per_pt
+    node_px = to_px.transform(xy) if len(xy) else xy
+    anchor_px = None
+    if anchors is not None and len(xy):
+        anchor_px = to_px.transform(np.array([anchors[n] for n in nodes], dtype=float))
+
+    for kind, edges in _edges_by_kind(g).items():
+        if not edges:
+            continue
+        st = EDGE_STYLES[kind]
+        si = np.array([index[u] for u, _ in edges])
+        di = np.array([index[v] for _, v in edges])
+        widths = np.array([g.edges[e].get("width", st["width"]) for e in edges], dtype=float)
+        src, dst = node_px[si], node_px[di]
+        r_src, r_dst = radius_px[si], radius_px[di]
+        if anchor_px is not None:
+            polylines, heads, keep = _bundle_edges(
+                src, dst, anchor_px[si], anchor_px[di], r_src, r_dst, head_len_px, head_half_px, bundle_strength
+            )
+            if not polylines:
+                continue
+            widths = widths[keep]
+            segments = [to_data.transform(p) for p in polylines]
+            heads = to_data.transform(heads.reshape(-1, 2)).reshape(-1, 3, 2)
+        else:
+            vec = dst - src
+            length = np.hypot(vec[:, 0], vec[:, 1])
+            keep = length > r_src + r_dst + head_len_px
+            src, dst, vec, length = src[keep], dst[keep], vec[keep], length[keep]
+            r_src, r_dst, widths = r_src[keep], r_dst[keep], widths[keep]
+            if not len(src):
+                continue
+            unit = vec / length[:, None]
+            normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1)
+
+            start = src + unit * r_src[:, None]
+            tip = dst - unit * r_dst[:, None]
+            base = tip - unit * head_len_px
+
+            segments = np.stack([to_data.transform(start), to_data.transform(base)], axis=1)
+            heads = np.stack([tip, base + normal * head_half_px, base - normal * head_half_px], axis=1)
+            heads = to_data.transform(heads.reshape(-1, 2)).reshape(-1, 3, 2)
+
+        lines = LineCollection(
+            segments, colors=st["color"], linewidths=widths, linestyles=st["style"], zorder=1
+        )
+        arrows = PolyCollection(heads, facecolors=st["color"], edgecolors=st["color"], linewidths=0.5, zorder=1)
+        lines.set_rasterized(rasterize)
+        arrows.set_rasterized(rasterize)
+        ax.add_collection(lines)
+        ax.add_collection(arrows)
+
+    colors = [NODE_COLORS.get(g.nodes[n].get("type"), "#B0B0B0") for n in nodes]
+    if len(xy):
+        ax.scatter(
+            xy[:, 0],
+            xy[:, 1],
+            s=sizes,
+            c=colors,
+            linewidths=0.8,
+            edgecolors="#444",
+            zorder=2,
+            rasterized=rasterize,
+        )
+
+    for n, text in labels.items():
+        x, y = pos[n]
+        ax.text(x, y, text, fontsize=8, ha="center", va="center", zorder=3)
+
+
 def draw_graph(
     g: nx.DiGraph,
     out_path: Optional[str],
@@ -191,51 +522,44 @@ def draw_graph(
     layout: str,
     label_limit: int,
     figsize: Tuple[int, int],
+    renderer: str = "fast",
+    rasterize: bool = False,
+    bundle: Optional[str] = None,
+    bundle_strength: float = 0.85,
+    rank: Optional[Dict[str, float]] = None,
 ) -> None:
-    plt.figure(figsize=figsize)
+    fig = plt.figure(figsize=figsize)
     pos = compute_layout(g, layout=layout)
-
-    # Node colors by type
-    node_colors = {
-        "Attribute": "#87CEEB",  # skyblue
-        "DerivedValue": "#FFA500",  # orange
-        "Mechanic": "#90EE90",  # lightgreen
-        "Keyword": "#D3D3D3",  # lightgray
-        "Unknown": "#B0B0B0",
-    }
-    colors = [node_colors.get(g.nodes[n].get("type"), "#B0B0B0") for n in g.nodes]
-
-    # Split edges by kind so we can style them differently
-    depends_edges = [(u, v) for u, v, d in g.edges(data=True) if d.get("kind") == "dependsOn"]
-    modifies_edges = [(u, v) for u, v, d in g.edges(data=True) if d.get("kind") == "modifies"]
-
-    nx.draw_networkx_nodes(g, pos, node_color=colors, node_size=900, linewidths=0.8, edgecolors="#444")
-    nx.draw_networkx_edges(g, pos, edgelist=depends_edges, arrows=True, arrowstyle="-|>", width=1.0, edge_color="#666")
-    nx.draw_networkx_edges(
-        g,
-        pos,
-        edgelist=modifies_edges,
-        arrows=True,
-        arrowstyle="-|>",
-        width=1.2,
-        edge_color="#B22222",  # firebrick
-        style="dashed",
-    )
-
-    # Labels: only if graph is small enough
-    if g.number_of_nodes() <= label_limit:
-        labels = nx.get_node_attributes(g, "name")
-        nx.draw_networkx_labels(g, pos, labels=labels, font_size=8)
+    labels = _pick_labels(g, label_limit, rank)
+
+    anchors: Optional[Dict[str, Tuple[float, float]]] = None
+    if bundle:
+        # Two-level hierarchy for edge bundling: each node hangs off its cluster's centroid.
+        anchors = {}
+        for members in cluster_nodes(g, bundle).values():
+            cx, cy = np.mean([pos[n] for n in members], axis=0)
+            for n in members:
+                anchors[n] = (float(cx), float(cy))
+
+    if renderer == "networkx" and not bundle and not any("size" in d for _, d in g.nodes(data=True)):
+        _draw_networkx(g, pos, labels)
+        plt.title(title)
+        plt.axis("off")
+        plt.tight_layout()
     else:
-        # Label only the highest-degree nodes
-        degrees = sorted(((n, g.degree(n)) for n in g.nodes), key=lambda x: x[1], reverse=True)
-        top = {n for n, _ in degrees[: min(30, len(degrees))]}
-        labels = {n: g.nodes[n].get("name", n) for n in top}
-        nx.draw_networkx_labels(g, pos, labels=labels, font_size=8)
-
-    plt.title(title)
-    plt.axis("off")
-    plt.tight_layout()
+        ax = fig.add_subplot(111)
+        if pos:
+            xy = np.array(list(pos.values()), dtype=float)
+            lo, hi = xy.min(axis=0), xy.max(axis=0)
+            # Leave room for the markers; supernodes in overview mode are much larger.
+            margin = 0.05 if all("members" not in d for _, d in g.nodes(data=True)) else 0.15
+            pad = np.maximum((hi - lo) * margin, 1e-3)
+            ax.set_xlim(lo[0] - pad[0], hi[0] + pad[0])
+            ax.set_ylim(lo[1] - pad[1], hi[1] + pad[1])
+        ax.set_title(title)
+        ax.axis("off")
+        fig.tight_layout()
+        _draw_fast(ax, g, pos, labels, rasterize=rasterize, anchors=anchors, bundle_strength=bundle_strength)
 
     if out_path:
         Path(out_path).parent.mkdir(parents=True, exist_ok=True)
@@ -248,10 +572,96 @@ def draw_graph(
         plt.close()
 
 
+VIEWER_TEMPLATE = Path(__file__).resolve().parent / "rule_graph_viewer.html"
+
+VIEWER_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def write_html(g: nx.DiGraph, out_path: str, title: str, layout: str) -> None:
+    """Write a self-contained, offline HTML viewer (canvas, pan/zoom, search, hover details).
+
+    Layout is computed here once and embedded as compact column arrays; the page never calls back
+    into Python.
+    """
+
+    pos = compute_layout(g, layout=layout)
+    nodes = list(g.nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    types = sorted({str(g.nodes[n].get("type", "Unknown")) for n in nodes})
+    type_index = {t: i for i, t in enumerate(types)}
+
+    # Normalize to a ~1000-unit box; flip y because canvas y grows downward.
+    xy = np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+    if len(xy):
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        xy = (xy - lo) / max(float((hi - lo).max()), 1e-9) * 1000.0
+        xy[:, 1] = 1000.0 - xy[:, 1]
+
+    def col(attr: str) -> List[str]:
+        return [str(g.nodes[n].get(attr) or "") for n in nodes]
+
+    kinds = list(EDGE_STYLES)
+    edges: List[int] = []
+    for u, v, d in g.edges(data=True):
+        edges += [index[u], index[v], kinds.index(d.get("kind", "dependsOn"))]
+
+    search_index: Dict[str, List[int]] = {}
+    for i, n in enumerate(nodes):
+        attrs = g.nodes[n]
+        text = " ".join(str(attrs.get(k) or "") for k in ("name", "description", "formula"))
+        for tok in set(VIEWER_TOKEN_RE.findall(text.lower())):
+            search_index.setdefault(tok, []).append(i)
+
+    data = {
+        "title": title,
+        "types": types,
+        "colors": [NODE_COLORS.get(t, "#B0B0B0") for t in types],
+        "edgeKinds": kinds,
+        "edgeStyles": [
+            {"color": st["color"], "width": st["width"], "dashed": st["style"] == "dashed"} for st in EDGE_STYLES.values()
+        ],
+        "nodes": {
+            "id": nodes,
+            "name": col("name"),
+            "type": [type_index[str(g.nodes[n].get("type", "Unknown"))] for n in nodes],
+            "status": col("status"),
+            "source": col("source"),
+            "description": col("description"),
+            "formula": col("formula"),
+            "codeMapping": col("codeMapping"),
+            "deg": [g.degree(n) for n in nodes],
+            "x": [round(float(v), 1) for v in xy[:, 0]] if len(xy) else [],
+            "y": [round(float(v), 1) for v in xy[:, 1]] if len(xy) else [],
+        },
+        "edges": edges,
+        "index": search_index,
+    }
+
+    # "</" inside the inline script would terminate it early.
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    html = VIEWER_TEMPLATE.read_text(encoding="utf-8")
+    html = html.replace("__TITLE__", title.replace("&", "&amp;").replace("<", "&lt;"))
+    html = html.replace("/*__GRAPH_DATA__*/null", payload)
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text(html, encoding="utf-8")
+    print(f"Wrote {out_path} (nodes={g.number_of_nodes()} edges={g.number_of_edges()})")
+
+
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Visualize rule_graph.json (JSON-LD) as a static image")
-    p.add_argument("--in", dest="in_path", default="rule_graph.json", help="Input JSON-LD graph file")
-    p.add_argument("--out", dest="out_path", default=None, help="Output image path (.png or .svg)")
+    p.add_argument(
+        "--in",
+        dest="in_path",
+        default="rule_graph.json",
+        help="Input JSON-LD graph file, a .sqlite rule graph store, or a shard directory",
+    )
+    p.add_argument(
+        "--out",
+        dest="out_path",
+        default=None,
+        help="Output path: .png/.svg image, or .html for the interactive offline viewer",
+    )
     p.add_argument("--show", action="store_true", help="Also open a window via matplotlib")
 
     p.add_argument(
@@ -271,10 +681,41 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     p.add_argument("--focus", default=None, help="Focus on a node by name/id (extract neighborhood)")
     p.add_argument("--hops", type=int, default=2, help="Number of hops for --focus neighborhood")
 
+    p.add_argument(
+        "--overview",
+        choices=["community", "source", "type"],
+        default=None,
+        help="Collapse clusters (Louvain communities, source chapter or @type) into supernodes",
+    )
+    p.add_argument("--drill", default=None, help="With --overview, render only the members of this cluster (e.g. c3)")
+
     p.add_argument("--layout", default="sfdp", help="Layout: sfdp|dot|neato|spring")
     p.add_argument("--title", default="TTRPG Rule Graph", help="Plot title")
     p.add_argument("--label-limit", type=int, default=120, help="Label all nodes if <= this many")
     p.add_argument("--figsize", default="16,10", help="Figure size as 'W,H' (inches)")
+    p.add_argument(
+        "--renderer",
+        choices=["fast", "networkx"],
+        default="fast",
+        help="fast: one matplotlib collection per artist kind; networkx: one patch per edge (slow)",
+    )
+    p.add_argument(
+        "--rasterize",
+        action="store_true",
+        help="Rasterize nodes/edges inside vector output (keeps huge SVGs small; text stays vector)",
+    )
+    p.add_argument(
+        "--bundle",
+        choices=["community", "source", "type"],
+        default=None,
+        help="Bundle edges through cluster centroids (hierarchical edge bundling; fast renderer)",
+    )
+    p.add_argument(
+        "--bundle-strength",
+        type=float,
+        default=0.85,
+        help="With --bundle, 0 = straight edges, 1 = fully bundled",
+    )
 
     return p.parse_args(argv)
 
@@ -282,10 +723,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
 def main(argv: Optional[Sequence[str]] = None) -> None:
     args = parse_args(argv)
 
-    nodes = load_jsonld_graph(args.in_path)
+    include_types = set(args.include_types) if args.include_types else set()
+    nodes = load_jsonld_graph(args.in_path, include_types or None)
     g = build_graph(nodes)
+    metrics = load_analytics(nodes, analytics_path_for(Path(args.in_path)))
 
-    include_types = set(args.include_types) if args.include_types else set()
     exclude_types = set(args.exclude_types) if args.exclude_types else set()
 
     if include_types or exclude_types:
@@ -297,6 +739,17 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
     if args.drop_isolates:
         g = drop_isolates(g)
 
+    if args.overview:
+        clusters = cluster_nodes(g, args.overview)
+        if args.drill:
+            if args.drill not in clusters:
+                raise ValueError(f"Unknown cluster {args.drill!r} (have {', '.join(clusters)})")
+            g = g.subgraph(clusters[args.drill]).copy()
+        else:
+            g = quotient_graph(g, clusters, args.overview)
+            for key in g.nodes:
+                print(f"  {g.nodes[key]['name']}")
+
     try:
         w_str, h_str = [x.strip() for x in str(args.figsize).split(",", 1)]
         figsize = (int(w_str), int(h_str))
@@ -308,6 +761,10 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         # Default to a file output to avoid “nothing happens” confusion.
         out_path = "rule_graph.svg"
 
+    if out_path and out_path.lower().endswith(".html"):
+        write_html(g, out_path, title=args.title, layout=args.layout)
+        return
+
     draw_graph(
         g,
         out_path=out_path,
@@ -316,6 +773,11 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         layout=args.layout,
         label_limit=int(args.label_limit),
         figsize=figsize,
+        renderer=args.renderer,
+        rasterize=bool(args.rasterize),
+        bundle=args.bundle,
+        bundle_strength=min(1.0, max(0.0, args.bundle_strength)),
+        rank={nid: m["pagerank"] for nid, m in metrics.items()},
     )
 
 